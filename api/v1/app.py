@@ -15,6 +15,18 @@ app.register_blueprint(app_views)
 CORS(app, resources={r"/api/v1/*": {"origins": "0.0.0.0"}})
 
 
+@app.before_request
+def pin():
+    """Pins the version of the storage read by the request"""
+    storage.pin()
+
+
+@app.teardown_request
+def unpin(exception):
+    """Releases the version of the storage read by the request"""
+    storage.unpin()
+
+
 @app.teardown_appcontext
 def teardown(exception):
     """Closes the storage"""
@@ -7,26 +7,36 @@ API endpoints for Amenity objects.
 from flask import abort, jsonify, make_response, request
 from werkzeug.exceptions import BadRequest
 from api.v1.views import app_views
+from api.v1.views.etags import etag
+from api.v1.views.pagination import paginate
+from api.v1.views.responses import list_response, object_response
+from api.v1.views.streaming import stream, wants_stream
 from models import storage
 from models.amenity import Amenity
 
 
 @app_views.route('/amenities', methods=['GET'], strict_slashes=False)
+@etag(Amenity)
 def get_amenities():
     """Retrieves a list of all Amenity objects."""
+    response = paginate(Amenity)
+    if response is not None:
+        return response
+    if wants_stream():
+        return stream(storage.stream(Amenity))
     amenities = storage.all(Amenity).values()
-    amenity_list = [amenity.to_dict() for amenity in amenities]
-    return jsonify(amenity_list)
+    return list_response(amenities)
 
 
 @app_views.route('/amenities/<amenity_id>', methods=['GET'],
                  strict_slashes=False)
+@etag(Amenity, 'amenity_id')
 def get_amenity(amenity_id):
     """Retrieves a Amenity object"""
     amenity = storage.get(Amenity, amenity_id)
     if not amenity:
         abort(404)
-    return jsonify(amenity.to_dict())
+    return object_response(amenity)
 
 
 @app_views.route('/amenities/<amenity_id>', methods=['DELETE'],
@@ -54,7 +64,7 @@ def create_amenity():
         return make_response(jsonify({'error': "Missing name"}), 400)
     new_amenity = Amenity(**data)
     new_amenity.save()
-    return make_response(jsonify(new_amenity.to_dict()), 201)
+    return object_response(new_amenity, 201)
 
 
 @app_views.route('/amenities/<amenity_id>', methods=['PUT'],
@@ -75,5 +85,5 @@ def update_amenity(amenity_id):
     for key, value in data.items():
         if key not in ignored_keys:
             setattr(amenity, key, value)
-    storage.save()
-    return jsonify(amenity.to_dict())
+    amenity.save()
+    return object_response(amenity)
@@ -7,6 +7,8 @@ API endpoints for City objects.
 from flask import abort, jsonify, make_response, request
 from werkzeug.exceptions import BadRequest
 from api.v1.views import app_views
+from api.v1.views.etags import etag
+from api.v1.views.responses import list_response, object_response
 from models import storage
 from models.city import City
 from models.state import State
@@ -14,22 +16,23 @@ from models.state import State
 
 @app_views.route('/states/<state_id>/cities', methods=['GET'],
                  strict_slashes=False)
+@etag(City, parent=(State, 'state_id'))
 def get_cities(state_id):
     """Retrieves the list of all cities objects of a specific State"""
     state = storage.get(State, state_id)
     if not state:
         abort(404)
-    cities = [city.to_dict() for city in state.cities]
-    return jsonify(cities)
+    return list_response(state.cities)
 
 
 @app_views.route('/cities/<city_id>', methods=['GET'], strict_slashes=False)
+@etag(City, 'city_id')
 def get_city(city_id):
     """Retrieves a specific city based on id"""
     city = storage.get(City, city_id)
     if not city:
         abort(404)
-    return jsonify(city.to_dict())
+    return object_response(city)
 
 
 @app_views.route('/cities/<city_id>', methods=['DELETE'], strict_slashes=False)
@@ -61,7 +64,7 @@ def create_city(state_id):
     new_city = City(**data)
     new_city.state_id = state.id
     new_city.save()
-    return make_response(jsonify(new_city.to_dict()), 201)
+    return object_response(new_city, 201)
 
 
 @app_views.route('/cities/<city_id>', methods=['PUT'], strict_slashes=False)
@@ -79,5 +82,5 @@ def update_city(city_id):
     for key, value in data.items():
         if key not in ['id', 'state_id', 'created_at', 'updated_at']:
             setattr(city, key, value)
-    storage.save()
-    return jsonify(city.to_dict())
+    city.save()
+    return object_response(city)
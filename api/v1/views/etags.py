@@ -0,0 +1,51 @@
+#!/usr/bin/python3
+"""
+Module: api/vi/views/etags.py
+
+Conditional GET of the API endpoints.
+
+The ETag of a response is the version the storage engine keeps for the
+class or the object it shows, so that a request whose If-None-Match holds
+the current ETag is answered 304 Not Modified without loading any object.
+The ETag is weak when the storage engine may keep a version across writes,
+as MySQL does within a second.
+"""
+from functools import wraps
+from zlib import crc32
+from flask import make_response, request
+from models import storage
+
+
+def etag(cls, id_arg=None, parent=None):
+    """
+    Decorates a GET view showing the objects of class cls, or the one whose
+    id is the view argument id_arg, with the ETag of their version. The
+    objects listed under another one name its (class, view argument) as
+    parent, whose version is part of the ETag so that a deleted parent is
+    never answered 304.
+    """
+    def decorator(view):
+        """Returns the conditional view"""
+        @wraps(view)
+        def conditional_view(*args, **kwargs):
+            """Answers 304 if the client holds the current version"""
+            version = storage.version(cls, kwargs[id_arg] if id_arg else None)
+            if version is not None and parent is not None:
+                owner = storage.version(parent[0], kwargs[parent[1]])
+                version = None if owner is None else \
+                    "{}-{}".format(version, owner)
+            if version is None:
+                return view(*args, **kwargs)
+            tag = version
+            if request.query_string:
+                tag += "-{:08x}".format(crc32(request.query_string))
+            if request.if_none_match.contains_weak(tag):
+                response = make_response("", 304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(tag, weak=not storage.strong_versions)
+            return response
+        return conditional_view
+    return decorator
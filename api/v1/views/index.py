@@ -30,7 +30,8 @@ def status():
 @app_views.route('/stats', methods=['GET'])
 def stats():
     """Retrieves the number of each object by type"""
+    counts = storage.counts()
     obj_stats = {}
     for key, value in classes.items():
-        obj_stats[key] = storage.count(value)
+        obj_stats[key] = counts.get(value.__name__, 0)
     return jsonify(obj_stats)
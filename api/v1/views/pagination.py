@@ -0,0 +1,40 @@
+#!/usr/bin/python3
+"""
+Module: api/vi/views/pagination.py
+
+Keyset pagination of the list endpoints.
+
+A list endpoint called with a limit query parameter returns at most limit
+objects and, when more follow, the cursor of the next page in the
+X-Next-Cursor header, to be passed back as the cursor query parameter.
+"""
+from flask import jsonify, make_response, request
+from api.v1.views.responses import list_response
+from models import storage
+from models.engine import pagination
+
+
+def paginate(source, exclude=(), **filters):
+    """
+    Returns the response of the page asked by the request, source being
+    either a class paged by the storage engine on the values of filters or
+    an iterable of objects, or None when the request does not ask for a
+    page. The attributes named in exclude are left out of the objects.
+    """
+    limit = request.args.get('limit')
+    if limit is None:
+        return None
+    if not limit.isdigit() or int(limit) < 1:
+        return make_response(jsonify({'error': "Invalid limit"}), 400)
+    cursor = request.args.get('cursor')
+    try:
+        if isinstance(source, type):
+            objs, cursor = storage.page(source, int(limit), cursor, **filters)
+        else:
+            objs, cursor = pagination.page(source, int(limit), cursor)
+    except ValueError:
+        return make_response(jsonify({'error': "Invalid cursor"}), 400)
+    response = list_response(objs, exclude)
+    if cursor is not None:
+        response.headers['X-Next-Cursor'] = cursor
+    return response
@@ -4,35 +4,47 @@ Module: api/vi/views/places.py
 
 API endpoints for Place objects.
 """
+import heapq
+from itertools import islice
 from flask import abort, jsonify, make_response, request
 from werkzeug.exceptions import BadRequest
 from api.v1.views import app_views
-from models import storage
+from api.v1.views.etags import etag
+from api.v1.views.pagination import paginate
+from api.v1.views.responses import list_response, object_response
+from api.v1.views.streaming import stream, wants_stream
+from models import storage, storage_t
 from models.city import City
 from models.user import User
 from models.place import Place
 from models.state import State
 from models.amenity import Amenity
 
+numbers = ('price_by_night', 'max_guest', 'number_rooms', 'number_bathrooms')
+
 
 @app_views.route('/cities/<city_id>/places', methods=['GET'],
                  strict_slashes=False)
+@etag(Place, parent=(City, 'city_id'))
 def get_places(city_id):
     """Retrieves the list of all Place objects of a City"""
     city = storage.get(City, city_id)
     if not city:
         abort(404)
-    places = [place.to_dict() for place in city.places]
-    return jsonify(places)
+    response = paginate(Place, city_id=city.id)
+    if response is not None:
+        return response
+    return list_response(city.places)
 
 
 @app_views.route('/places/<place_id>', methods=['GET'], strict_slashes=False)
+@etag(Place, 'place_id')
 def get_place(place_id):
     """Retrieves a Place object"""
     place = storage.get(Place, place_id)
     if not place:
         abort(404)
-    return jsonify(place.to_dict())
+    return object_response(place)
 
 
 @app_views.route('/places/<place_id>', methods=['DELETE'],
@@ -73,7 +85,7 @@ def create_place(city_id):
     new_place = Place(**data)
     new_place.city_id = city.id
     new_place.save()
-    return make_response(jsonify(new_place.to_dict()), 201)
+    return object_response(new_place, 201)
 
 
 @app_views.route('/places/<place_id>', methods=['PUT'], strict_slashes=False)
@@ -93,8 +105,8 @@ def update_place(place_id):
     for key, value in data.items():
         if key not in ignored_keys:
             setattr(place, key, value)
-    storage.save()
-    return jsonify(place.to_dict())
+    place.save()
+    return object_response(place)
 
 
 @app_views.route('/places_search', methods=['POST'], strict_slashes=False)
@@ -114,40 +126,157 @@ def search_place():
         states = data.get('states', None)
         cities = data.get('cities', None)
         amenities = data.get('amenities', None)
+        near = data.get('near', None)
+        bbox = data.get('bbox', None)
+        sort = data.get('sort', None)
+        limit = data.get('limit', None)
+        q = data.get('q', None)
     else:
+        response = paginate(Place)
+        if response is not None:
+            return response
+        if wants_stream():
+            return stream(storage.stream(Place))
         places = storage.all(Place).values()
-        list_places = [place.to_dict() for place in places]
-        return jsonify(list_places)
+        return list_response(places)
 
-    list_places = []
-    if states:
-        list_states = [storage.get(State, state_id) for state_id in states]
-        for state in list_states:
+    if near is not None:
+        near = coordinates(near, ('lat', 'lng', 'radius_km'))
+        if (near is None or not -90 <= near[0] <= 90 or
+                not -180 <= near[1] <= 180 or near[2] <= 0):
+            return make_response(jsonify({'error': "Invalid near"}), 400)
+    if bbox is not None:
+        bbox = coordinates(bbox, ('south', 'west', 'north', 'east'))
+        if (bbox is None or not -90 <= bbox[0] <= bbox[2] <= 90 or
+                not all(-180 <= lng <= 180 for lng in bbox[1::2])):
+            return make_response(jsonify({'error': "Invalid bbox"}), 400)
+    if q is not None and not isinstance(q, str):
+        return make_response(jsonify({'error': "Invalid q"}), 400)
+    ranges = {}
+    for field in numbers:
+        if field in data:
+            bounds = data[field]
+            if (not isinstance(bounds, dict) or
+                    not all(is_number(bounds[bound]) for bound in bounds
+                            if bound in ('min', 'max'))):
+                return make_response(
+                    jsonify({'error': "Invalid {}".format(field)}), 400)
+            ranges[field] = (bounds.get('min'), bounds.get('max'))
+    if sort == 'distance':
+        if near is None:
+            return make_response(jsonify({'error': "Invalid sort"}), 400)
+    elif sort is not None:
+        if not isinstance(sort, str) or sort.lstrip('-') not in numbers:
+            return make_response(jsonify({'error': "Invalid sort"}), 400)
+    if limit is not None:
+        if isinstance(limit, bool) or not isinstance(limit, int) or limit < 1:
+            return make_response(jsonify({'error': "Invalid limit"}), 400)
+    if (sort is not None or q is not None) and \
+            ('limit' in request.args or 'cursor' in request.args):
+        # pages follow (created_at, id), which would undo the ranking
+        return make_response(
+            jsonify({'error': "Cannot paginate sort or q"}), 400)
+
+    # each candidate list holds the places passing one criterion, the
+    # result is their intersection, driven by the smallest one
+    candidates = []
+    distances = {}
+    if near is not None:
+        nearby = storage.near(Place, *near)
+        distances = {place.id: distance for distance, place in nearby}
+        candidates.append([place for distance, place in nearby])
+    if bbox is not None:
+        candidates.append(storage.within(Place, bbox))
+    if q is not None:
+        matches = storage.search(q)
+        scores = {place.id: score for score, place in matches}
+        candidates.append([place for score, place in matches])
+    if states or cities:
+        location = {}
+        for state_id in states or []:
+            state = storage.get(State, state_id, load=["cities.places"])
             if state:
                 for city in state.cities:
                     for place in city.places:
-                        list_places.append(place)
-
-    if cities:
-        list_cities = [storage.get(City, city_id) for city_id in cities]
-        for city in list_cities:
+                        location[place.id] = place
+        for city_id in cities or []:
+            city = storage.get(City, city_id, load=["places"])
             if city:
                 for place in city.places:
-                    if place not in list_places:
-                        list_places.append(place)
-
-    if amenities:
-        if not list_places:
-            list_places = storage.all(Place).values()
-        list_amenities = [storage.get(Amenity, a_id) for a_id in amenities]
-        list_places = [place for place in list_places
-                       if all([am in place.amenities
-                               for am in list_amenities])]
-
-    places = []
-    for place in list_places:
-        place_dict = place.to_dict()
-        place_dict.pop('amenities', None)
-        places.append(place_dict)
-
-    return jsonify(places)
+                    location[place.id] = place
+        candidates.append(list(location.values()))
+    for amenity_id in amenities or []:
+        candidates.append(amenity_places(amenity_id))
+    for field, (low, high) in ranges.items():
+        candidates.append(storage.between(Place, field, low, high))
+
+    if not candidates and sort not in (None, 'distance'):
+        # walk the index of the sort field rather than sorting every place
+        list_places = storage.between(Place, sort.lstrip('-'), limit=limit,
+                                      reverse=sort.startswith('-'))
+    elif not candidates:
+        list_places = storage.stream(Place)
+    else:
+        candidates.sort(key=len)
+        list_places = candidates[0]
+        for places in candidates[1:]:
+            if not list_places:
+                break
+            place_ids = {place.id for place in places}
+            list_places = [place for place in list_places
+                           if place.id in place_ids]
+
+    if sort == 'distance':
+        list_places = top(list_places, limit,
+                          lambda place: distances[place.id])
+    elif sort is not None:
+        field = sort.lstrip('-')
+        list_places = top([place for place in list_places
+                           if is_number(getattr(place, field, None))], limit,
+                          lambda place: (getattr(place, field), place.id),
+                          sort.startswith('-'))
+    elif q is not None:
+        list_places = top(list_places, limit,
+                          lambda place: scores[place.id], True)
+    elif limit is not None:
+        list_places = islice(list_places, limit)
+
+    response = paginate(list_places, ('amenities',))
+    if response is not None:
+        return response
+    if wants_stream():
+        return stream(list_places, ('amenities',))
+    return list_response(list_places, ('amenities',))
+
+
+def amenity_places(amenity_id):
+    """Returns the list of Place objects having the Amenity amenity_id"""
+    if storage_t == "db":
+        amenity = storage.get(Amenity, amenity_id, load=["place_amenities"])
+        return amenity.place_amenities if amenity else []
+    return storage.lookup(Place, "amenity_ids", amenity_id)
+
+
+def is_number(value):
+    """Tells whether value is a JSON number"""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def coordinates(value, names):
+    """Returns the numbers named names in the dictionary value, or None"""
+    if not isinstance(value, dict):
+        return None
+    values = tuple(value.get(name) for name in names)
+    if not all(is_number(number) for number in values):
+        return None
+    return values
+
+
+def top(places, limit, key, reverse=False):
+    """Returns places sorted by key, or only the first limit of them found
+    with a bounded heap"""
+    if limit is None:
+        return sorted(places, key=key, reverse=reverse)
+    if reverse:
+        return heapq.nlargest(limit, places, key=key)
+    return heapq.nsmallest(limit, places, key=key)
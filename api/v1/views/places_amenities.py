@@ -6,6 +6,7 @@ API endpoints for place_amenities objects.
 """
 from flask import abort, jsonify, make_response
 from api.v1.views import app_views
+from api.v1.views.responses import list_response, object_response
 from models import storage
 from models.amenity import Amenity
 from models.place import Place
@@ -16,17 +17,17 @@ from models import storage_t
                  strict_slashes=False)
 def get_place_amenities(place_id):
     """Retrieves the list of all Amenity objects of a Place"""
-    place = storage.get(Place, place_id)
+    place = storage.get(Place, place_id, load=["amenities"])
     if not place:
         abort(404)
     if storage_t == "db":
-        amenities = [amenity.to_dict() for amenity in place.amenities]
+        amenities = place.amenities
     else:
         amenities = []
         for amenity_id in place.amenity_ids:
             amenity = storage.get(Amenity, amenity_id)
-            amenities.append(amenity.to_dict())
-    return jsonify(amenities)
+            amenities.append(amenity)
+    return list_response(amenities)
 
 
 @app_views.route('/places/<place_id>/amenities/<amenity_id>',
@@ -43,8 +44,10 @@ def delete_place_amenity(place_id, amenity_id):
             if storage_t == 'db':
                 place.amenities.remove(amenity)
             else:
-                place.amenity_ids.remove(amenity)
-            storage.save()
+                place.amenity_ids = [a_id for a_id in place.amenity_ids
+                                     if a_id != amenity.id]
+            place.save()
+            break
     return make_response(jsonify({}), 200)
 
 
@@ -58,11 +61,11 @@ def link_amenity(place_id, amenity_id):
         abort(404)
     if storage_t == "db":
         if amenity in place.amenities:
-            return jsonify(amenity.to_dict())
+            return object_response(amenity)
         place.amenities.append(amenity)
     else:
         if amenity_id in place.amenity_ids:
-            return jsonify(amenity.to_dict())
-        place.amenity_ids.append(amenity_id)
-    storage.save()
-    return make_response(jsonify(amenity.to_dict()), 201)
+            return object_response(amenity)
+        place.amenity_ids = place.amenity_ids + [amenity_id]
+    place.save()
+    return object_response(amenity, 201)
@@ -7,6 +7,9 @@ API endpoints for Review objects.
 from flask import abort, jsonify, make_response, request
 from werkzeug.exceptions import BadRequest
 from api.v1.views import app_views
+from api.v1.views.etags import etag
+from api.v1.views.pagination import paginate
+from api.v1.views.responses import list_response, object_response
 from models import storage
 from models.user import User
 from models.place import Place
@@ -15,22 +18,26 @@ from models.review import Review
 
 @app_views.route('/places/<place_id>/reviews', methods=['GET'],
                  strict_slashes=False)
+@etag(Review, parent=(Place, 'place_id'))
 def get_reviews(place_id):
     """Retrieves the list of all Review objects of a Place"""
     place = storage.get(Place, place_id)
     if not place:
         abort(404)
-    reviews = [review.to_dict() for review in place.reviews]
-    return jsonify(reviews)
+    response = paginate(Review, place_id=place.id)
+    if response is not None:
+        return response
+    return list_response(place.reviews)
 
 
 @app_views.route('/reviews/<review_id>', methods=['GET'], strict_slashes=False)
+@etag(Review, 'review_id')
 def get_review(review_id):
     """Retrieves a Review object"""
     review = storage.get(Review, review_id)
     if not review:
         abort(404)
-    return jsonify(review.to_dict())
+    return object_response(review)
 
 
 @app_views.route('/reviews/<review_id>', methods=['DELETE'],
@@ -71,7 +78,7 @@ def create_review(place_id):
     new_review = Review(**data)
     new_review.place_id = place.id
     new_review.save()
-    return make_response(jsonify(new_review.to_dict()), 201)
+    return object_response(new_review, 201)
 
 
 @app_views.route('/reviews/<review_id>', methods=['PUT'], strict_slashes=False)
@@ -91,5 +98,5 @@ def update_review(review_id):
     for key, value in data.items():
         if key not in ignored_keys:
             setattr(review, key, value)
-    storage.save()
-    return jsonify(review.to_dict())
+    review.save()
+    return object_response(review)
@@ -0,0 +1,21 @@
+#!/usr/bin/python3
+"""
+Module: api/vi/views/responses.py
+
+JSON responses of the models, encoded by models.engine.serializer.
+"""
+from flask import current_app
+from models.engine import serializer
+
+
+def object_response(obj, status=200):
+    """Returns the response of the dictionary representation of obj."""
+    return current_app.response_class(serializer.encode(obj), status=status,
+                                      mimetype=current_app.json.mimetype)
+
+
+def list_response(objs, exclude=()):
+    """Returns the response of the list of the dictionary representations
+    of the objects of objs, without the attributes named in exclude."""
+    return current_app.response_class(serializer.encode_list(objs, exclude),
+                                      mimetype=current_app.json.mimetype)
@@ -7,25 +7,35 @@ API endpoints for State objects.
 from flask import abort, jsonify, make_response, request
 from werkzeug.exceptions import BadRequest
 from api.v1.views import app_views
+from api.v1.views.etags import etag
+from api.v1.views.pagination import paginate
+from api.v1.views.responses import list_response, object_response
+from api.v1.views.streaming import stream, wants_stream
 from models import storage
 from models.state import State
 
 
 @app_views.route('/states', methods=['GET'], strict_slashes=False)
+@etag(State)
 def get_states():
     """Retrieve all State objects."""
+    response = paginate(State)
+    if response is not None:
+        return response
+    if wants_stream():
+        return stream(storage.stream(State))
     states = storage.all(State).values()
-    state_list = [state.to_dict() for state in states]
-    return jsonify(state_list)
+    return list_response(states)
 
 
 @app_views.route('/states/<state_id>', methods=['GET'], strict_slashes=False)
+@etag(State, 'state_id')
 def get_state(state_id):
     """Retrieve a specific State object by ID."""
     state = storage.get(State, state_id)
     if not state:
         abort(404)
-    return jsonify(state.to_dict())
+    return object_response(state)
 
 
 @app_views.route(
@@ -56,7 +66,7 @@ def create_state():
         return make_response(jsonify({'error': "Missing name"}), 400)
     state = State(**data)
     state.save()
-    return make_response(jsonify(state.to_dict()), 201)
+    return object_response(state, 201)
 
 
 @app_views.route('/states/<state_id>', methods=['PUT'], strict_slashes=False)
@@ -74,5 +84,5 @@ def update_state(state_id):
     for key, value in data.items():
         if key not in ['id', 'created_at', 'updated_at']:
             setattr(state, key, value)
-    storage.save()
-    return jsonify(state.to_dict())
+    state.save()
+    return object_response(state)
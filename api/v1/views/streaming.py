@@ -0,0 +1,45 @@
+#!/usr/bin/python3
+"""
+Module: api/vi/views/streaming.py
+
+Streamed responses of the list endpoints.
+
+A list endpoint called with stream=1 sends its JSON array while the
+objects are read from storage, a chunk at a time, instead of building the
+whole list and its encoding in memory.
+"""
+from flask import Response, current_app, request, stream_with_context
+from models.engine import serializer
+
+# integer - bytes encoded before a chunk is sent
+CHUNK_SIZE = 1 << 16
+
+
+def wants_stream():
+    """Tells whether the request asks for a streamed response."""
+    return request.args.get('stream', '').lower() in ('1', 'true')
+
+
+def stream(objs, exclude=()):
+    """Returns the streamed response of the JSON array of the iterable objs,
+    without the attributes named in exclude."""
+
+    def generate():
+        """Yields the chunks of the JSON array."""
+        chunk = [b"["]
+        size = 0
+        separator = b""
+        for obj in objs:
+            data = serializer.encode(obj, exclude=exclude)
+            chunk.append(separator)
+            chunk.append(data)
+            separator = b","
+            size += len(data) + 1
+            if size >= CHUNK_SIZE:
+                yield b"".join(chunk)
+                chunk = []
+                size = 0
+        chunk.append(b"]")
+        yield b"".join(chunk)
+    return Response(stream_with_context(generate()),
+                    mimetype=current_app.json.mimetype)
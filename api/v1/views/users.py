@@ -7,25 +7,35 @@ API endpoints for User objects.
 from flask import abort, jsonify, make_response, request
 from werkzeug.exceptions import BadRequest
 from api.v1.views import app_views
+from api.v1.views.etags import etag
+from api.v1.views.pagination import paginate
+from api.v1.views.responses import list_response, object_response
+from api.v1.views.streaming import stream, wants_stream
 from models import storage
 from models.user import User
 
 
 @app_views.route('/users', methods=['GET'], strict_slashes=False)
+@etag(User)
 def get_users():
     """Retrieve all User objects."""
+    response = paginate(User)
+    if response is not None:
+        return response
+    if wants_stream():
+        return stream(storage.stream(User))
     users = storage.all(User).values()
-    user_list = [user.to_dict() for user in users]
-    return jsonify(user_list)
+    return list_response(users)
 
 
 @app_views.route('/users/<user_id>', methods=['GET'], strict_slashes=False)
+@etag(User, 'user_id')
 def get_user(user_id):
     """Retrieve a specific User object by ID."""
     user = storage.get(User, user_id)
     if not user:
         abort(404)
-    return jsonify(user.to_dict())
+    return object_response(user)
 
 
 @app_views.route(
@@ -58,7 +68,7 @@ def create_user():
         return make_response(jsonify({'error': "Missing password"}), 400)
     user = User(**data)
     user.save()
-    return make_response(jsonify(user.to_dict()), 201)
+    return object_response(user, 201)
 
 
 @app_views.route('/users/<user_id>', methods=['PUT'], strict_slashes=False)
@@ -77,5 +87,5 @@ def update_user(user_id):
     for key, value in data.items():
         if key not in ignored_keys:
             setattr(user, key, value)
-    storage.save()
-    return jsonify(user.to_dict())
+    user.save()
+    return object_response(user)
@@ -6,9 +6,14 @@ initialize the models package
 from os import getenv
 
 
-storage_t = getenv("HBNB_TYPE_STORAGE")
+storage_engine = getenv("HBNB_TYPE_STORAGE")
+# the models are mapped to SQL tables by both the MySQL and SQLite engines
+storage_t = "db" if storage_engine in ("db", "sqlite") else storage_engine
 
-if storage_t == "db":
+if storage_engine == "sqlite":
+    from models.engine.sqlite_storage import SQLiteStorage
+    storage = SQLiteStorage()
+elif storage_t == "db":
     from models.engine.db_storage import DBStorage
     storage = DBStorage()
 else:
@@ -13,6 +13,14 @@ import uuid
 
 time = "%Y-%m-%dT%H:%M:%S.%f"
 
+
+def parse_time(value):
+    """returns the datetime written as value in the format time"""
+    if len(value) == 26 and value[10] == "T" and value[19] == ".":
+        # fromisoformat reads the format time many times faster
+        return datetime.fromisoformat(value)
+    return datetime.strptime(value, time)
+
 if models.storage_t == "db":
     Base = declarative_base()
 else:
@@ -23,29 +31,37 @@ class BaseModel:
     """The BaseModel class from which future classes will be derived"""
     if models.storage_t == "db":
         id = Column(String(60), primary_key=True)
-        created_at = Column(DateTime, default=datetime.utcnow)
-        updated_at = Column(DateTime, default=datetime.utcnow)
+        created_at = Column(DateTime, default=datetime.utcnow, index=True)
+        updated_at = Column(DateTime, default=datetime.utcnow, index=True)
 
     def __init__(self, *args, **kwargs):
-        """Initialization of the base model"""
+        """Initialization of the base model, whose attributes are set
+        without flagging it as changed as it is not stored yet"""
+        init = super().__setattr__
         if kwargs:
             for key, value in kwargs.items():
                 if key != "__class__":
-                    setattr(self, key, value)
+                    init(key, value)
             if kwargs.get("created_at", None) and type(self.created_at) is str:
-                self.created_at = datetime.strptime(kwargs["created_at"], time)
+                init("created_at", parse_time(kwargs["created_at"]))
             else:
-                self.created_at = datetime.now()
+                init("created_at", datetime.now())
             if kwargs.get("updated_at", None) and type(self.updated_at) is str:
-                self.updated_at = datetime.strptime(kwargs["updated_at"], time)
+                init("updated_at", parse_time(kwargs["updated_at"]))
             else:
-                self.updated_at = datetime.now()
+                init("updated_at", datetime.now())
             if kwargs.get("id", None) is None:
-                self.id = str(uuid.uuid4())
+                init("id", str(uuid.uuid4()))
         else:
-            self.id = str(uuid.uuid4())
-            self.created_at = datetime.now()
-            self.updated_at = self.created_at
+            init("id", str(uuid.uuid4()))
+            init("created_at", datetime.now())
+            init("updated_at", self.created_at)
+
+    if models.storage_t != "db":
+        def __setattr__(self, name, value):
+            """sets an attribute and flags the instance as changed"""
+            super().__setattr__(name, value)
+            models.storage.touch(self, name)
 
     def __str__(self):
         """String representation of the BaseModel class"""
@@ -0,0 +1,92 @@
+#!/usr/bin/python3
+"""
+Contains the Coordinator class
+
+The processes sharing the files of FileStorage coordinate through a small
+header file mapped in memory: an advisory lock on it serializes their
+writes, and it holds the generation, bumped by each save, and the base,
+the generation the journal started from at its last rotation. A process
+compares the generation to the last one it applied to know without a
+system call whether another one wrote since.
+"""
+
+from contextlib import contextmanager
+import mmap
+import os
+import struct
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+HEADER = struct.Struct("<QQ")
+
+
+class Coordinator:
+    """shared generation counter and writer lock of the processes using the
+    files at a path"""
+
+    def __init__(self, path):
+        """Initializes the coordinator of the files at path, the header
+        being opened on first use"""
+        self.path = path + ".gen"
+        self.fd = None
+        self.map = None
+        # integer - process that opened the header, a forked child
+        # reopens it to hold a lock of its own
+        self.pid = None
+
+    def __open(self):
+        """opens and maps the header in this process if needed"""
+        if self.pid == os.getpid():
+            return
+        self.close()
+        self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        self.pid = os.getpid()
+        if os.fstat(self.fd).st_size < HEADER.size:
+            os.ftruncate(self.fd, HEADER.size)
+        self.map = mmap.mmap(self.fd, HEADER.size)
+
+    def close(self):
+        """unmaps and closes the header"""
+        if self.map is not None:
+            self.map.close()
+        if self.fd is not None and self.pid == os.getpid():
+            os.close(self.fd)
+        self.fd = self.map = self.pid = None
+
+    @contextmanager
+    def locked(self, shared=False):
+        """holds the lock of the files within a with block, shared by the
+        readers or held by a single writer"""
+        self.__open()
+        if fcntl is None:
+            yield
+            return
+        fcntl.flock(self.fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+
+    def read(self):
+        """returns the (generation, base) of the header"""
+        self.__open()
+        return HEADER.unpack_from(self.map, 0)
+
+    def generation(self):
+        """returns the generation of the header"""
+        return self.read()[0]
+
+    def bump(self):
+        """gives the files a new generation and returns it, the lock being
+        held for writing"""
+        generation, base = self.read()
+        HEADER.pack_into(self.map, 0, generation + 1, base)
+        return generation + 1
+
+    def rebase(self):
+        """records that the journal starts from the current generation,
+        the lock being held for writing"""
+        generation, base = self.read()
+        HEADER.pack_into(self.map, 0, generation, generation)
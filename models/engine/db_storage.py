@@ -4,6 +4,7 @@ Contains the class DBStorage
 """
 
 import models
+from models.engine import fulltext, geo, pagination
 from models.amenity import Amenity
 from models.base_model import BaseModel, Base
 from models.city import City
@@ -12,45 +13,69 @@ from models.review import Review
 from models.state import State
 from models.user import User
 from os import getenv
+import heapq
+from operator import itemgetter
 import sqlalchemy
-from sqlalchemy import create_engine
-from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy import and_, create_engine, func, literal, or_
+from sqlalchemy.orm import scoped_session, selectinload, sessionmaker
 
 classes = {"Amenity": Amenity, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
 
 
+def stamp(updated_at):
+    """returns the digits of the datetime updated_at, 0 if it is None"""
+    if updated_at is None:
+        return "0"
+    return updated_at.strftime("%Y%m%d%H%M%S%f")
+
+
 class DBStorage:
     """interaacts with the MySQL database"""
     __engine = None
     __session = None
+    # boolean - whether every write gives a new version, not so as the
+    # DATETIME columns of MySQL drop the fractions of a second
+    strong_versions = False
 
-    def __init__(self):
-        """Instantiate a DBStorage object"""
-        HBNB_MYSQL_USER = getenv('HBNB_MYSQL_USER')
-        HBNB_MYSQL_PWD = getenv('HBNB_MYSQL_PWD')
-        HBNB_MYSQL_HOST = getenv('HBNB_MYSQL_HOST')
-        HBNB_MYSQL_DB = getenv('HBNB_MYSQL_DB')
+    def __init__(self, engine=None):
+        """Instantiate a DBStorage object on the MySQL database, or on the
+        given SQLAlchemy engine"""
+        if engine is None:
+            HBNB_MYSQL_USER = getenv('HBNB_MYSQL_USER')
+            HBNB_MYSQL_PWD = getenv('HBNB_MYSQL_PWD')
+            HBNB_MYSQL_HOST = getenv('HBNB_MYSQL_HOST')
+            HBNB_MYSQL_DB = getenv('HBNB_MYSQL_DB')
+            engine = create_engine('mysql+mysqldb://{}:{}@{}/{}'.
+                                   format(HBNB_MYSQL_USER,
+                                          HBNB_MYSQL_PWD,
+                                          HBNB_MYSQL_HOST,
+                                          HBNB_MYSQL_DB))
         HBNB_ENV = getenv('HBNB_ENV')
-        self.__engine = create_engine('mysql+mysqldb://{}:{}@{}/{}'.
-                                      format(HBNB_MYSQL_USER,
-                                             HBNB_MYSQL_PWD,
-                                             HBNB_MYSQL_HOST,
-                                             HBNB_MYSQL_DB))
+        self.__engine = engine
         if HBNB_ENV == "test":
             Base.metadata.drop_all(self.__engine)
 
-    def all(self, cls=None):
-        """query on the current database session"""
+    def all(self, cls=None, load=None):
+        """query on the current database session, eagerly loading the
+        relationship paths of load such as "cities.places" """
         new_dict = {}
         for clss in classes:
             if cls is None or cls is classes[clss] or cls is clss:
-                objs = self.__session.query(classes[clss]).all()
+                objs = self.__session.query(classes[clss]).options(
+                    *self.__options(classes[clss], load)).all()
                 for obj in objs:
                     key = obj.__class__.__name__ + '.' + obj.id
                     new_dict[key] = obj
         return (new_dict)
 
+    def stream(self, cls, batch=1000):
+        """yields the objects of class cls one at a time, fetching batch
+        rows at a time"""
+        cls = classes.get(cls, cls)
+        for obj in self.__session.query(cls).yield_per(batch):
+            yield obj
+
     def new(self, obj):
         """add the object to the current database session"""
         self.__session.add(obj)
@@ -75,15 +100,137 @@ class DBStorage:
         """call remove() method on the private session attribute"""
         self.__session.remove()
 
-    def get(self, cls, id):
-        """Retrieves one object"""
+    def pin(self):
+        """pins nothing, the reads of a thread already share the
+        transaction of its session"""
+        return None
+
+    def unpin(self):
+        """releases nothing, as pin"""
+        pass
+
+    def get(self, cls, id, load=None):
+        """Retrieves one object, eagerly loading the relationship paths of
+        load"""
         if cls in classes.values() and id and isinstance(id, str):
-            objs = self.all(cls)
-            for key, value in objs.items():
-                if key.split(".")[1] == id:
-                    return value
+            return self.__session.get(cls, id,
+                                      options=self.__options(cls, load))
         return None
 
+    @staticmethod
+    def __options(cls, load):
+        """returns the loader options fetching each relationship path of
+        load, such as "cities.places", in one SELECT ... IN per level"""
+        options = []
+        for path in load or ():
+            option = None
+            owner = cls
+            for name in path.split("."):
+                attr = getattr(owner, name)
+                if option is None:
+                    option = selectinload(attr)
+                else:
+                    option = option.selectinload(attr)
+                owner = attr.property.mapper.class_
+            options.append(option)
+        return options
+
     def count(self, cls=None):
         """Count number of objects in storage"""
-        return (len(self.all(cls)))
+        if cls is None:
+            return sum(self.counts().values())
+        cls = classes.get(cls, cls)
+        return self.__session.query(func.count(cls.id)).scalar()
+
+    def counts(self):
+        """returns the number of objects of each class in one query"""
+        queries = [self.__session.query(literal(name), func.count(cls.id))
+                   for name, cls in classes.items()]
+        rows = queries[0].union_all(*queries[1:]).all()
+        return {name: count for name, count in rows}
+
+    def search(self, query, limit=None):
+        """returns the (score, place) of the places whose text or reviews
+        contain words of query, scored by the number of words found"""
+        scores = {}
+        for word in set(fulltext.tokenize(query)):
+            reviewed = self.__session.query(Review.place_id).filter(
+                func.lower(Review.text).contains(word, autoescape=True))
+            ids = self.__session.query(Place.id).filter(or_(
+                func.lower(Place.name).contains(word, autoescape=True),
+                func.lower(Place.description).contains(word,
+                                                       autoescape=True),
+                Place.id.in_(reviewed)))
+            for id, in ids:
+                scores[id] = scores.get(id, 0) + 1
+        found = [(scores[place.id], place) for place in
+                 self.__session.query(Place).filter(Place.id.in_(scores))]
+        return heapq.nlargest(limit or len(found), found,
+                              key=itemgetter(0))
+
+    def version(self, cls, id=None):
+        """returns the version of the rows of class cls, made of their count
+        and latest update, or of the row with the given id, None if there is
+        no such row"""
+        cls = classes.get(cls, cls)
+        if id is None:
+            count, updated_at = self.__session.query(
+                func.count(cls.id), func.max(cls.updated_at)).one()
+            return "{:d}-{}".format(count, stamp(updated_at))
+        row = self.__session.query(cls.updated_at).filter(
+            cls.id == id).first()
+        if row is None:
+            return None
+        return stamp(row[0])
+
+    def within(self, cls, box):
+        """returns the objects of class cls located in the bounding box"""
+        cls = classes.get(cls, cls)
+        south, west, north, east = box
+        spans = [cls.longitude.between(west, east)
+                 for west, east in geo.spans(box)]
+        return self.__session.query(cls).filter(
+            cls.latitude.between(south, north), or_(*spans)).all()
+
+    def near(self, cls, lat, lng, radius_km, limit=None):
+        """returns the (distance, obj) of the objects of class cls located
+        within radius_km of a point, nearest first, at most limit of them"""
+        return geo.nearest(self.within(cls, geo.around(lat, lng, radius_km)),
+                           lat, lng, radius_km, limit)
+
+    def between(self, cls, field, low=None, high=None, limit=None,
+                reverse=False):
+        """returns the objects of class cls whose numeric column field lies
+        between low and high, None meaning unbounded, sorted by field in
+        ascending or reverse order, at most limit of them"""
+        cls = classes.get(cls, cls)
+        column = getattr(cls, field)
+        query = self.__session.query(cls)
+        if low is not None:
+            query = query.filter(column >= low)
+        if high is not None:
+            query = query.filter(column <= high)
+        if reverse:
+            query = query.order_by(column.desc(), cls.id.desc())
+        else:
+            query = query.order_by(column, cls.id)
+        return query.limit(limit).all()
+
+    def page(self, cls, limit, cursor=None, **filters):
+        """returns the at most limit objects of class cls matching the
+        column values of filters that follow cursor in (created_at, id)
+        order, and the cursor of the next page or None"""
+        cls = classes.get(cls, cls)
+        query = self.__session.query(cls).filter_by(**filters)
+        if cursor is not None:
+            created_at, id = pagination.decode(cursor)
+            # the cursor row is read back as the database may have
+            # truncated the microseconds of its created_at
+            stored = self.__session.query(cls.created_at).filter(
+                cls.id == id).scalar_subquery()
+            created_at = func.coalesce(stored, created_at)
+            query = query.filter(or_(cls.created_at > created_at,
+                                     and_(cls.created_at == created_at,
+                                          cls.id > id)))
+        objs = query.order_by(cls.created_at, cls.id).limit(limit + 1).all()
+        return pagination.finish(objs, limit)
@@ -3,81 +3,995 @@
 Contains the FileStorage class
 """
 
-import json
+import atexit
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import heapq
+import io
+import itertools
 from models.amenity import Amenity
 from models.base_model import BaseModel
 from models.city import City
+from models.engine.coordinator import Coordinator
+from models.engine import geo, pagination, serializer, snapshot
+from models.engine.fulltext import TextIndex
+from models.engine.indexes import GridIndex, ListIndex, ReferenceIndex
+from models.engine.indexes import SortedIndex
+from models.engine.journal import Journal
+from models.engine.rwlock import RWLock
+from models.engine.versions import Version, View
 from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
+from operator import itemgetter
+from os import getenv
+import os
+import signal
+import sys
+import threading
+import uuid
 
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
+# dictionary - <class name> -> attributes referencing other objects by id
+references = {"City": ("state_id",), "Place": ("city_id", "user_id"),
+              "Review": ("place_id", "user_id")}
+lists = {"Place": ("amenity_ids",)}
+located = ("Place",)
+numbers = {"Place": ("number_rooms", "number_bathrooms", "max_guest",
+                     "price_by_night")}
+# dictionary - <class name> -> text attributes searched for places
+texts = {"Place": ("name", "description"), "Review": ("text",)}
+# dictionary - <class name> -> attribute naming the place the text is about
+owners = {"Review": "place_id"}
+
+
+def make_indexes():
+    """returns the secondary indexes of the objects of each class name, the
+    full-text index being shared by the classes of texts"""
+    text = TextIndex(texts, owners)
+    all_indexes = {}
+    for name in classes:
+        indexes = {"created_at": SortedIndex("created_at")}
+        for field in references.get(name, ()):
+            indexes[field] = ReferenceIndex(field)
+        for field in lists.get(name, ()):
+            indexes[field] = ListIndex(field)
+        for field in numbers.get(name, ()):
+            indexes[field] = SortedIndex(field, (int, float))
+        if name in located:
+            indexes["location"] = GridIndex()
+        if name in texts:
+            indexes["text"] = text
+        all_indexes[name] = indexes
+    return all_indexes
+
+
+def sync_directory(path):
+    """flushes to disk the entries of the directory holding path"""
+    fd = os.open(os.path.dirname(path) or ".", os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
 
 
 class FileStorage:
     """serializes instances to a JSON file & deserializes back to instances"""
 
-    # string - path to the JSON file
-    __file_path = "file.json"
+    # string - path to the JSON file, or to a binary snapshot if it ends
+    # with .bin
+    __file_path = getenv("HBNB_FILE_PATH") or (
+        "file.bin" if getenv("HBNB_FILE_FORMAT") == "binary" else "file.json")
     # dictionary - empty but will store all objects by <class name>.id
     __objects = {}
+    # boolean - whether every write gives a new version
+    strong_versions = True
+    # version - latest immutable version of the objects of each class
+    __version = Version()
+    # dictionary - changes of the running write not yet in __version,
+    # <key> -> obj or None if deleted
+    __changes = {}
+    # local - version pinned by each thread for its reads, if any
+    __local = threading.local()
+    # dictionary - <class name> -> {<attribute>: index of the attribute}
+    __indexes = make_indexes()
+    # dictionary - objects stored by the running bulk load, indexed at its
+    # end, <key> -> obj, None out of a bulk load
+    __loading = None
+    # set - names of the attributes indexed in any class
+    __indexed = {field for indexes in __indexes.values()
+                 for index in indexes.values() for field in index.fields}
+    # dictionary - changes since the last save, <key> -> obj or None if deleted
+    __pending = {}
+    # dictionary - objects unchanged since written, obj -> JSON bytes or ""
+    __clean = {}
+    # boolean - keep one <class name>.json file per class in <__file_path>.d
+    __sharded = getenv("HBNB_FILE_LAYOUT") == "sharded"
+    # boolean - coordinate with the other processes sharing the files,
+    # which append their changes to the journal
+    __coordinated = getenv("HBNB_FILE_SHARED") == "1"
+    # boolean - append changes to a journal instead of rewriting the file
+    __journaling = getenv("HBNB_FILE_JOURNAL") == "1" or __coordinated
+    # integer - journal records after which the snapshot is compacted
+    __compact_every = int(getenv("HBNB_FILE_JOURNAL_COMPACT", "1000"))
+    # dictionary - <path> -> (mtime, size, inode) of the files when they
+    # were last read or written, None if they did not exist
+    __stamps = {}
+    # float - seconds save waits for more saves to write them at once, 0
+    # to write on each save
+    __write_behind = float(getenv("HBNB_FILE_WRITE_BEHIND", "0"))
+    # boolean - saved since the store was last written
+    __dirty = False
+    # events - set by save for the flusher, and by each flush
+    __wakeup = threading.Event()
+    __flushed = threading.Event()
+    __flusher = None
+    # lock - held while flushing, so that a flush waits for the running one
+    __flushing = threading.Lock()
+    # boolean - __shutdown is registered to run at exit
+    __exit_flush = False
+    # dictionary - <signal> -> handler it had before flush was installed
+    # on it
+    __handlers = {}
+    # list - what reload had to recover from backups since it last ran
+    __recovered = []
+    # boolean - a snapshot was read from its backup, whose changes up to
+    # the snapshot are in the backup log
+    __restored = False
+    __journal = None
+    __compactor = None
+    __coordinator = None
+    # integer - generation of the shared files this process is up to date
+    # with
+    __generation = 0
+    # lock - serializes the writes of the files
+    __lock = threading.Lock()
+    # lock - held for reading while looking objects up or writing them to
+    # disk, for writing while adding or removing them
+    __rw = RWLock()
+    # boolean - __objects was handed out by all, the next change copies it
+    # so that the dictionary being iterated never changes size
+    __shared = False
+    # dictionary - <class name> or <key> -> version of the class or object
+    __versions = {}
+    # counter - versions handed out, prefixed by __epoch to stay unique
+    # across restarts
+    __counter = itertools.count(1)
+    __epoch = uuid.uuid4().hex[:8]
 
-    def all(self, cls=None):
-        """returns the dictionary __objects"""
+    def __view(self):
+        """returns the version pinned by the thread, or the latest one"""
+        return getattr(self.__local, "version", None) or self.__version
+
+    def pin(self):
+        """pins the latest version of the objects for the reads of the
+        calling thread until unpin, its own writes moving the pin forward,
+        and returns it"""
+        local = self.__local
+        local.depth = getattr(local, "depth", 0) + 1
+        if local.depth == 1:
+            local.version = self.__version
+        return local.version
+
+    def unpin(self):
+        """releases the version pinned by the calling thread"""
+        local = self.__local
+        if getattr(local, "depth", 0):
+            local.depth -= 1
+            if not local.depth:
+                local.version = None
+
+    def all(self, cls=None, load=None):
+        """returns the dictionary __objects, left unchanged by later writes,
+        load is accepted for compatibility with DBStorage as relationships
+        are index lookups"""
+        version = self.__view()
         if cls is not None:
-            new_dict = {}
-            for key, value in self.__objects.items():
-                if cls == value.__class__ or cls == value.__class__.__name__:
-                    new_dict[key] = value
-            return new_dict
-        return self.__objects
+            return version.objects(self.__name(cls))
+        with self.__rw.read():
+            if version is self.__version:
+                FileStorage.__shared = True
+                return self.__objects
+        objs = {}
+        for name in version.classes:
+            objs.update(version.objects(name))
+        return objs
+
+    def stream(self, cls, batch=1000):
+        """yields the objects of class cls one at a time, batch is accepted
+        for compatibility with DBStorage"""
+        # a version never changes, so it is iterated without a copy and
+        # the writes made meanwhile are left out
+        for obj in self.__view().values(self.__name(cls)):
+            yield obj
+
+    def view(self, cls):
+        """returns a read-only live view of the objects of class cls"""
+        return View(self.__name(cls), self.__view)
+
+    @staticmethod
+    def __name(cls):
+        """returns the name of the class cls, or cls if it is a name"""
+        return cls if isinstance(cls, str) else getattr(cls, "__name__", None)
+
+    @contextmanager
+    def __writing(self):
+        """holds the lock for writing within a with block, then publishes
+        the changes made in it as a new version"""
+        with self.__rw.write():
+            try:
+                yield
+            finally:
+                if self.__changes:
+                    FileStorage.__version = self.__version.change(
+                        self.__changes)
+                    self.__changes.clear()
+                    if getattr(self.__local, "version", None) is not None:
+                        self.__local.version = self.__version
+
+    @contextmanager
+    def __bulk(self):
+        """defers indexing the objects stored within a with block to one
+        pass over each index at its end, the sorted indexes being sorted
+        once"""
+        if self.__loading is not None:
+            yield
+            return
+        FileStorage.__loading = {}
+        indexes = [index for indexes in self.__indexes.values()
+                   for index in indexes.values()
+                   if isinstance(index, SortedIndex)]
+        for index in indexes:
+            index.suspend()
+        try:
+            yield
+        finally:
+            loaded = {}
+            for key, obj in self.__loading.items():
+                loaded.setdefault(obj.__class__.__name__, []).append(
+                    (key, obj))
+            FileStorage.__loading = None
+            for name, items in loaded.items():
+                for index in self.__indexes.get(name, {}).values():
+                    index.extend(items)
+            for index in indexes:
+                index.resume()
+
+    def __unshare(self):
+        """copies __objects before a change if all handed it out"""
+        if self.__shared:
+            FileStorage.__objects = dict(self.__objects)
+            FileStorage.__shared = False
+
+    def __add(self, obj):
+        """stores obj in __objects and its class partition, indexing it
+        first so that an object failing to be indexed is not stored, or
+        at the end of the running bulk load"""
+        key = obj.__class__.__name__ + "." + obj.id
+        old = self.__objects.get(key)
+        if self.__loading is not None:
+            self.__loading[key] = obj
+        else:
+            done = []
+            try:
+                for index in self.__indexes.get(obj.__class__.__name__,
+                                                {}).values():
+                    index.add(key, obj)
+                    done.append(index)
+            except Exception:
+                for index in done:
+                    index.remove(key)
+                    if old is not None:
+                        index.add(key, old)
+                raise
+        self.__unshare()
+        if old is not None and old is not obj:
+            self.__clean.pop(old, None)
+        self.__objects[key] = obj
+        self.__changes[key] = obj
+        self.__bump(key)
+        return key
+
+    def __discard(self, key):
+        """removes the object stored under key, if any"""
+        if key not in self.__objects:
+            return None
+        self.__unshare()
+        if self.__loading is not None:
+            self.__loading.pop(key, None)
+        obj = self.__objects.pop(key, None)
+        if obj is not None:
+            self.__changes[key] = None
+            self.__clean.pop(obj, None)
+            for index in self.__indexes.get(obj.__class__.__name__,
+                                            {}).values():
+                index.remove(key)
+            self.__bump(key)
+            self.__versions.pop(key, None)
+        return obj
+
+    def __bump(self, key):
+        """gives the object stored at key and its class a new version"""
+        version = next(self.__counter)
+        self.__versions[key] = version
+        self.__versions[key.split(".", 1)[0]] = version
+
+    def version(self, cls, id=None):
+        """returns the version of the objects of class cls, or of the one
+        with the given id, None if there is no such object"""
+        name = cls if isinstance(cls, str) else getattr(cls, "__name__", None)
+        with self.__rw.read():
+            if id is None:
+                version = self.__versions.get(name, 0)
+            else:
+                version = self.__versions.get("{}.{}".format(name, id))
+        if version is None:
+            return None
+        return "{}-{:d}".format(self.__epoch, version)
+
+    def __log(self):
+        """returns the journal kept next to the JSON file"""
+        path = self.__file_path + ".log"
+        if self.__journal is None or self.__journal.path != path:
+            FileStorage.__journal = Journal(path)
+        return self.__journal
+
+    def __coordinate(self):
+        """returns the coordinator of the processes sharing the files"""
+        path = self.__file_path + ".gen"
+        if self.__coordinator is None or self.__coordinator.path != path:
+            FileStorage.__coordinator = Coordinator(self.__file_path)
+        return self.__coordinator
+
+    @contextmanager
+    def __interlocked(self, shared=False):
+        """holds the lock of the processes sharing the files within a with
+        block if they are coordinated"""
+        if not self.__coordinated:
+            yield
+            return
+        with self.__coordinate().locked(shared):
+            yield
 
     def new(self, obj):
         """sets in __objects the obj with key <obj class name>.id"""
         if obj is not None:
-            key = obj.__class__.__name__ + "." + obj.id
-            self.__objects[key] = obj
+            with self.__writing():
+                self.__pending[self.__add(obj)] = obj
+                self.__clean.pop(obj, None)
+
+    def touch(self, obj, name=None):
+        """flags a stored obj as changed since it was last written, gives it
+        a new version and reindexes it if its attribute name is indexed"""
+        key = obj.__class__.__name__ + "." + str(getattr(obj, "id", ""))
+        if self.__objects.get(key) is not obj:
+            return
+        with self.__rw.write():
+            if self.__objects.get(key) is not obj:
+                return
+            if self.__clean.pop(obj, None) is not None:
+                self.__pending[key] = obj
+            self.__bump(key)
+            if name in self.__indexed:
+                for index in self.__indexes.get(obj.__class__.__name__,
+                                                {}).values():
+                    if name in index.fields:
+                        index.add(key, obj)
+
+    def __shard(self, name, path=None):
+        """returns the path of the file holding the objects of class name"""
+        path = path or self.__file_path
+        ext = ".bin" if snapshot.is_binary(path) else ".json"
+        return os.path.join(path + ".d", name + ext)
+
+    def __capture(self, objs):
+        """returns the (key, obj, JSON bytes or None) of the (key, obj)
+        pairs of objs with the bytes cached for them, the read lock being
+        held, so that they are written without it"""
+        return [(key, obj, self.__clean.get(obj) or None)
+                for key, obj in objs]
+
+    @staticmethod
+    def __dump(objs, path, binary=False, replace=True):
+        """writes the (key, obj, JSON bytes or None) of objs, encoding the
+        objects without bytes, to <path>.tmp synced to disk, then installs
+        it at path unless replace is False, returns the (size, CRC-32) of
+        the snapshot and the {obj: JSON bytes} encoded"""
+        encoded = {}
+        if binary:
+            buf = io.BytesIO()
+            snapshot.dump([(key, obj) for key, obj, fragment in objs], buf)
+            data = buf.getvalue()
+        else:
+            fragments = []
+            for key, obj, fragment in objs:
+                if fragment is None:
+                    fragment = encoded[obj] = serializer.encode(obj)
+                fragments.append(serializer.dumps(key) + b":" + fragment)
+            data = b"{" + b",".join(fragments) + b"}"
+        with open(path + ".tmp", 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        value = snapshot.digest(data)
+        if replace:
+            FileStorage.__install(path, value)
+        return value, encoded
+
+    @staticmethod
+    def __install(path, value):
+        """moves <path>.tmp of (size, CRC-32) value to path, keeping the
+        snapshot it replaces as <path>.bak"""
+        snapshot.backup(path)
+        snapshot.seal(path, value)
+        os.replace(path + ".tmp", path)
+        sync_directory(path)
+
+    def recovered(self):
+        """returns what was recovered since the last reload, one line per
+        damaged snapshot or skipped journal record"""
+        return list(self.__recovered)
+
+    def __report(self, line):
+        """records a line of recovered() and prints it to stderr"""
+        self.__recovered.append(line)
+        print("FileStorage: " + line, file=sys.stderr)
+
+    def __recover(self, path, problems, source, count):
+        """reports that the snapshot at path could not be read because of
+        problems, and that count objects were recovered from source"""
+        if source is None:
+            line = "{}: {}; no intact copy, kept the {:d} objects read " \
+                   "before the damage".format(path, "; ".join(problems),
+                                              count)
+        else:
+            line = "{}: {}; recovered {:d} objects from {}".format(
+                path, "; ".join(problems), count, source)
+        self.__report(line)
+        if source is not None:
+            FileStorage.__restored = True
+
+    def __load(self, path, report=None):
+        """returns the objects deserialized one by one from the snapshot at
+        path, or from its backup if it is damaged, calling report(objects,
+        bytes) for each batch read"""
+        if not os.path.exists(path) and not os.path.exists(path + ".bak"):
+            return []
+        problems = []
+        kept = []
+        for source in (path, path + ".bak"):
+            objs = []
+            try:
+                if not os.path.exists(source):
+                    raise FileNotFoundError("missing")
+                problem = snapshot.verify(source)
+                if problem is not None:
+                    raise ValueError(problem)
+                self.__parse(source, objs, report)
+            except Exception as e:
+                problems.append("{} ({})".format(
+                    str(e) or e.__class__.__name__, source))
+                kept = kept or objs
+                continue
+            if problems:
+                self.__recover(path, problems, source, len(objs))
+            return objs
+        self.__recover(path, problems, None, len(kept))
+        return kept
+
+    @staticmethod
+    def __parse(path, objs, report=None):
+        """appends to objs the objects of the snapshot at path, calling
+        report(objects, bytes) for each batch read"""
+        reported = done = position = 0
+        try:
+            for obj, position in snapshot.iterread(path):
+                objs.append(obj)
+                if report is not None and len(objs) - reported == 10000:
+                    report(len(objs) - reported, position - done)
+                    reported, done = len(objs), position
+            position = os.path.getsize(path)
+        finally:
+            if report is not None:
+                report(len(objs) - reported, position - done)
 
     def save(self):
-        """serializes __objects to the JSON file (path: __file_path)"""
-        json_objects = {}
-        for key in self.__objects:
-            json_objects[key] = self.__objects[key].to_dict()
-        with open(self.__file_path, 'w') as f:
-            json.dump(json_objects, f)
-
-    def reload(self):
-        """deserializes the JSON file to __objects"""
+        """serializes __objects to the JSON file (path: __file_path), or
+        lets the flusher write it within __write_behind seconds"""
+        if not self.__write_behind:
+            self.__save()
+            return
+        FileStorage.__dirty = True
+        self.__guard()
+        if self.__flusher is None or not self.__flusher.is_alive():
+            FileStorage.__flusher = threading.Thread(
+                target=self.__flush_behind, daemon=True)
+            self.__flusher.start()
+        self.__wakeup.set()
+
+    def __at_exit(self):
+        """makes __shutdown run when the process exits"""
+        if not self.__exit_flush:
+            FileStorage.__exit_flush = True
+            atexit.register(self.__shutdown)
+
+    def __guard(self):
+        """makes the saves left to the flusher written when the process
+        exits or is stopped by SIGTERM or SIGINT, the signal handlers
+        being only installed from the main thread"""
+        self.__at_exit()
+        if self.__handlers or \
+                threading.current_thread() is not threading.main_thread():
+            return
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            self.__handlers[signum] = signal.signal(signum, self.__stop)
+
+    def __shutdown(self):
+        """writes the saves left to the flusher, then the full-text index
+        if it was built and changed since it was last read or written"""
+        self.flush()
+        with self.__lock, self.__rw.read():
+            if self.__text().changed:
+                self.__text().dump(self.__file_path + ".fts")
+
+    def __stop(self, signum, frame):
+        """flushes the saves left to the flusher and the full-text index,
+        then handles the signal as it was before"""
+        self.__shutdown()
+        previous = self.__handlers.get(signum)
+        if callable(previous):
+            previous(signum, frame)
+        elif previous != signal.SIG_IGN:
+            signal.signal(signum, signal.SIG_DFL)
+            os.kill(os.getpid(), signum)
+
+    def __flush_behind(self):
+        """writes the saves made within __write_behind seconds of the first
+        one at once, or with the flush made meanwhile, until the process
+        exits"""
+        while True:
+            self.__wakeup.wait()
+            self.__flushed.clear()
+            self.__flushed.wait(self.__write_behind)
+            self.__wakeup.clear()
+            self.flush()
+
+    def flush(self):
+        """writes at once what was saved since the store was last written"""
+        with self.__flushing:
+            if self.__dirty:
+                FileStorage.__dirty = False
+                self.__save()
+        self.__flushed.set()
+
+    def __save(self):
+        """writes __objects to the files, or the changes to the journal"""
+        if not self.__journaling:
+            self.__save_snapshot()
+            return
+        lock = self.__writing() if self.__coordinated else self.__rw.read()
+        with self.__lock, lock, self.__interlocked():
+            journal = self.__log()
+            if self.__coordinated:
+                self.__follow()
+            journal.append([(key, None if obj is None else
+                             serializer.members(obj))
+                            for key, obj in self.__pending.items()])
+            for obj in self.__pending.values():
+                if obj is not None:
+                    self.__clean.setdefault(obj, "")
+            self.__remember([journal.path])
+            if self.__coordinated:
+                FileStorage.__generation = self.__coordinate().bump()
+            self.__pending.clear()
+        if journal.records >= self.__compact_every:
+            self.__compact()
+
+    def __save_snapshot(self):
+        """rewrites the snapshot files holding changed objects, taking the
+        objects under the read lock but encoding and writing them without
+        it, so that the writers only wait for the copy"""
+        with self.__lock:
+            with self.__rw.read():
+                pending = dict(self.__pending)
+                self.__pending.clear()
+                if self.__sharded:
+                    os.makedirs(self.__file_path + ".d", exist_ok=True)
+                    changed = {key.split(".", 1)[0] for key in pending}
+                    targets = [(self.__shard(name), self.__version.items(name))
+                               for name in classes
+                               if name in changed or
+                               not os.path.exists(self.__shard(name))]
+                else:
+                    targets = [(self.__file_path, self.__objects.items())]
+                targets = [(path, self.__capture(objs))
+                           for path, objs in targets]
+                # a change made while writing pops its object, which is
+                # then saved again and does not take the bytes encoded
+                for path, objs in targets:
+                    for key, obj, fragment in objs:
+                        self.__clean.setdefault(obj, "")
+            try:
+                encoded = {}
+                for path, objs in targets:
+                    encoded.update(self.__dump(objs, path,
+                                               snapshot.is_binary(path))[1])
+            except BaseException:
+                with self.__rw.read():
+                    for key, obj in pending.items():
+                        self.__pending.setdefault(key, obj)
+                raise
+            with self.__rw.read():
+                for obj, fragment in encoded.items():
+                    if self.__clean.get(obj) == "":
+                        self.__clean[obj] = fragment
+                journal = self.__log()
+                journal.clear()
+                self.__remember([path for path, objs in targets] +
+                                [journal.rotated_path, journal.path])
+
+    def __reporter(self, paths, progress):
+        """returns a thread-safe report(objects, bytes) function calling
+        progress(objects loaded, bytes read, total bytes) with the totals"""
+        total = sum(os.path.getsize(path) for path in paths
+                    if os.path.exists(path))
+        loaded = [0, 0]
+        lock = threading.Lock()
+
+        def report(objects, size):
+            """adds a batch read from one of the files to the totals"""
+            with lock:
+                loaded[0] += objects
+                loaded[1] += size
+                progress(loaded[0], loaded[1], total)
+        return report
+
+    @staticmethod
+    def __stamp(path):
+        """returns the (mtime, size, inode) of path, None if it is missing"""
         try:
-            with open(self.__file_path, 'r') as f:
-                jo = json.load(f)
-            for key in jo:
-                self.__objects[key] = classes[jo[key]["__class__"]](**jo[key])
-        except Exception:
-            pass
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size, st.st_ino
+
+    def __remember(self, paths):
+        """records the current stamps of paths as seen by this process"""
+        for path in paths:
+            self.__stamps[path] = self.__stamp(path)
+
+    def __paths(self):
+        """returns the snapshot files of the configured layout"""
+        if self.__sharded and os.path.isdir(self.__file_path + ".d"):
+            return [self.__shard(name) for name in classes]
+        return [self.__file_path]
+
+    def __read(self, paths, progress=None):
+        """loads the objects of the snapshot files in paths in parallel,
+        returns the set of their keys"""
+        report = None
+        if progress is not None:
+            report = self.__reporter(paths, progress)
+        keys = set()
+        with ThreadPoolExecutor(max_workers=len(paths)) as pool:
+            for objs in pool.map(self.__load, paths, [report] * len(paths)):
+                for obj in objs:
+                    keys.add(self.__add(obj))
+                    self.__clean[obj] = ""
+        return keys
+
+    def __reset(self, paths, progress=None):
+        """loads the snapshot files in paths in place of the objects, but
+        the pending ones, so that the store holds what the shared files
+        hold"""
+        stale = set(self.__objects) - set(self.__pending)
+        with self.__bulk():
+            for key in stale - self.__read(paths, progress):
+                self.__discard(key)
+
+    def __apply(self, changes, skip=()):
+        """applies the (key, dict) changes read from the journal but those
+        of the keys of skip, reporting and skipping the records that do
+        not make an object"""
+        journal = self.__log()
+        for key, value in changes:
+            if key in skip:
+                continue
+            if value is None:
+                self.__discard(key)
+                continue
+            try:
+                obj = classes[value["__class__"]](**value)
+            except (KeyError, TypeError, ValueError) as e:
+                self.__report("{}: skipped the record of {} ({}: {})".format(
+                    journal.path, key, e.__class__.__name__, e))
+                continue
+            self.__add(obj)
+            self.__clean[obj] = ""
+        for line in journal.damaged:
+            self.__report(line + "; skipped")
+        del journal.damaged[:]
+
+    def reload(self, progress=None):
+        """deserializes the JSON file and replays the journal to __objects,
+        calling progress(objects loaded, bytes read, total bytes) if given"""
+        with self.__lock, self.__writing(), self.__interlocked(True):
+            paths = self.__paths()
+            journal = self.__log()
+            self.__remember(paths + [journal.rotated_path, journal.path])
+            # the full-text index is built by the first search
+            self.__text().defer(self.__file_path + ".fts")
+            del self.__recovered[:]
+            FileStorage.__restored = False
+            with self.__bulk():
+                if self.__coordinated:
+                    self.__reset(paths, progress)
+                else:
+                    self.__read(paths, progress)
+                self.__apply(journal.replay(backup=self.__restored))
+            if self.__coordinated:
+                FileStorage.__generation = self.__coordinate().generation()
+        # the full-text index is only written at compaction and exit, the
+        # objects loaded keeping what is still up to date in the former one
+        self.__at_exit()
+        if self.__write_behind:
+            self.__guard()
+        if self.__journaling and journal.records >= self.__compact_every:
+            self.__compact()
+
+    def refresh(self):
+        """reloads only what changed on disk since it was last read or
+        written by this process, returns False if nothing did"""
+        if self.__coordinated:
+            if self.__coordinate().generation() == self.__generation:
+                return False
+            with self.__lock, self.__writing(), self.__interlocked(True):
+                return self.__follow()
+        with self.__lock, self.__writing():
+            paths = self.__paths()
+            journal = self.__log()
+            logs = [journal.rotated_path, journal.path]
+            stamps = {path: self.__stamp(path) for path in paths + logs}
+            changed = [path for path in paths + logs
+                       if stamps[path] != self.__stamps.get(path)]
+            if not changed:
+                return False
+            last, log = self.__stamps.get(journal.path), stamps[journal.path]
+            for path in changed:
+                self.__stamps[path] = stamps[path]
+            if changed == [journal.path] and last and log and \
+                    log[2] == last[2] and log[1] >= journal.offset:
+                self.__apply(journal.follow())
+                return True
+            with self.__bulk():
+                self.__read([path for path in changed if path in paths])
+                self.__apply(journal.replay(repair=False))
+            return True
+
+    def __follow(self):
+        """applies the changes saved by the other processes since this one
+        last saw the shared files, but those of its pending objects, the
+        locks being held, returns False if there were none"""
+        generation, base = self.__coordinate().read()
+        if generation == self.__generation:
+            return False
+        journal = self.__log()
+        last = self.__stamps.get(journal.path)
+        log = self.__stamp(journal.path)
+        rotated = self.__stamp(journal.rotated_path)
+        if self.__generation >= base:
+            if not (last and log and log[2] == last[2]):
+                journal.records = journal.offset = 0
+            changes = journal.follow()
+        elif last and rotated and rotated[2] == last[2]:
+            changes = journal.follow(rotated=True)
+        else:
+            paths = self.__paths()
+            self.__reset(paths)
+            self.__remember(paths)
+            changes = journal.replay(repair=False)
+        self.__apply(changes, self.__pending)
+        self.__remember([journal.rotated_path, journal.path])
+        FileStorage.__generation = generation
+        return True
+
+    def __compact(self):
+        """folds the journal into a new snapshot in a background thread"""
+        with self.__lock:
+            if self.__compactor is not None and self.__compactor.is_alive():
+                return
+            lock = self.__writing() if self.__coordinated else \
+                self.__rw.read()
+            with lock, self.__interlocked():
+                journal = self.__log()
+                if self.__coordinated:
+                    if os.path.exists(journal.rotated_path):
+                        return
+                    self.__follow()
+                journal.rotate()
+                if self.__coordinated:
+                    self.__coordinate().rebase()
+                self.__remember([journal.rotated_path, journal.path])
+                objs = self.__capture(self.__objects.items())
+            FileStorage.__compactor = threading.Thread(
+                target=self.__write_snapshot,
+                args=(objs, self.__file_path, self.__sharded, journal),
+                daemon=True)
+            self.__compactor.start()
+
+    def __write_snapshot(self, objs, path, sharded, journal):
+        """writes objs to a new snapshot at path then drops the rotated log"""
+        if sharded:
+            os.makedirs(path + ".d", exist_ok=True)
+            shards = {name: [] for name in classes}
+            for key, obj, fragment in objs:
+                shards[obj.__class__.__name__].append((key, obj, fragment))
+            targets = [self.__shard(name, path) for name in shards]
+            values = [self.__dump(shards[name], target,
+                                  snapshot.is_binary(path),
+                                  replace=False)[0]
+                      for name, target in zip(shards, targets)]
+        else:
+            targets = [path]
+            values = [self.__dump(objs, path, snapshot.is_binary(path),
+                                  replace=False)[0]]
+        with self.__lock, self.__rw.read(), self.__interlocked():
+            for target, value in zip(targets, values):
+                self.__install(target, value)
+            journal.discard_rotated()
+            self.__remember(targets + [journal.rotated_path])
+            if self.__text().changed:
+                self.__text().dump(path + ".fts")
 
     def delete(self, obj=None):
         """delete obj from __objects if it’s inside"""
         if obj is not None:
             key = obj.__class__.__name__ + '.' + obj.id
-            if key in self.__objects:
-                del self.__objects[key]
+            with self.__writing():
+                if self.__discard(key) is not None:
+                    self.__pending[key] = None
 
     def close(self):
-        """call reload() method for deserializing the JSON file to objects"""
-        self.reload()
+        """reloads the objects changed on disk since they were last read"""
+        self.refresh()
 
-    def get(self, cls, id):
-        """Retrieve one object"""
+    def get(self, cls, id, load=None):
+        """Retrieve one object, load is accepted as in all"""
         if cls in classes.values() and id and isinstance(id, str):
-            objs = self.all(cls)
-            for key, value in objs.items():
-                if key.split(".")[1] == id:
-                    return value
+            return self.__view().get(cls.__name__, cls.__name__ + "." + id)
         return None
 
+    def __index(self, cls, field, version):
+        """returns the index of the attribute field of the class cls if
+        the objects it covers are the same in version as in the latest
+        one, the read lock being held, else None"""
+        name = self.__name(cls)
+        index = self.__indexes.get(name, {}).get(field)
+        if version is self.__version:
+            return index
+        # the buckets of a class are shared by the versions made since it
+        # was last changed, which its indexes hold the objects of
+        for covered in (texts if field == "text" else (name,)):
+            if version.classes.get(covered) is not \
+                    self.__version.classes.get(covered):
+                return None
+        return index
+
+    def lookup(self, cls, field, value):
+        """returns the objects of class cls whose attribute field is value,
+        or holds value for the list attributes such as Place.amenity_ids"""
+        name = self.__name(cls)
+        version = self.__view()
+        with self.__rw.read():
+            index = self.__index(name, field, version)
+            if isinstance(index, ReferenceIndex):
+                return index.lookup(value)
+        if isinstance(self.__indexes.get(name, {}).get(field), ListIndex):
+            return [obj for obj in version.values(name)
+                    if value in (getattr(obj, field, None) or ())]
+        return [obj for obj in version.values(name)
+                if getattr(obj, field, None) == value]
+
+    def __text(self):
+        """returns the full-text index of the classes of texts"""
+        return self.__indexes["Place"]["text"]
+
+    def search(self, query, limit=None):
+        """returns the (score, place) of the places whose text or reviews
+        match words of query, best first, at most limit of them"""
+        version = self.__view()
+        with self.__rw.read():
+            text = self.__index(Place, "text", version)
+            if text is not None:
+                scores = text.search(query)
+        if text is None:
+            text = TextIndex(texts, owners)
+            for name in texts:
+                for key, obj in version.items(name):
+                    text.add(key, obj)
+            scores = text.search(query)
+        found = [(score, place) for score, place in
+                 ((score, version.get("Place", "Place." + str(id)))
+                  for id, score in scores.items())
+                 if place is not None]
+        return heapq.nlargest(limit or len(found), found,
+                              key=itemgetter(0))
+
+    def within(self, cls, box):
+        """returns the objects of class cls located in the bounding box"""
+        version = self.__view()
+        with self.__rw.read():
+            index = self.__index(cls, "location", version)
+            if index is not None:
+                return index.within(box)
+        return [obj for obj in version.values(self.__name(cls))
+                if geo.location(obj) and
+                geo.contains(box, *geo.location(obj))]
+
+    def near(self, cls, lat, lng, radius_km, limit=None):
+        """returns the (distance, obj) of the objects of class cls located
+        within radius_km of a point, nearest first, at most limit of them"""
+        return geo.nearest(self.within(cls, geo.around(lat, lng, radius_km)),
+                           lat, lng, radius_km, limit)
+
+    def between(self, cls, field, low=None, high=None, limit=None,
+                reverse=False):
+        """returns the objects of class cls whose numeric attribute field
+        lies between low and high, None meaning unbounded, sorted by field
+        in ascending or reverse order, at most limit of them"""
+        name = self.__name(cls)
+        version = self.__view()
+        with self.__rw.read():
+            index = self.__index(name, field, version)
+            if isinstance(index, SortedIndex):
+                return [version.get(name, key) for key in
+                        index.keys_between(low, high, limit, reverse)]
+        index = SortedIndex(field, (int, float))
+        index.suspend()
+        for key, obj in version.items(name):
+            index.add(key, obj)
+        index.resume()
+        return [version.get(name, key) for key in
+                index.keys_between(low, high, limit, reverse)]
+
+    def page(self, cls, limit, cursor=None, **filters):
+        """returns the at most limit objects of class cls matching the
+        attribute values of filters that follow cursor in (created_at, id)
+        order, and the cursor of the next page or None"""
+        name = self.__name(cls)
+        if filters:
+            field, value = sorted(filters.items())[0]
+            objs = [obj for obj in self.lookup(cls, field, value)
+                    if all(getattr(obj, f, None) == v
+                           for f, v in filters.items())]
+            return pagination.page(objs, limit, cursor)
+        if name not in classes:
+            return [], None
+        version = self.__view()
+        with self.__rw.read():
+            index = self.__index(name, "created_at", version)
+            if index is not None:
+                entry = None
+                if cursor is not None:
+                    created_at, id = pagination.decode(cursor)
+                    entry = (created_at, name + "." + id)
+                objs = [version.get(name, key)
+                        for key in index.keys_after(entry, limit + 1)]
+                return pagination.finish(objs, limit)
+        return pagination.page(version.values(name), limit, cursor)
+
     def count(self, cls=None):
         """Count number of objects in storage"""
-        return (len(self.all(cls)))
+        version = self.__view()
+        if cls is not None:
+            return version.count(self.__name(cls))
+        if version is self.__version:
+            return len(self.__objects)
+        return sum(version.counts.values())
+
+    def counts(self):
+        """returns the number of objects of each class"""
+        version = self.__view()
+        return {name: version.count(name) for name in classes}
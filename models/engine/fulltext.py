@@ -0,0 +1,202 @@
+#!/usr/bin/python3
+"""
+Contains the full-text index of FileStorage
+
+Each indexed object is a document made of its text attributes, owned by
+the place it describes: a Place owns itself and a Review the place it is
+about. Documents are ranked with BM25 and a place scores the sum of the
+scores of its documents.
+"""
+
+from math import log
+import marshal
+import os
+import re
+import threading
+import zlib
+
+VERSION = 1
+# floats - BM25 term frequency saturation and length normalization
+K1 = 1.2
+B = 0.75
+TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """returns the lowercase words of text"""
+    return TOKEN.findall(text.lower()) if isinstance(text, str) else []
+
+
+class TextIndex:
+    """inverted index of the text attributes of the objects of some classes"""
+
+    def __init__(self, texts, owners):
+        """Initializes an empty index of the attributes texts[<class name>],
+        a document belonging to the id in its attribute owners[<class name>]
+        or to the object itself"""
+        self.texts = texts
+        self.owners = owners
+        self.fields = tuple({field for fields in texts.values()
+                             for field in fields} |
+                            set(owners.values()))
+        # dictionary - <term> -> {<key>: frequency of term in the document}
+        self.postings = {}
+        # dictionary - <key> -> (owner id, checksum, length, {<term>: tf})
+        self.docs = {}
+        # integer - sum of the lengths of the documents
+        self.total = 0
+        # set - keys of the documents loaded from disk not yet seen again
+        self.stale = set()
+        # boolean - documents were indexed or removed since the index was
+        # last loaded or dumped
+        self.changed = False
+        # dictionary - <key> -> obj added while the index is deferred, None
+        # once it is built
+        self.pending = None
+        # string - path of the documents read when the index is built
+        self.path = None
+        # lock - held while building, as the first searches may be
+        # concurrent
+        self.lock = threading.Lock()
+
+    def __document(self, obj):
+        """returns the text of obj and the id of the place owning it"""
+        name = obj.__class__.__name__
+        text = " ".join(value for value in
+                        (getattr(obj, field, None)
+                         for field in self.texts.get(name, ()))
+                        if isinstance(value, str))
+        owner = obj.id
+        if name in self.owners:
+            owner = getattr(obj, self.owners[name], None)
+        return text, owner
+
+    def add(self, key, obj):
+        """indexes the document of the object stored at key, or keeps it
+        for the build if the index is deferred"""
+        if obj.__class__.__name__ not in self.texts:
+            return
+        if self.pending is not None:
+            self.pending[key] = obj
+            return
+        self.__index(key, obj)
+
+    def __index(self, key, obj):
+        """indexes the document of the object stored at key"""
+        text, owner = self.__document(obj)
+        checksum = zlib.crc32(text.encode("utf-8"))
+        doc = self.docs.get(key)
+        if key in self.stale and doc[:2] == (owner, checksum):
+            self.stale.discard(key)
+            return
+        self.__drop(key)
+        terms = {}
+        words = tokenize(text)
+        for word in words:
+            terms[word] = terms.get(word, 0) + 1
+        for term, tf in terms.items():
+            self.postings.setdefault(term, {})[key] = tf
+        self.docs[key] = (owner, checksum, len(words), terms)
+        self.total += len(words)
+        self.changed = True
+
+    def extend(self, items):
+        """indexes the documents of the (key, obj) pairs of items"""
+        for key, obj in items:
+            self.add(key, obj)
+
+    def remove(self, key):
+        """removes the document of the object stored at key"""
+        if self.pending is not None:
+            self.pending.pop(key, None)
+            return
+        self.__drop(key)
+
+    def __drop(self, key):
+        """removes the indexed document of key"""
+        doc = self.docs.pop(key, None)
+        if doc is None:
+            return
+        self.stale.discard(key)
+        self.total -= doc[2]
+        self.changed = True
+        for term in doc[3]:
+            keys = self.postings[term]
+            del keys[key]
+            if not keys:
+                del self.postings[term]
+
+    def defer(self, path):
+        """defers reading the documents written to path and indexing the
+        objects added until the index is first searched or built, if it
+        is empty"""
+        if self.docs or self.pending is not None:
+            return
+        self.pending = {}
+        self.path = path
+
+    def build(self):
+        """reads the documents and indexes the objects deferred, keeping
+        the documents read that are unchanged"""
+        if self.pending is None:
+            return
+        with self.lock:
+            if self.pending is None:
+                return
+            self.load(self.path)
+            for key, obj in self.pending.items():
+                self.__index(key, obj)
+            self.prune()
+            self.pending = None
+
+    def search(self, query):
+        """returns the {<owner id>: BM25 score} of the places matching a
+        word of query"""
+        self.build()
+        scores = {}
+        if not self.docs:
+            return scores
+        average = self.total / len(self.docs) or 1
+        for term in set(tokenize(query)):
+            keys = self.postings.get(term, {})
+            idf = log(1 + (len(self.docs) - len(keys) + 0.5) /
+                      (len(keys) + 0.5))
+            for key, tf in keys.items():
+                owner, checksum, length, terms = self.docs[key]
+                norm = K1 * (1 - B + B * length / average)
+                score = idf * tf * (K1 + 1) / (tf + norm)
+                scores[owner] = scores.get(owner, 0) + score
+        return scores
+
+    def dump(self, path):
+        """writes the documents to the file at path"""
+        self.build()
+        with open(path + ".tmp", 'wb') as f:
+            marshal.dump((VERSION, self.docs), f)
+        os.replace(path + ".tmp", path)
+        self.changed = False
+
+    def load(self, path):
+        """reads the documents written to path into an empty index, they
+        are kept by add if unchanged and dropped by prune otherwise"""
+        if self.docs:
+            return
+        try:
+            with open(path, 'rb') as f:
+                version, docs = marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            return
+        if version != VERSION:
+            return
+        for key, doc in docs.items():
+            self.docs[key] = doc
+            self.total += doc[2]
+            for term, tf in doc[3].items():
+                self.postings.setdefault(term, {})[key] = tf
+        self.stale = set(docs)
+        self.changed = False
+
+    def prune(self):
+        """removes the loaded documents whose objects were not seen again"""
+        for key in list(self.stale):
+            self.__drop(key)
@@ -0,0 +1,84 @@
+#!/usr/bin/python3
+"""
+Contains the geometry of the location searches of the storage engines
+
+A bounding box is a (south, west, north, east) tuple of degrees, west
+being greater than east for a box crossing the antimeridian.
+"""
+
+import heapq
+from math import asin, cos, degrees, radians, sin, sqrt
+from operator import itemgetter
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def location(obj):
+    """returns the (latitude, longitude) of obj, or None if obj was not
+    given valid coordinates"""
+    lat = vars(obj).get("latitude")
+    lng = vars(obj).get("longitude")
+    for value in (lat, lng):
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return None
+    if not -90 <= lat <= 90 or not -180 <= lng <= 180:
+        return None
+    return lat, lng
+
+
+def distance_km(lat1, lng1, lat2, lng2):
+    """returns the great-circle distance between two points"""
+    lat1, lng1, lat2, lng2 = map(radians, (lat1, lng1, lat2, lng2))
+    a = (sin((lat2 - lat1) / 2) ** 2 +
+         cos(lat1) * cos(lat2) * sin((lng2 - lng1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * asin(min(1.0, sqrt(a)))
+
+
+def around(lat, lng, radius_km):
+    """returns the bounding box of the circle of radius_km around a point"""
+    delta = degrees(radius_km / EARTH_RADIUS_KM)
+    south, north = lat - delta, lat + delta
+    if south <= -90 or north >= 90:
+        return max(south, -90.0), -180.0, min(north, 90.0), 180.0
+    delta = degrees(asin(min(1.0, sin(radians(delta)) / cos(radians(lat)))))
+    if delta >= 180:
+        return south, -180.0, north, 180.0
+    west, east = lng - delta, lng + delta
+    if west < -180:
+        west += 360
+    if east > 180:
+        east -= 360
+    return south, west, north, east
+
+
+def contains(box, lat, lng):
+    """tells whether the point (lat, lng) lies in the bounding box"""
+    south, west, north, east = box
+    if not south <= lat <= north:
+        return False
+    if west <= east:
+        return west <= lng <= east
+    return lng >= west or lng <= east
+
+
+def spans(box):
+    """returns the one or two (west, east) longitude ranges of the box"""
+    south, west, north, east = box
+    if west <= east:
+        return [(west, east)]
+    return [(west, 180.0), (-180.0, east)]
+
+
+def nearest(objs, lat, lng, radius_km, limit=None):
+    """returns the (distance, obj) of the objects of objs located within
+    radius_km of a point, nearest first, keeping only limit of them"""
+    found = []
+    for obj in objs:
+        point = location(obj)
+        if point is not None:
+            distance = distance_km(lat, lng, *point)
+            if distance <= radius_km:
+                found.append((distance, obj))
+    if limit is not None:
+        return heapq.nsmallest(limit, found, key=itemgetter(0))
+    return sorted(found, key=itemgetter(0))
@@ -0,0 +1,252 @@
+#!/usr/bin/python3
+"""
+Contains the secondary indexes maintained by FileStorage
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from math import floor
+from models.engine import geo
+
+
+def hashable(value):
+    """tells whether value can be a key of the entries of an index"""
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+class ReferenceIndex:
+    """maps each value of an attribute to the objects holding that value"""
+
+    def __init__(self, field):
+        """Initializes an empty index on the attribute field"""
+        self.field = field
+        self.fields = (field,)
+        # dictionary - <value> -> {<key>: obj}
+        self.entries = {}
+        # dictionary - <key> -> value indexed for the object stored at key
+        self.values = {}
+
+    def add(self, key, obj):
+        """indexes the object stored at key in place of its former entry"""
+        self.remove(key)
+        value = getattr(obj, self.field, None)
+        if not hashable(value):
+            return
+        self.values[key] = value
+        self.entries.setdefault(value, {})[key] = obj
+
+    def extend(self, items):
+        """indexes the objects of the (key, obj) pairs of items at once"""
+        field, values, entries = self.field, self.values, self.entries
+        for key, obj in items:
+            if key in values:
+                self.remove(key)
+            value = getattr(obj, field, None)
+            if not hashable(value):
+                continue
+            values[key] = value
+            objs = entries.get(value)
+            if objs is None:
+                objs = entries[value] = {}
+            objs[key] = obj
+
+    def remove(self, key):
+        """removes the object stored at key from the index"""
+        if key not in self.values:
+            return
+        value = self.values.pop(key)
+        objs = self.entries[value]
+        del objs[key]
+        if not objs:
+            del self.entries[value]
+
+    def lookup(self, value):
+        """returns the list of indexed objects whose attribute is value"""
+        return list(self.entries.get(value, {}).values())
+
+
+# string - greater than any key, bounds the entries of a value
+LAST_KEY = "\U0010ffff"
+
+
+class SortedIndex:
+    """keeps the keys of the objects sorted by an attribute, then by key"""
+
+    def __init__(self, field, types=None):
+        """Initializes an empty index on the attribute field, only indexing
+        the values of the given types if any"""
+        self.field = field
+        self.fields = (field,)
+        self.types = types
+        # list - sorted (value, key) of the indexed objects
+        self.entries = []
+        # dictionary - <key> -> value indexed for the object stored at key
+        self.values = {}
+        # integer - nested suspensions, the entries are left unsorted and
+        # rebuilt once by the last resume while there are any
+        self.suspended = 0
+
+    def suspend(self):
+        """stops keeping the entries sorted until resume is called, so that
+        adding many objects at once costs a single sort"""
+        self.suspended += 1
+
+    def resume(self):
+        """sorts the entries again once every suspend is resumed"""
+        self.suspended -= 1
+        if not self.suspended:
+            self.entries = sorted((value, key)
+                                  for key, value in self.values.items())
+
+    def add(self, key, obj):
+        """indexes the object stored at key in place of its former entry"""
+        self.remove(key)
+        value = getattr(obj, self.field, None)
+        if self.types is not None and (isinstance(value, bool) or
+                                       not isinstance(value, self.types)):
+            return
+        self.values[key] = value
+        if not self.suspended:
+            insort(self.entries, (value, key))
+
+    def extend(self, items):
+        """indexes the objects of the (key, obj) pairs of items at once,
+        sorting the entries once if the index is not suspended"""
+        self.suspend()
+        field, types, values = self.field, self.types, self.values
+        for key, obj in items:
+            value = getattr(obj, field, None)
+            if types is not None and (isinstance(value, bool) or
+                                      not isinstance(value, types)):
+                values.pop(key, None)
+            else:
+                values[key] = value
+        self.resume()
+
+    def remove(self, key):
+        """removes the object stored at key from the index"""
+        if key not in self.values:
+            return
+        entry = (self.values.pop(key), key)
+        if not self.suspended:
+            del self.entries[bisect_left(self.entries, entry)]
+
+    def keys_after(self, entry=None, limit=None):
+        """returns the keys of the at most limit objects following the
+        (value, key) entry, or from the first one if entry is None"""
+        start = 0 if entry is None else bisect_right(self.entries, entry)
+        stop = None if limit is None else start + limit
+        return [key for value, key in self.entries[start:stop]]
+
+    def keys_between(self, low=None, high=None, limit=None, reverse=False):
+        """returns the keys of the objects whose value lies between low and
+        high, None meaning unbounded, in order or in reverse order, at most
+        limit of them"""
+        start = 0 if low is None else bisect_left(self.entries, (low,))
+        stop = len(self.entries)
+        if high is not None:
+            stop = bisect_right(self.entries, (high, LAST_KEY))
+        if reverse:
+            entries = self.entries[max(start, stop - (limit or stop)):stop]
+            entries.reverse()
+        else:
+            entries = self.entries[start:stop if limit is None else
+                                   min(stop, start + limit)]
+        return [key for value, key in entries]
+
+
+class ListIndex(ReferenceIndex):
+    """maps each element of a list attribute to the objects holding it"""
+
+    def add(self, key, obj):
+        """indexes the object stored at key under each hashable element,
+        or under none if the attribute is not a list"""
+        self.remove(key)
+        values = getattr(obj, self.field, None)
+        if not isinstance(values, (list, tuple)):
+            values = ()
+        values = frozenset(value for value in values if hashable(value))
+        self.values[key] = values
+        for value in values:
+            self.entries.setdefault(value, {})[key] = obj
+
+    def extend(self, items):
+        """indexes the objects of the (key, obj) pairs of items"""
+        for key, obj in items:
+            self.add(key, obj)
+
+    def remove(self, key):
+        """removes the object stored at key from the index"""
+        if key not in self.values:
+            return
+        for value in self.values.pop(key):
+            objs = self.entries[value]
+            del objs[key]
+            if not objs:
+                del self.entries[value]
+
+
+class GridIndex:
+    """buckets the located objects by the cell of a grid of degrees their
+    coordinates fall in"""
+
+    def __init__(self, cell=0.5):
+        """Initializes an empty index on cells of cell degrees"""
+        self.fields = ("latitude", "longitude")
+        self.cell = cell
+        # dictionary - (<row>, <column>) -> {<key>: obj}
+        self.entries = {}
+        # dictionary - <key> -> cell of the object stored at key
+        self.values = {}
+
+    def __cell(self, lat, lng):
+        """returns the (row, column) of the cell holding a point"""
+        return int(floor(lat / self.cell)), int(floor(lng / self.cell))
+
+    def add(self, key, obj):
+        """indexes the object stored at key if it is located"""
+        self.remove(key)
+        point = geo.location(obj)
+        if point is None:
+            return
+        cell = self.__cell(*point)
+        self.values[key] = cell
+        self.entries.setdefault(cell, {})[key] = obj
+
+    def extend(self, items):
+        """indexes the objects of the (key, obj) pairs of items"""
+        for key, obj in items:
+            self.add(key, obj)
+
+    def remove(self, key):
+        """removes the object stored at key from the index"""
+        if key not in self.values:
+            return
+        cell = self.values.pop(key)
+        objs = self.entries[cell]
+        del objs[key]
+        if not objs:
+            del self.entries[cell]
+
+    def within(self, box):
+        """returns the indexed objects lying in the bounding box"""
+        south, west, north, east = box
+        bottom, top = self.__cell(south, 0)[0], self.__cell(north, 0)[0]
+        objs = []
+        for west, east in geo.spans(box):
+            left, right = self.__cell(0, west)[1], self.__cell(0, east)[1]
+            if (top - bottom + 1) * (right - left + 1) > len(self.entries):
+                cells = [cell for cell in self.entries
+                         if bottom <= cell[0] <= top and
+                         left <= cell[1] <= right]
+            else:
+                cells = [(row, column) for row in range(bottom, top + 1)
+                         for column in range(left, right + 1)
+                         if (row, column) in self.entries]
+            for cell in cells:
+                objs.extend(obj for obj in self.entries[cell].values()
+                            if geo.contains(box, *geo.location(obj)))
+        return objs
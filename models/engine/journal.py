@@ -0,0 +1,148 @@
+#!/usr/bin/python3
+"""
+Contains the Journal class
+"""
+
+import json
+import os
+
+
+class Journal:
+    """append-only log of the changes made on top of a storage snapshot"""
+
+    def __init__(self, path):
+        """Initializes a journal kept in the file at path"""
+        self.path = path
+        self.rotated_path = path + ".1"
+        # string - rotated log already folded into the snapshot, kept to
+        # rebuild the store from the snapshot backup
+        self.backup_path = path + ".bak"
+        # integer - number of records in the log since the last rotation
+        self.records = 0
+        # integer - bytes of the log already replayed or appended
+        self.offset = 0
+        # list - damaged records skipped since the list was last emptied,
+        # as "<path>: damaged record at byte <offset>"
+        self.damaged = []
+
+    def append(self, changes):
+        """appends one record per (key, dict) change, dict None for deletes"""
+        lines = []
+        for key, value in changes:
+            if value is None:
+                record = ["d", key]
+            else:
+                record = ["p", key, value]
+            lines.append(json.dumps(record, separators=(",", ":")) + "\n")
+        if lines:
+            with open(self.path, 'a') as f:
+                f.write("".join(lines))
+                self.offset = f.tell()
+            self.records += len(lines)
+
+    def replay(self, repair=True, backup=False):
+        """yields the (key, dict) changes of the rotated log then the log,
+        preceded by those of the backup log if backup is set, truncating
+        away a torn trailing record if repair is set"""
+        if backup:
+            for key, value in self.__read(self.backup_path, 0, False):
+                yield key, value
+        for key, value in self.__read(self.rotated_path, 0, repair):
+            yield key, value
+        self.records = self.offset = 0
+        for key, value in self.__read(self.path, 0, repair):
+            self.records += 1
+            yield key, value
+
+    def follow(self, rotated=False):
+        """yields the (key, dict) changes appended to the log since it was
+        last replayed, followed or appended to, reading first the rest of
+        the rotated log if it was rotated since"""
+        if rotated:
+            for key, value in self.__read(self.rotated_path, self.offset,
+                                          False):
+                yield key, value
+            self.records = self.offset = 0
+        for key, value in self.__read(self.path, self.offset, False):
+            self.records += 1
+            yield key, value
+
+    @staticmethod
+    def __parse(line):
+        """returns the (key, dict) change of a line of the log, raises
+        ValueError if it is not one"""
+        if not line.endswith(b"\n"):
+            raise ValueError("torn record")
+        record = json.loads(line.decode("utf-8"))
+        if not isinstance(record, list) or len(record) < 2 or \
+                not isinstance(record[1], str):
+            raise ValueError("not a change")
+        if record[0] == "d":
+            return record[1], None
+        if record[0] == "p" and len(record) == 3 and \
+                isinstance(record[2], dict):
+            return record[1], record[2]
+        raise ValueError("not a change")
+
+    def __read(self, path, start, repair):
+        """yields the changes in path from the byte offset start, skipping
+        the damaged records followed by intact ones, and dropping the
+        damaged trailing ones, which are truncated away if repair is set"""
+        try:
+            f = open(path, 'rb')
+        except FileNotFoundError:
+            return
+        with f:
+            f.seek(start)
+            end = position = start
+            damaged = []
+            for line in f:
+                try:
+                    change = self.__parse(line)
+                except ValueError:
+                    damaged.append(position)
+                    position += len(line)
+                    continue
+                for offset in damaged:
+                    self.damaged.append("{}: damaged record at byte "
+                                        "{:d}".format(path, offset))
+                damaged = []
+                position += len(line)
+                end = position
+                if path == self.path:
+                    self.offset = end
+                yield change
+            torn = f.seek(0, os.SEEK_END) > end
+        if torn and repair:
+            with open(path, 'r+b') as f:
+                f.truncate(end)
+
+    def rotate(self):
+        """moves the log aside so that new changes start a fresh one"""
+        if not os.path.exists(self.path):
+            return
+        if os.path.exists(self.rotated_path):
+            with open(self.path, 'rb') as src:
+                with open(self.rotated_path, 'ab') as dst:
+                    dst.write(src.read())
+            os.remove(self.path)
+        else:
+            os.replace(self.path, self.rotated_path)
+        self.records = self.offset = 0
+
+    def discard_rotated(self):
+        """keeps the rotated log as the backup log once a snapshot includes
+        its changes, the snapshot it replaced being the backup snapshot"""
+        try:
+            os.replace(self.rotated_path, self.backup_path)
+        except FileNotFoundError:
+            pass
+
+    def clear(self):
+        """removes the log, the rotated log and the backup log"""
+        for path in (self.rotated_path, self.backup_path, self.path):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        self.records = self.offset = 0
@@ -0,0 +1,52 @@
+#!/usr/bin/python3
+"""
+Contains the cursors of the keyset pagination of the storage engines
+
+Pages are ordered by (created_at, id) and a cursor is an opaque string
+naming the last object of the previous page.
+"""
+
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+import heapq
+from models.base_model import time
+
+
+def sort_key(obj):
+    """returns the (created_at, id) position of obj in the pages"""
+    return obj.created_at, obj.id
+
+
+def encode(obj):
+    """returns the cursor of the page following obj"""
+    position = "{}|{}".format(obj.created_at.strftime(time), obj.id)
+    return urlsafe_b64encode(position.encode("utf-8")).decode("ascii")
+
+
+def decode(cursor):
+    """returns the (created_at, id) named by cursor, raises ValueError if
+    cursor was not made by encode"""
+    try:
+        position = urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        created_at, id = position.split("|", 1)
+        return datetime.strptime(created_at, time), id
+    except (AttributeError, TypeError, ValueError):
+        raise ValueError("invalid cursor")
+
+
+def page(objs, limit, cursor=None):
+    """returns the page of at most limit objects of the iterable objs
+    following cursor, and the cursor of the next page or None"""
+    if cursor is not None:
+        position = decode(cursor)
+        objs = (obj for obj in objs if sort_key(obj) > position)
+    objs = heapq.nsmallest(limit + 1, objs, key=sort_key)
+    return finish(objs, limit)
+
+
+def finish(objs, limit):
+    """returns the first limit of the limit + 1 objects read for a page,
+    and the cursor of the next page if there is one"""
+    if len(objs) > limit:
+        return objs[:limit], encode(objs[limit - 1])
+    return objs, None
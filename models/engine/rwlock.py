@@ -0,0 +1,102 @@
+#!/usr/bin/python3
+"""
+Contains the RWLock class
+"""
+
+from contextlib import contextmanager
+import threading
+
+
+class RWLock:
+    """reader-writer lock letting any number of readers in at once and a
+    single writer alone, new readers waiting behind a waiting writer so
+    that writers are not starved"""
+
+    def __init__(self):
+        """Initializes an unlocked lock"""
+        self.__cond = threading.Condition(threading.Lock())
+        # integer - threads holding the lock for reading
+        self.__readers = 0
+        # integer - threads waiting to hold the lock for writing
+        self.__waiting = 0
+        # integer - identifier of the thread holding the lock for writing
+        self.__writer = None
+        # integer - times the writer acquired the lock without releasing it
+        self.__depth = 0
+        # local - reads held by each thread, reentrant reads never wait
+        self.__local = threading.local()
+
+    def acquire_read(self):
+        """waits until no writer holds or waits for the lock, then holds it
+        for reading, at once if the thread already holds it"""
+        me = threading.get_ident()
+        with self.__cond:
+            if self.__writer == me:
+                self.__depth += 1
+                return
+            reads = getattr(self.__local, "reads", 0)
+            if not reads:
+                while self.__writer is not None or self.__waiting:
+                    self.__cond.wait()
+                self.__readers += 1
+            self.__local.reads = reads + 1
+
+    def release_read(self):
+        """releases a read hold of the lock"""
+        with self.__cond:
+            if self.__writer == threading.get_ident():
+                self.__depth -= 1
+                return
+            self.__local.reads -= 1
+            if not self.__local.reads:
+                self.__readers -= 1
+                if not self.__readers:
+                    self.__cond.notify_all()
+
+    def acquire_write(self):
+        """waits until no other thread holds the lock, then holds it alone,
+        a thread holding it for reading cannot upgrade its hold"""
+        me = threading.get_ident()
+        with self.__cond:
+            if self.__writer == me:
+                self.__depth += 1
+                return
+            if getattr(self.__local, "reads", 0):
+                raise RuntimeError("cannot write while holding a read lock")
+            self.__waiting += 1
+            try:
+                while self.__writer is not None or self.__readers:
+                    self.__cond.wait()
+            except BaseException:
+                self.__waiting -= 1
+                self.__cond.notify_all()
+                raise
+            self.__waiting -= 1
+            self.__writer = me
+            self.__depth = 1
+
+    def release_write(self):
+        """releases a write hold of the lock"""
+        with self.__cond:
+            self.__depth -= 1
+            if not self.__depth:
+                self.__writer = None
+                self.__cond.notify_all()
+
+    @contextmanager
+    def read(self):
+        """holds the lock for reading within a with block"""
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self):
+        """holds the lock for writing within a with block"""
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
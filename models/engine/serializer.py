@@ -0,0 +1,85 @@
+#!/usr/bin/python3
+"""
+Contains the JSON encoding of the models used by the API and FileStorage
+
+Objects are encoded to the bytes of the dictionary BaseModel.to_dict
+would return, built with a single copy of their attributes and the
+datetimes formatted by isoformat, with orjson when it is installed and
+the json module otherwise.
+
+usage: python3 -m models.engine.serializer [<objects>]
+benchmarks the encoding of <objects> places against to_dict and json
+"""
+
+from datetime import datetime
+import json
+import sys
+import time
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+BACKEND = "json" if orjson is None else "orjson"
+skipped = ("_sa_instance_state",)
+dates = ("created_at", "updated_at")
+compact = json.JSONEncoder(separators=(",", ":")).encode
+
+
+def members(obj, save_fs=False, exclude=()):
+    """returns the dictionary to_dict would return for obj, built with one
+    shallow copy of its attributes, without the names of exclude"""
+    new_dict = obj.__dict__.copy()
+    for name in skipped + tuple(exclude):
+        new_dict.pop(name, None)
+    if not save_fs:
+        new_dict.pop("password", None)
+    for name in dates:
+        value = new_dict.get(name)
+        if value.__class__ is datetime:
+            new_dict[name] = value.isoformat(timespec="microseconds")
+    new_dict["__class__"] = obj.__class__.__name__
+    return new_dict
+
+
+def dumps(value):
+    """returns the compact JSON bytes of value"""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return compact(value).encode("ascii")
+
+
+def encode(obj, save_fs=False, exclude=()):
+    """returns the JSON bytes of the dictionary representation of obj"""
+    return dumps(members(obj, save_fs, exclude))
+
+
+def encode_list(objs, exclude=()):
+    """returns the JSON bytes of the list of the dictionary representations
+    of the objects of objs"""
+    return dumps([members(obj, exclude=exclude) for obj in objs])
+
+
+def benchmark(count):
+    """returns the objects encoded per second by to_dict and json.dumps
+    and by encode, for count places"""
+    from models.place import Place
+    places = [Place(name="Place {:d}".format(i), city_id="c", user_id="u",
+                    description="A quiet place " * 8, number_rooms=i % 5,
+                    latitude=1.5, longitude=2.5, amenity_ids=["a", "b"])
+              for i in range(count)]
+    rates = {}
+    for label, func in (("to_dict + json", lambda obj:
+                         json.dumps(obj.to_dict()).encode("utf-8")),
+                        ("encode ({})".format(BACKEND), encode)):
+        start = time.perf_counter()
+        for place in places:
+            func(place)
+        rates[label] = count / (time.perf_counter() - start)
+    return rates
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    for label, rate in benchmark(count).items():
+        print("{}: {:.0f} objects/s".format(label, rate))
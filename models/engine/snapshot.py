@@ -0,0 +1,290 @@
+#!/usr/bin/python3
+"""
+Contains the binary snapshot format of FileStorage and a converter
+from and to the JSON format
+
+A binary snapshot is the MAGIC header followed by one marshal record
+(class tag, id, created_at, updated_at, attributes) per object, with the
+datetimes stored as microseconds since the epoch. Each record is
+preceded by its length as 4 bytes, little-endian, so that records are
+read from large chunks of the file. Snapshots written with the former
+OLD_MAGIC header, whose records have no length, are still read.
+
+FileStorage keeps next to each snapshot a <snapshot>.sum file holding
+its size, CRC-32, inode and modification time, and the snapshot it
+replaced as <snapshot>.bak. The checksum only applies while the inode and
+modification time match, a snapshot edited by another program being
+trusted if it parses.
+
+usage: python3 -m models.engine.snapshot <source> <destination>
+"""
+
+import codecs
+from datetime import datetime, timedelta
+import json
+import marshal
+from models.amenity import Amenity
+from models.base_model import BaseModel
+from models.city import City
+from models.engine import serializer
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+import os
+import re
+import shutil
+import struct
+import sys
+import zlib
+
+MAGIC = b"HBNB\x02"
+OLD_MAGIC = b"HBNB\x01"
+LENGTH = struct.Struct("<I")
+# integer - bytes read from a binary snapshot at once
+CHUNK_SIZE = 1 << 20
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+# tuple - class of each tag, new classes must only be appended
+tags = (BaseModel, Amenity, City, Place, Review, State, User)
+classes = {cls.__name__: cls for cls in tags}
+skipped = ("id", "created_at", "updated_at", "_sa_instance_state",
+           "password")
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+def digest(data):
+    """returns the (size, CRC-32) of the bytes data"""
+    return len(data), zlib.crc32(data)
+
+
+def stamp(path):
+    """returns the [inode, modification time] of the file at path"""
+    st = os.stat(path)
+    return [st.st_ino, st.st_mtime_ns]
+
+
+def seal(path, value):
+    """records the (size, CRC-32) value of the snapshot about to be moved
+    from <path>.tmp to path"""
+    with open(path + ".sum.tmp", 'w') as f:
+        json.dump({"size": value[0], "crc32": value[1],
+                   "stamp": stamp(path + ".tmp")}, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(path + ".sum.tmp", path + ".sum")
+
+
+def verify(path):
+    """returns why the snapshot at path does not match the size and CRC-32
+    recorded for it, None if it does or if none applies to it"""
+    try:
+        with open(path + ".sum") as f:
+            recorded = json.load(f)
+        expected = recorded["size"], recorded["crc32"]
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError):
+        return "unreadable checksum"
+    if recorded.get("stamp") != stamp(path):
+        return None
+    size = crc = 0
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            size += len(chunk)
+            crc = zlib.crc32(chunk, crc)
+    if size != expected[0]:
+        return "{:d} bytes instead of {:d}".format(size, expected[0])
+    if crc != expected[1]:
+        return "checksum mismatch"
+    return None
+
+
+def backup(path):
+    """keeps the snapshot at path and its checksum as <path>.bak, linking
+    them if the file system allows it"""
+    for source, target in ((path, path + ".bak"),
+                           (path + ".sum", path + ".bak.sum")):
+        if not os.path.exists(source):
+            if os.path.exists(target):
+                os.remove(target)
+            continue
+        try:
+            os.link(source, target + ".tmp")
+        except FileExistsError:
+            os.remove(target + ".tmp")
+            os.link(source, target + ".tmp")
+        except OSError:
+            shutil.copyfile(source, target + ".tmp")
+        os.replace(target + ".tmp", target)
+
+
+def is_binary(path):
+    """tells whether the snapshot at path uses the binary format"""
+    return path.endswith(".bin")
+
+
+def dump(objs, f):
+    """writes the (key, obj) pairs of objs to the binary file f"""
+    f.write(MAGIC)
+    tag_of = {cls: tag for tag, cls in enumerate(tags)}
+    for key, obj in objs:
+        attrs = {name: value for name, value in obj.__dict__.items()
+                 if name not in skipped}
+        record = marshal.dumps((tag_of[obj.__class__], obj.id,
+                                (obj.created_at - EPOCH) // MICROSECOND,
+                                (obj.updated_at - EPOCH) // MICROSECOND,
+                                attrs))
+        f.write(LENGTH.pack(len(record)))
+        f.write(record)
+
+
+def records(f, chunk_size=CHUNK_SIZE):
+    """yields the records of the binary file f past its header"""
+    data = b""
+    pos = 0
+    while True:
+        if len(data) - pos >= LENGTH.size:
+            end = pos + LENGTH.size + LENGTH.unpack_from(data, pos)[0]
+            if end <= len(data):
+                yield marshal.loads(data[pos + LENGTH.size:end])
+                pos = end
+                continue
+        chunk = f.read(chunk_size)
+        if not chunk:
+            if pos < len(data):
+                raise ValueError("truncated record at the end")
+            return
+        data = data[pos:] + chunk
+        pos = 0
+
+
+def old_records(f):
+    """yields the records of the binary file f of the former format"""
+    while True:
+        try:
+            yield marshal.load(f)
+        except EOFError:
+            return
+
+
+def load(f):
+    """yields the objects stored in the binary file f"""
+    magic = f.read(len(MAGIC))
+    if magic == MAGIC:
+        stored = records(f)
+    elif magic == OLD_MAGIC:
+        stored = old_records(f)
+    else:
+        raise ValueError("not a binary snapshot")
+    for tag, id, created_at, updated_at, attrs in stored:
+        cls = tags[tag]
+        obj = cls.__new__(cls)
+        attrs["id"] = id
+        attrs["created_at"] = EPOCH + created_at * MICROSECOND
+        attrs["updated_at"] = EPOCH + updated_at * MICROSECOND
+        obj.__dict__.update(attrs)
+        yield obj
+
+
+def iterload_json(f, chunk_size=1 << 16):
+    """yields the (key, value) members of the JSON object in the binary
+    file f one at a time, reading it chunk by chunk"""
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    buf = ""
+    pos = 0
+
+    def fill():
+        """appends the next chunk to buf, returns False at end of file"""
+        nonlocal buf, pos
+        chunk = f.read(chunk_size)
+        buf = buf[pos:] + utf8.decode(chunk, not chunk)
+        pos = 0
+        return bool(chunk)
+
+    def skip():
+        """moves pos to the next significant character and returns it"""
+        nonlocal pos
+        while True:
+            pos = WHITESPACE.match(buf, pos).end()
+            if pos < len(buf) or not fill():
+                return buf[pos:pos + 1]
+
+    def decode():
+        """decodes the JSON value starting at pos"""
+        nonlocal pos
+        while True:
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+            except ValueError:
+                if fill():
+                    continue
+                raise
+            if end == len(buf) and fill():
+                continue
+            pos = end
+            return value
+
+    if skip() != "{":
+        raise ValueError("not a JSON object")
+    pos += 1
+    if skip() == "}":
+        return
+    while True:
+        key = decode()
+        if skip() != ":":
+            raise ValueError("expected ':' at character {:d}".format(pos))
+        pos += 1
+        skip()
+        yield key, decode()
+        char = skip()
+        if char == "}":
+            return
+        if char != ",":
+            raise ValueError("expected ',' at character {:d}".format(pos))
+        pos += 1
+        skip()
+
+
+def iterread(path):
+    """yields each object stored in the JSON or binary snapshot at path
+    with the number of bytes of the file read so far"""
+    with open(path, 'rb') as f:
+        if is_binary(path):
+            for obj in load(f):
+                yield obj, f.tell()
+        else:
+            for key, value in iterload_json(f):
+                yield classes[value["__class__"]](**value), f.tell()
+
+
+def read(path):
+    """returns the objects stored in the JSON or binary snapshot at path"""
+    return [obj for obj, position in iterread(path)]
+
+
+def write(objs, path):
+    """writes objs to a JSON or binary snapshot at path"""
+    items = [(obj.__class__.__name__ + "." + obj.id, obj) for obj in objs]
+    if is_binary(path):
+        with open(path, 'wb') as f:
+            dump(items, f)
+    else:
+        with open(path, 'wb') as f:
+            f.write(serializer.dumps({key: serializer.members(obj)
+                                      for key, obj in items}))
+
+
+def convert(source, destination):
+    """converts the snapshot at source to the format of destination"""
+    objs = read(source)
+    write(objs, destination)
+    return len(objs)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("usage: {} <source> <destination>".format(sys.argv[0]))
+        sys.exit(1)
+    print("{:d} objects converted".format(convert(sys.argv[1], sys.argv[2])))
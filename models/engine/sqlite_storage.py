@@ -0,0 +1,33 @@
+#!/usr/bin/python3
+"""
+Contains the class SQLiteStorage
+"""
+
+from models.engine.db_storage import DBStorage
+from os import getenv
+from sqlalchemy import create_engine, event
+
+
+def set_pragmas(dbapi_connection, connection_record):
+    """configures each new SQLite connection"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+class SQLiteStorage(DBStorage):
+    """interacts with a local SQLite database in WAL mode"""
+    # boolean - whether every write gives a new version, SQLite keeps the
+    # microseconds of updated_at
+    strong_versions = True
+
+    def __init__(self, path=None):
+        """Instantiate a SQLiteStorage object on the database file at path,
+        HBNB_SQLITE_PATH or hbnb.db"""
+        path = path or getenv('HBNB_SQLITE_PATH') or 'hbnb.db'
+        engine = create_engine('sqlite:///{}'.format(path),
+                               connect_args={"check_same_thread": False})
+        event.listen(engine, "connect", set_pragmas)
+        super().__init__(engine)
@@ -0,0 +1,114 @@
+#!/usr/bin/python3
+"""
+Contains the immutable versions of the objects of FileStorage
+
+A Version maps each class name to BUCKETS dictionaries of its objects
+by key. A change copies the buckets it touches into the next version and
+shares all the others, so publishing a version after a write costs a
+fraction of the objects of one class. A version is never changed once
+made and is reclaimed when the last reader holding it drops it.
+"""
+
+from collections.abc import Mapping
+import itertools
+
+# integer - buckets the objects of each class are spread over
+BUCKETS = 64
+EMPTY = ({},) * BUCKETS
+
+
+def bucket(key):
+    """returns the index of the bucket holding key"""
+    return hash(key) % BUCKETS
+
+
+class Version:
+    """immutable set of the stored objects of each class"""
+
+    def __init__(self, number=0, classes=None, counts=None):
+        """Initializes the version number holding the buckets of classes"""
+        self.number = number
+        # dictionary - <class name> -> tuple of BUCKETS {<key>: obj}
+        self.classes = classes or {}
+        # dictionary - <class name> -> number of objects
+        self.counts = counts or {}
+
+    def get(self, name, key):
+        """returns the object of class name stored at key, or None"""
+        return self.classes.get(name, EMPTY)[bucket(key)].get(key)
+
+    def items(self, name):
+        """returns an iterator over the (key, obj) of the class name"""
+        return itertools.chain.from_iterable(
+            objs.items() for objs in self.classes.get(name, EMPTY))
+
+    def values(self, name):
+        """returns an iterator over the objects of the class name"""
+        return itertools.chain.from_iterable(
+            objs.values() for objs in self.classes.get(name, EMPTY))
+
+    def objects(self, name):
+        """returns a new dictionary of the objects of the class name"""
+        objs = {}
+        for part in self.classes.get(name, EMPTY):
+            objs.update(part)
+        return objs
+
+    def count(self, name):
+        """returns the number of objects of the class name"""
+        return self.counts.get(name, 0)
+
+    def change(self, changes):
+        """returns the next version, where the objects of the <key>: obj
+        changes are stored and those of the <key>: None ones removed"""
+        classes = dict(self.classes)
+        counts = dict(self.counts)
+        copied = {}
+        for key, obj in changes.items():
+            name = key.split(".", 1)[0]
+            index = bucket(key)
+            objs = copied.get((name, index))
+            if objs is None:
+                objs = dict(classes.get(name, EMPTY)[index])
+                copied[(name, index)] = objs
+            if obj is None:
+                if objs.pop(key, None) is not None:
+                    counts[name] -= 1
+            else:
+                if key not in objs:
+                    counts[name] = counts.get(name, 0) + 1
+                objs[key] = obj
+        buckets = {}
+        for (name, index), objs in copied.items():
+            if name not in buckets:
+                buckets[name] = list(classes.get(name, EMPTY))
+            buckets[name][index] = objs
+        for name, objs in buckets.items():
+            classes[name] = tuple(objs)
+        return Version(self.number + 1, classes, counts)
+
+
+class View(Mapping):
+    """read-only mapping of the objects of a class in the version returned
+    by a function, live if the function returns the latest version"""
+
+    def __init__(self, name, source):
+        """Initializes a view of the objects of the class name"""
+        self.name = name
+        self.source = source
+
+    def __getitem__(self, key):
+        """returns the object stored at key"""
+        obj = self.source().get(self.name, key)
+        if obj is None:
+            raise KeyError(key)
+        return obj
+
+    def __iter__(self):
+        """returns an iterator over the keys"""
+        return itertools.chain.from_iterable(
+            self.source().classes.get(self.name, EMPTY))
+
+    def __len__(self):
+        """returns the number of objects"""
+        return self.source().count(self.name)
@@ -0,0 +1,19 @@
+#!/usr/bin/python3
+"""
+Points the file storage of the tests at a temporary directory, removed when
+they end, unless HBNB_FILE_PATH already names its file
+"""
+
+import atexit
+import os
+import shutil
+import tempfile
+
+if not os.environ.get("HBNB_FILE_PATH"):
+    tmp = tempfile.mkdtemp()
+    name = "file.bin" if os.environ.get("HBNB_FILE_FORMAT") == "binary" \
+        else "file.json"
+    os.environ["HBNB_FILE_PATH"] = os.path.join(tmp, name)
+    # registered before the storage is imported, so run after it wrote
+    # what it keeps until exit
+    atexit.register(shutil.rmtree, tmp, True)
@@ -0,0 +1,123 @@
+#!/usr/bin/python3
+"""
+Contains the TestETagsDocs and TestETags classes
+"""
+
+import inspect
+from api.v1.app import app
+from api.v1.views import etags
+from models import storage
+from models.state import State
+import pep8
+import unittest
+
+
+class TestETagsDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the etags views"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.funcs = inspect.getmembers(etags, inspect.isfunction)
+
+    def test_pep8_conformance_etags(self):
+        """Test that api/v1/views/etags.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/etags.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_etags(self):
+        """Test tests/test_api/test_v1/test_views/test_etags.py conforms"""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_v1/test_views/\
+test_etags.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_etags_module_docstring(self):
+        """Test for the etags.py module docstring"""
+        self.assertIsNot(etags.__doc__, None,
+                         "etags.py needs a docstring")
+        self.assertTrue(len(etags.__doc__) >= 1,
+                        "etags.py needs a docstring")
+
+    def test_etags_func_docstrings(self):
+        """Test for the presence of docstrings in etags functions"""
+        for func in self.funcs:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} function needs a docstring".format(
+                                 func[0]))
+
+
+class TestETags(unittest.TestCase):
+    """Test the conditional GET of the API endpoints"""
+    def setUp(self):
+        """Stores the state the tests ask for"""
+        self.client = app.test_client()
+        self.state = State(name="Tagged")
+        storage.new(self.state)
+        storage.save()
+        self.url = "/api/v1/states/{}".format(self.state.id)
+
+    def tearDown(self):
+        """Removes the state if a test did not"""
+        state = storage.get(State, self.state.id)
+        if state is not None:
+            storage.delete(state)
+            storage.save()
+
+    def test_not_modified(self):
+        """Test that the current ETag is answered 304 without a body"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        tag = response.headers["ETag"]
+        response = self.client.get(self.url, headers={"If-None-Match": tag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b"")
+        self.assertEqual(response.headers["ETag"], tag)
+
+    def test_weak_match(self):
+        """Test that If-None-Match is compared weakly"""
+        tag = self.client.get(self.url).headers["ETag"]
+        weak = tag if tag.startswith("W/") else "W/" + tag
+        response = self.client.get(self.url, headers={"If-None-Match": weak})
+        self.assertEqual(response.status_code, 304)
+
+    def test_modified(self):
+        """Test that an update gives the object and its class new ETags"""
+        tag = self.client.get(self.url).headers["ETag"]
+        states = self.client.get("/api/v1/states").headers["ETag"]
+        response = self.client.put(self.url, json={"name": "Retagged"})
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(self.url, headers={"If-None-Match": tag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["name"], "Retagged")
+        self.assertNotEqual(response.headers["ETag"], tag)
+        response = self.client.get("/api/v1/states",
+                                   headers={"If-None-Match": states})
+        self.assertEqual(response.status_code, 200)
+
+    def test_query_string(self):
+        """Test that each query string of a list has its own ETag"""
+        whole = self.client.get("/api/v1/states").headers["ETag"]
+        page = self.client.get("/api/v1/states?limit=1")
+        self.assertNotEqual(page.headers["ETag"], whole)
+        response = self.client.get("/api/v1/states?limit=1",
+                                   headers={"If-None-Match": whole})
+        self.assertEqual(response.status_code, 200)
+
+    def test_deleted_parent(self):
+        """Test that the list under a deleted object is not answered 304"""
+        url = self.url + "/cities"
+        tag = self.client.get(url).headers["ETag"]
+        response = self.client.get(url, headers={"If-None-Match": tag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(self.client.delete(self.url).status_code, 200)
+        response = self.client.get(url, headers={"If-None-Match": tag})
+        self.assertEqual(response.status_code, 404)
+
+    def test_missing(self):
+        """Test that a missing object is answered 404 without an ETag"""
+        response = self.client.get("/api/v1/states/missing")
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn("ETag", response.headers)
@@ -0,0 +1,120 @@
+#!/usr/bin/python3
+"""
+Contains the TestPaginationDocs and TestPagination classes
+"""
+
+import inspect
+from api.v1.app import app
+from api.v1.views import pagination
+from models import storage
+from models.state import State
+import pep8
+import unittest
+
+
+class TestPaginationDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the pagination views"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.funcs = inspect.getmembers(pagination, inspect.isfunction)
+
+    def test_pep8_conformance_pagination(self):
+        """Test that api/v1/views/pagination.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/pagination.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_pagination(self):
+        """Test tests/test_api/test_v1/test_views/test_pagination.py"""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_v1/test_views/\
+test_pagination.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pagination_module_docstring(self):
+        """Test for the pagination.py module docstring"""
+        self.assertIsNot(pagination.__doc__, None,
+                         "pagination.py needs a docstring")
+        self.assertTrue(len(pagination.__doc__) >= 1,
+                        "pagination.py needs a docstring")
+
+    def test_pagination_func_docstrings(self):
+        """Test for the presence of docstrings in pagination functions"""
+        for func in self.funcs:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} function needs a docstring".format(
+                                 func[0]))
+
+
+class TestPagination(unittest.TestCase):
+    """Test the limit and cursor query parameters of the list endpoints"""
+    @classmethod
+    def setUpClass(cls):
+        """Stores the states walked by the tests"""
+        cls.client = app.test_client()
+        cls.states = [State(name="Paged {:d}".format(i)) for i in range(5)]
+        for state in cls.states:
+            storage.new(state)
+        storage.save()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Removes the states walked by the tests"""
+        for state in cls.states:
+            storage.delete(state)
+        storage.save()
+
+    def walk(self, url):
+        """Returns the pages of url, following X-Next-Cursor"""
+        pages = []
+        cursor = None
+        while True:
+            query = url if cursor is None else \
+                "{}&cursor={}".format(url, cursor)
+            response = self.client.get(query)
+            self.assertEqual(response.status_code, 200)
+            pages.append(response.get_json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if cursor is None:
+                return pages
+
+    def test_pages(self):
+        """Test that pages hold limit objects each, without repeats, in
+        (created_at, id) order"""
+        pages = self.walk("/api/v1/states?limit=2")
+        for page in pages[:-1]:
+            self.assertEqual(len(page), 2)
+        self.assertTrue(1 <= len(pages[-1]) <= 2)
+        ids = [state["id"] for page in pages for state in page]
+        self.assertEqual(len(ids), len(set(ids)))
+        ours = sorted(self.states, key=lambda s: (s.created_at, s.id))
+        self.assertEqual([id for id in ids if id in
+                          {state.id for state in self.states}],
+                         [state.id for state in ours])
+
+    def test_no_limit(self):
+        """Test that a list without limit is whole and has no cursor"""
+        response = self.client.get("/api/v1/states")
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("X-Next-Cursor", response.headers)
+        ids = {state["id"] for state in response.get_json()}
+        self.assertTrue({state.id for state in self.states} <= ids)
+
+    def test_invalid_limit(self):
+        """Test that a limit other than a positive integer is refused"""
+        for limit in ("0", "-1", "two", ""):
+            with self.subTest(limit=limit):
+                response = self.client.get(
+                    "/api/v1/states?limit={}".format(limit))
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.get_json(),
+                                 {"error": "Invalid limit"})
+
+    def test_invalid_cursor(self):
+        """Test that a cursor not made by the API is refused"""
+        response = self.client.get("/api/v1/states?limit=2&cursor=nope")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json(), {"error": "Invalid cursor"})
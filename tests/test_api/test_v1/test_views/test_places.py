@@ -0,0 +1,216 @@
+#!/usr/bin/python3
+"""
+Contains the TestPlacesDocs and TestPlacesSearch classes
+"""
+
+import inspect
+from api.v1.app import app
+from api.v1.views import places
+from models import storage
+from models.city import City
+from models.place import Place
+from models.state import State
+from models.user import User
+import pep8
+import unittest
+
+
+class TestPlacesDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the places views"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.funcs = inspect.getmembers(places, inspect.isfunction)
+
+    def test_pep8_conformance_places(self):
+        """Test that api/v1/views/places.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/places.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_places(self):
+        """Test tests/test_api/test_v1/test_views/test_places.py conforms"""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_v1/test_views/\
+test_places.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_places_module_docstring(self):
+        """Test for the places.py module docstring"""
+        self.assertIsNot(places.__doc__, None,
+                         "places.py needs a docstring")
+        self.assertTrue(len(places.__doc__) >= 1,
+                        "places.py needs a docstring")
+
+    def test_places_func_docstrings(self):
+        """Test for the presence of docstrings in places functions"""
+        for func in self.funcs:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} function needs a docstring".format(
+                                 func[0]))
+
+
+class TestPlacesSearch(unittest.TestCase):
+    """Test the criteria, ordering and responses of places_search"""
+    @classmethod
+    def setUpClass(cls):
+        """Stores a city holding the places searched by the tests"""
+        cls.client = app.test_client()
+        cls.state = State(name="Searched")
+        cls.city = City(name="Searched", state_id=cls.state.id)
+        cls.user = User(email="search@hbnb.io", password="pwd")
+        place = {"city_id": cls.city.id, "user_id": cls.user.id}
+        cls.beach = Place(name="Seaside", description="Quiet zxcvbnm beach",
+                          price_by_night=50, latitude=10.0, longitude=10.0,
+                          **place)
+        cls.harbour = Place(name="Harbour", price_by_night=120,
+                            latitude=10.05, longitude=10.0, **place)
+        cls.peak = Place(name="Mountain", description="zxcvbnm peak",
+                         price_by_night=80, latitude=40.0, longitude=40.0,
+                         **place)
+        cls.objs = [cls.state, cls.city, cls.user, cls.beach, cls.harbour,
+                    cls.peak]
+        for obj in cls.objs:
+            storage.new(obj)
+        storage.save()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Removes the objects stored for the tests, read again as the
+        requests may have loaded relationships of the old ones"""
+        for obj in reversed(cls.objs):
+            storage.delete(storage.get(type(obj), obj.id))
+            storage.save()
+
+    def search(self, body, query=""):
+        """Returns the response of places_search limited to the city"""
+        body = dict(body, cities=[self.city.id])
+        return self.client.post("/api/v1/places_search" + query, json=body)
+
+    def names(self, body, query=""):
+        """Returns the names of the places found, in order"""
+        response = self.search(body, query)
+        self.assertEqual(response.status_code, 200)
+        return [place["name"] for place in response.get_json()]
+
+    def refused(self, body, error):
+        """Asserts that places_search refuses body with error"""
+        response = self.search(body)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json(), {"error": error})
+
+    def test_not_json(self):
+        """Test that a body other than JSON is refused"""
+        response = self.client.post("/api/v1/places_search", data="near",
+                                    content_type="text/plain")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json(), {"error": "Not a JSON"})
+
+    def test_pages(self):
+        """Test that an unranked search is paged by X-Next-Cursor"""
+        response = self.search({}, "?limit=2")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.get_json()), 2)
+        cursor = response.headers["X-Next-Cursor"]
+        response = self.search({}, "?limit=2&cursor=" + cursor)
+        self.assertEqual(len(response.get_json()), 1)
+        self.assertNotIn("X-Next-Cursor", response.headers)
+
+    def test_invalid_location(self):
+        """Test that each malformed near or bbox is refused"""
+        near = {"lat": 10, "lng": 10, "radius_km": 5}
+        cases = [
+            ({"near": {"lat": "x", "lng": 10, "radius_km": 5}},
+             "Invalid near"),
+            ({"near": dict(near, lat=91)}, "Invalid near"),
+            ({"near": dict(near, radius_km=0)}, "Invalid near"),
+            ({"near": [10, 10, 5]}, "Invalid near"),
+            ({"bbox": {"south": 11, "west": 9, "north": 9, "east": 11}},
+             "Invalid bbox"),
+            ({"bbox": {"south": 9, "west": 9, "north": 11, "east": 200}},
+             "Invalid bbox"),
+            ({"sort": "distance"}, "Invalid sort"),
+        ]
+        for body, error in cases:
+            with self.subTest(body=body):
+                self.refused(body, error)
+
+    def test_near(self):
+        """Test that near finds the places within the radius, nearest
+        first when sorted by distance"""
+        near = {"lat": 10.06, "lng": 10.0, "radius_km": 20}
+        self.assertEqual(self.names({"near": near, "sort": "distance"}),
+                         ["Harbour", "Seaside"])
+
+    def test_bbox(self):
+        """Test that bbox finds the places inside the box"""
+        bbox = {"south": 9, "west": 9, "north": 11, "east": 11}
+        self.assertEqual(sorted(self.names({"bbox": bbox})),
+                         ["Harbour", "Seaside"])
+
+    def test_invalid_ranges(self):
+        """Test that each malformed range, sort or limit is refused"""
+        cases = [
+            ({"price_by_night": 50}, "Invalid price_by_night"),
+            ({"max_guest": {"min": "2"}}, "Invalid max_guest"),
+            ({"number_rooms": {"max": True}}, "Invalid number_rooms"),
+            ({"sort": "name"}, "Invalid sort"),
+            ({"sort": 1}, "Invalid sort"),
+            ({"limit": 0}, "Invalid limit"),
+            ({"limit": True}, "Invalid limit"),
+            ({"limit": "2"}, "Invalid limit"),
+        ]
+        for body, error in cases:
+            with self.subTest(body=body):
+                self.refused(body, error)
+
+    def test_range_sort(self):
+        """Test that ranges bound the places and sort orders them"""
+        self.assertEqual(self.names({"price_by_night": {"min": 60},
+                                     "sort": "-price_by_night"}),
+                         ["Harbour", "Mountain"])
+        self.assertEqual(self.names({"price_by_night": {"max": 100},
+                                     "sort": "price_by_night"}),
+                         ["Seaside", "Mountain"])
+
+    def test_limit(self):
+        """Test that limit keeps the first places in the order asked"""
+        self.assertEqual(self.names({"sort": "price_by_night", "limit": 2}),
+                         ["Seaside", "Mountain"])
+        near = {"lat": 10.06, "lng": 10.0, "radius_km": 20}
+        self.assertEqual(self.names({"near": near, "sort": "distance",
+                                     "limit": 1}), ["Harbour"])
+
+    def test_pages_ranked(self):
+        """Test that pages of a ranked search are refused"""
+        for body in ({"sort": "price_by_night"}, {"q": "zxcvbnm"}):
+            for query in ("?limit=1", "?cursor=x"):
+                with self.subTest(body=body, query=query):
+                    response = self.search(body, query)
+                    self.assertEqual(response.status_code, 400)
+                    self.assertEqual(response.get_json(),
+                                     {"error": "Cannot paginate sort or q"})
+
+    def test_invalid_q(self):
+        """Test that a q other than a string is refused"""
+        for q in (5, ["zxcvbnm"]):
+            with self.subTest(q=q):
+                self.refused({"q": q}, "Invalid q")
+
+    def test_q(self):
+        """Test that q finds the places matching its words, best first"""
+        self.assertEqual(self.names({"q": "zxcvbnm peak"}),
+                         ["Mountain", "Seaside"])
+
+    def test_stream(self):
+        """Test that stream=1 sends the same places as a whole list"""
+        body = {"sort": "price_by_night"}
+        response = self.search(body, "?stream=1")
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("Content-Length", response.headers)
+        self.assertEqual(response.mimetype, "application/json")
+        self.assertEqual(response.get_json(), self.search(body).get_json())
+        for place in response.get_json():
+            self.assertNotIn("amenities", place)
@@ -0,0 +1,100 @@
+#!/usr/bin/python3
+"""
+Contains the TestStreamingDocs and TestStreaming classes
+"""
+
+import inspect
+from api.v1.app import app
+from api.v1.views import streaming
+from models import storage
+from models.amenity import Amenity
+import pep8
+import unittest
+from unittest import mock
+
+
+class TestStreamingDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the streaming views"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.funcs = inspect.getmembers(streaming, inspect.isfunction)
+
+    def test_pep8_conformance_streaming(self):
+        """Test that api/v1/views/streaming.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/streaming.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_streaming(self):
+        """Test tests/test_api/test_v1/test_views/test_streaming.py"""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_v1/test_views/\
+test_streaming.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_streaming_module_docstring(self):
+        """Test for the streaming.py module docstring"""
+        self.assertIsNot(streaming.__doc__, None,
+                         "streaming.py needs a docstring")
+        self.assertTrue(len(streaming.__doc__) >= 1,
+                        "streaming.py needs a docstring")
+
+    def test_streaming_func_docstrings(self):
+        """Test for the presence of docstrings in streaming functions"""
+        for func in self.funcs:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} function needs a docstring".format(
+                                 func[0]))
+
+
+class TestStreaming(unittest.TestCase):
+    """Test the stream query parameter of the list endpoints"""
+    @classmethod
+    def setUpClass(cls):
+        """Stores the amenities streamed by the tests"""
+        cls.client = app.test_client()
+        cls.amenities = [Amenity(name="Streamed {:d}".format(i))
+                         for i in range(20)]
+        for amenity in cls.amenities:
+            storage.new(amenity)
+        storage.save()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Removes the streamed amenities"""
+        for amenity in cls.amenities:
+            storage.delete(amenity)
+        storage.save()
+
+    def test_stream(self):
+        """Test that stream=1 sends the objects of the whole list"""
+        whole = self.client.get("/api/v1/amenities")
+        for flag in ("1", "true"):
+            with self.subTest(stream=flag):
+                response = self.client.get(
+                    "/api/v1/amenities?stream=" + flag)
+                self.assertEqual(response.status_code, 200)
+                self.assertNotIn("Content-Length", response.headers)
+                self.assertEqual(response.mimetype, "application/json")
+                self.assertEqual(
+                    sorted(a["id"] for a in response.get_json()),
+                    sorted(a["id"] for a in whole.get_json()))
+
+    def test_chunks(self):
+        """Test that a long array is sent over several chunks"""
+        with mock.patch.object(streaming, "CHUNK_SIZE", 64):
+            response = self.client.get("/api/v1/amenities?stream=1")
+            chunks = list(response.response)
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(b"".join(chunks)[:1], b"[")
+        self.assertEqual(b"".join(chunks)[-1:], b"]")
+
+    def test_not_streamed(self):
+        """Test that a list is sent whole unless a stream is asked"""
+        for query in ("", "?stream=0", "?stream=no"):
+            with self.subTest(query=query):
+                response = self.client.get("/api/v1/amenities" + query)
+                self.assertIn("Content-Length", response.headers)
@@ -138,6 +138,29 @@ class TestBaseModel(unittest.TestCase):
         self.assertEqual(new_d["created_at"], bm.created_at.strftime(t_format))
         self.assertEqual(new_d["updated_at"], bm.updated_at.strftime(t_format))
 
+    def test_from_dict_times(self):
+        """test that the times of a dictionary are read back exactly"""
+        bm = BaseModel()
+        copy = BaseModel(**bm.to_dict())
+        self.assertEqual(copy.created_at, bm.created_at)
+        self.assertEqual(copy.updated_at, bm.updated_at)
+        copy = BaseModel(created_at="2017-09-28T21:05:54.119")
+        self.assertEqual(copy.created_at,
+                         datetime(2017, 9, 28, 21, 5, 54, 119000))
+        with self.assertRaises(ValueError):
+            BaseModel(created_at="2017-09-28 21:05:54.119427")
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_init_not_touched(self):
+        """test that building an instance does not flag it as changed,
+        unlike setting its attributes afterwards"""
+        with mock.patch.object(models.storage, "touch") as touch:
+            inst = BaseModel(**BaseModel(name="Built").to_dict())
+            BaseModel()
+            touch.assert_not_called()
+            inst.name = "Changed"
+            touch.assert_called_once_with(inst, "name")
+
     def test_str(self):
         """test that the str method has the correct output"""
         inst = BaseModel()
@@ -0,0 +1,114 @@
+#!/usr/bin/python3
+"""
+Contains the TestCoordinatorDocs and TestCoordinator classes
+"""
+
+import inspect
+from models.engine import coordinator
+import os
+import pep8
+import shutil
+import tempfile
+import threading
+import unittest
+Coordinator = coordinator.Coordinator
+
+
+class TestCoordinatorDocs(unittest.TestCase):
+    """Tests to check the documentation and style of Coordinator class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.coordinator_f = inspect.getmembers(Coordinator,
+                                               inspect.isfunction)
+
+    def test_pep8_conformance_coordinator(self):
+        """Test that models/engine/coordinator.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/coordinator.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_coordinator(self):
+        """Test tests/test_models/test_engine/test_coordinator.py conforms"""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_coordinator.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_coordinator_module_docstring(self):
+        """Test for the coordinator.py module docstring"""
+        self.assertIsNot(coordinator.__doc__, None,
+                         "coordinator.py needs a docstring")
+        self.assertTrue(len(coordinator.__doc__) >= 1,
+                        "coordinator.py needs a docstring")
+
+    def test_coordinator_class_docstring(self):
+        """Test for the Coordinator class docstring"""
+        self.assertIsNot(Coordinator.__doc__, None,
+                         "Coordinator class needs a docstring")
+        self.assertTrue(len(Coordinator.__doc__) >= 1,
+                        "Coordinator class needs a docstring")
+
+    def test_coordinator_func_docstrings(self):
+        """Test for the presence of docstrings in Coordinator methods"""
+        for func in self.coordinator_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestCoordinator(unittest.TestCase):
+    """Test the Coordinator class"""
+    def setUp(self):
+        """Creates two coordinators of the same files"""
+        self.tmp = tempfile.mkdtemp()
+        path = os.path.join(self.tmp, "file.json")
+        self.first = Coordinator(path)
+        self.second = Coordinator(path)
+
+    def tearDown(self):
+        """Closes the coordinators and removes the temporary directory"""
+        self.first.close()
+        self.second.close()
+        shutil.rmtree(self.tmp)
+
+    def test_generation(self):
+        """Test that a bumped generation is seen through both headers"""
+        self.assertEqual(self.first.read(), (0, 0))
+        with self.first.locked():
+            self.assertEqual(self.first.bump(), 1)
+            self.assertEqual(self.first.bump(), 2)
+        self.assertEqual(self.second.generation(), 2)
+        with self.second.locked():
+            self.second.rebase()
+            self.second.bump()
+        self.assertEqual(self.first.read(), (3, 2))
+
+    @unittest.skipIf(coordinator.fcntl is None, "no advisory locks")
+    def test_locked(self):
+        """Test that a writer excludes the other holders of the lock"""
+        events = []
+
+        def write():
+            """Records when the second coordinator holds the lock"""
+            with self.second.locked():
+                events.append("second")
+        with self.first.locked(shared=True):
+            with self.second.locked(shared=True):
+                pass
+            thread = threading.Thread(target=write)
+            thread.start()
+            thread.join(0.1)
+            events.append("first")
+        thread.join(5)
+        self.assertEqual(events, ["first", "second"])
+
+    def test_reopen_after_fork(self):
+        """Test that a header opened by another process is reopened"""
+        self.first.read()
+        self.first.pid = -1
+        self.assertEqual(self.first.read(), (0, 0))
+        self.assertEqual(self.first.pid, os.getpid())
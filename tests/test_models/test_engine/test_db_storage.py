@@ -17,6 +17,7 @@ from models.user import User
 import json
 import os
 import pep8
+import sqlalchemy
 import unittest
 DBStorage = db_storage.DBStorage
 classes = {"Amenity": Amenity, "City": City, "Place": Place,
@@ -98,3 +99,183 @@ class TestDBStorage(unittest.TestCase):
     def test_count(self):
         """Test count method"""
         self.assertEqual(len(models.storage.all()), models.storage.count())
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_get_missing(self):
+        """Test that get returns None for unknown ids and classes"""
+        self.assertIsNone(models.storage.get(State, "missing"))
+        self.assertIsNone(models.storage.get(BaseModel, "missing"))
+        self.assertIsNone(models.storage.get(State, None))
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_count_cls(self):
+        """Test that count(cls) counts the rows of cls"""
+        count = models.storage.count(State)
+        state = State(name="Lilongwe")
+        state.save()
+        self.assertEqual(models.storage.count(State), count + 1)
+        self.assertEqual(models.storage.count("State"), count + 1)
+        self.assertEqual(models.storage.count(State),
+                         len(models.storage.all(State)))
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_counts(self):
+        """Test that counts returns the count of every class"""
+        counts = models.storage.counts()
+        self.assertEqual(set(counts), set(classes))
+        for name, cls in classes.items():
+            self.assertEqual(counts[name], len(models.storage.all(cls)))
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_page(self):
+        """Test that following the cursors walks every object once"""
+        for i in range(5):
+            State(name="Page{:d}".format(i)).save()
+        seen = []
+        objs, cursor = models.storage.page(State, 2)
+        seen += objs
+        while cursor is not None:
+            self.assertEqual(len(objs), 2)
+            objs, cursor = models.storage.page(State, 2, cursor)
+            seen += objs
+        self.assertEqual(seen, sorted(models.storage.all(State).values(),
+                                      key=lambda obj: (obj.created_at,
+                                                       obj.id)))
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_page_filters(self):
+        """Test that page only walks the rows matching the filters"""
+        state = State(name="Paged")
+        state.save()
+        cities = [City(name="City", state_id=state.id) for i in range(3)]
+        for city in cities:
+            city.save()
+        cities.sort(key=lambda obj: (obj.created_at, obj.id))
+        objs, cursor = models.storage.page(City, 2, state_id=state.id)
+        self.assertEqual(objs, cities[:2])
+        objs, cursor = models.storage.page(City, 2, cursor,
+                                           state_id=state.id)
+        self.assertEqual((objs, cursor), (cities[2:], None))
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_all_load(self):
+        """Test that load fetches the relationships in one query per level"""
+        for i in range(3):
+            state = State(name="Loaded")
+            state.save()
+            for j in range(2):
+                City(name="City", state_id=state.id).save()
+        models.storage.close()
+        statements = []
+        engine = models.storage._DBStorage__engine
+
+        def record(conn, cursor, statement, *args):
+            """records the statements sent to the database"""
+            statements.append(statement)
+        sqlalchemy.event.listen(engine, "before_cursor_execute", record)
+        try:
+            states = models.storage.all(State, load=["cities"]).values()
+            cities = [city for state in states for city in state.cities]
+        finally:
+            sqlalchemy.event.remove(engine, "before_cursor_execute", record)
+        self.assertEqual(len(cities), len(models.storage.all(City)))
+        self.assertEqual(len(statements), 2)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_near(self):
+        """Test that near and within find the places by location"""
+        state = State(name="Located")
+        state.save()
+        city = City(name="City", state_id=state.id)
+        city.save()
+        user = User(email="near@hbnb.io", password="pwd")
+        user.save()
+        far = Place(name="Far", city_id=city.id, user_id=user.id,
+                    latitude=-15.79, longitude=35.01)
+        near = Place(name="Near", city_id=city.id, user_id=user.id,
+                     latitude=-15.38, longitude=35.32)
+        far.save()
+        near.save()
+        found = models.storage.near(Place, -15.4, 35.3, 100)
+        self.assertEqual([place for distance, place in found], [near, far])
+        self.assertEqual(models.storage.near(Place, -15.4, 35.3, 10, 1)[0][1],
+                         near)
+        self.assertIn(near, models.storage.within(Place, (-16, 35, -15, 36)))
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_between(self):
+        """Test that between finds the places by numeric column"""
+        state = State(name="Priced")
+        state.save()
+        city = City(name="City", state_id=state.id)
+        city.save()
+        user = User(email="between@hbnb.io", password="pwd")
+        user.save()
+        cheap = Place(name="Cheap", city_id=city.id, user_id=user.id,
+                      price_by_night=-20)
+        dear = Place(name="Dear", city_id=city.id, user_id=user.id,
+                     price_by_night=-10)
+        cheap.save()
+        dear.save()
+        self.assertEqual(models.storage.between(Place, "price_by_night",
+                                                -30, -1), [cheap, dear])
+        self.assertEqual(models.storage.between(Place, "price_by_night",
+                                                high=-1, limit=1,
+                                                reverse=True), [dear])
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_search(self):
+        """Test that search finds the places by their text or reviews"""
+        state = State(name="Searched")
+        state.save()
+        city = City(name="City", state_id=state.id)
+        city.save()
+        user = User(email="search@hbnb.io", password="pwd")
+        user.save()
+        place = Place(name="Qwertyuiop cottage", city_id=city.id,
+                      user_id=user.id)
+        other = Place(name="Loft", description="Asdfghjkl",
+                      city_id=city.id, user_id=user.id)
+        place.save()
+        other.save()
+        Review(text="QWERTYUIOP", place_id=other.id, user_id=user.id).save()
+        found = models.storage.search("qwertyuiop asdfghjkl")
+        self.assertEqual([place for score, place in found], [other, place])
+        self.assertEqual(models.storage.search("zxcvbnm"), [])
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_version(self):
+        """Test that the versions follow the rows of a class"""
+        amenity = Amenity(name="Wifi")
+        self.assertIsNone(models.storage.version(Amenity, amenity.id))
+        amenity.save()
+        versions = [models.storage.version(Amenity),
+                    models.storage.version(Amenity, amenity.id)]
+        amenity.name = "Pool"
+        amenity.updated_at = datetime(2100, 1, 1)
+        models.storage.save()
+        self.assertNotEqual(models.storage.version(Amenity), versions[0])
+        self.assertNotEqual(models.storage.version(Amenity, amenity.id),
+                            versions[1])
+        versions = models.storage.version(Amenity)
+        models.storage.delete(amenity)
+        models.storage.save()
+        self.assertNotEqual(models.storage.version(Amenity), versions)
+        self.assertIsNone(models.storage.version(Amenity, amenity.id))
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_version_indexed(self):
+        """Test that the columns read by version are indexed"""
+        for cls in (Amenity, City, Place, Review, State, User):
+            with self.subTest(cls=cls.__name__):
+                self.assertTrue(cls.__table__.c.updated_at.index)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_stream(self):
+        """Test that stream yields the rows of a class in batches"""
+        for i in range(5):
+            Amenity(name="Streamed{:d}".format(i)).save()
+        streamed = list(models.storage.stream(Amenity, 2))
+        self.assertEqual({amenity.id for amenity in streamed},
+                         set(amenity.id for amenity in
+                             models.storage.all(Amenity).values()))
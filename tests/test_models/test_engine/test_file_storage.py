@@ -4,9 +4,11 @@ Contains the TestFileStorageDocs classes
 """
 
 from datetime import datetime
+import gc
 import inspect
 import models
-from models.engine import file_storage
+from models.engine import file_storage, serializer
+from models.engine.journal import Journal
 from models.amenity import Amenity
 from models.base_model import BaseModel
 from models.city import City
@@ -17,7 +19,16 @@ from models.user import User
 import json
 import os
 import pep8
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
 import unittest
+from unittest import mock
+import weakref
 FileStorage = file_storage.FileStorage
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
@@ -70,6 +81,18 @@ test_file_storage.py'])
 
 class TestFileStorage(unittest.TestCase):
     """Test the FileStorage class"""
+    def setUp(self):
+        """Points the storage at a file in a temporary directory"""
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "file.json")
+        self.saved = FileStorage._FileStorage__file_path
+        FileStorage._FileStorage__file_path = self.path
+
+    def tearDown(self):
+        """Restores the storage configuration"""
+        FileStorage._FileStorage__file_path = self.saved
+        shutil.rmtree(self.tmp)
+
     @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
     def test_all_returns_dict(self):
         """Test that all returns the FileStorage.__objects attr"""
@@ -110,7 +133,7 @@ class TestFileStorage(unittest.TestCase):
         for key, value in new_dict.items():
             new_dict[key] = value.to_dict()
         string = json.dumps(new_dict)
-        with open("file.json", "r") as f:
+        with open(self.path, "r") as f:
             js = f.read()
         self.assertEqual(json.loads(string), json.loads(js))
 
@@ -128,3 +151,1161 @@ class TestFileStorage(unittest.TestCase):
         storage = FileStorage()
         nobjs = len(storage._FileStorage__objects)
         self.assertEqual(nobjs, storage.count())
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_get_after_delete(self):
+        """Test that get no longer returns a deleted object"""
+        storage = FileStorage()
+        state = State(name="Zomba")
+        storage.new(state)
+        self.assertIs(storage.get(State, state.id), state)
+        self.assertIsNone(storage.get(City, state.id))
+        storage.delete(state)
+        self.assertIsNone(storage.get(State, state.id))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_get_invalid(self):
+        """Test that get returns None for unknown classes and ids"""
+        storage = FileStorage()
+        self.assertIsNone(storage.get(State, "missing"))
+        self.assertIsNone(storage.get(State, None))
+        self.assertIsNone(storage.get("State", "missing"))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_all_cls(self):
+        """Test that all(cls) returns a new dict of the objects of cls"""
+        storage = FileStorage()
+        state = State(name="Lilongwe")
+        storage.new(state)
+        key = "State." + state.id
+        for cls in (State, "State"):
+            with self.subTest(cls=cls):
+                objs = storage.all(cls)
+                self.assertIs(objs[key], state)
+                self.assertTrue(all(type(obj) is State
+                                    for obj in objs.values()))
+                objs.clear()
+                self.assertIn(key, storage.all(cls))
+        self.assertNotIn(key, storage.all(City))
+        storage.delete(state)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_view(self):
+        """Test that view returns a live read-only mapping"""
+        storage = FileStorage()
+        view = storage.view(City)
+        city = City(name="Mzuzu")
+        storage.new(city)
+        self.assertIs(view["City." + city.id], city)
+        with self.assertRaises(TypeError):
+            view["City." + city.id] = None
+        storage.delete(city)
+        self.assertNotIn("City." + city.id, view)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_count_cls(self):
+        """Test that count(cls) counts only the objects of cls"""
+        storage = FileStorage()
+        before = storage.count(Amenity)
+        amenity = Amenity(name="Wifi")
+        storage.new(amenity)
+        self.assertEqual(storage.count(Amenity), before + 1)
+        self.assertEqual(storage.count("Amenity"), before + 1)
+        self.assertEqual(storage.count(Amenity), len(storage.all(Amenity)))
+        storage.delete(amenity)
+        self.assertEqual(storage.count(Amenity), before)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_touch(self):
+        """Test that changing a saved object flags it as pending"""
+        storage = FileStorage()
+        state = State(name="Ntcheu")
+        state.save()
+        key = "State." + state.id
+        self.assertNotIn(key, storage._FileStorage__pending)
+        self.assertTrue(storage._FileStorage__clean[state])
+        state.name = "Balaka"
+        self.assertIs(storage._FileStorage__pending[key], state)
+        self.assertNotIn(state, storage._FileStorage__clean)
+        storage.save()
+        with open(self.path, "r") as f:
+            self.assertEqual(json.load(f)[key]["name"], "Balaka")
+        storage.delete(state)
+        storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_reuses_clean(self):
+        """Test that save only serializes objects changed since written"""
+        storage = FileStorage()
+        state = State(name="Mchinji")
+        state.save()
+        calls = []
+        encode = serializer.encode
+
+        def counting_encode(obj, *args, **kwargs):
+            """Counts the calls of encode"""
+            calls.append(obj)
+            return encode(obj, *args, **kwargs)
+        with mock.patch.object(serializer, "encode", counting_encode):
+            storage.save()
+            self.assertNotIn(state, calls)
+            state.save()
+            self.assertIn(state, calls)
+        with open(self.path, "r") as f:
+            self.assertEqual(json.load(f)["State." + state.id],
+                             state.to_dict())
+        storage.delete(state)
+        storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_reload_progress(self):
+        """Test that reload reports its progress"""
+        storage = FileStorage()
+        storage.save()
+        calls = []
+        storage.reload(lambda *args: calls.append(args))
+        size = os.path.getsize(self.path)
+        self.assertEqual(calls[-1], (storage.count(), size, size))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_close_unchanged(self):
+        """Test that close does not read the file if it did not change"""
+        storage = FileStorage()
+        storage.save()
+        with mock.patch.object(file_storage.snapshot, "iterread") as read:
+            storage.close()
+            read.assert_not_called()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_close_changed(self):
+        """Test that close reloads the file once it changed on disk"""
+        storage = FileStorage()
+        storage.save()
+        state = State(name="Likoma")
+        with open(self.path, "r") as f:
+            jo = json.load(f)
+        jo["State." + state.id] = state.to_dict()
+        with open(self.path, "w") as f:
+            json.dump(jo, f)
+        os.utime(self.path, ns=(0, 0))
+        storage.close()
+        self.assertEqual(storage.get(State, state.id).name, "Likoma")
+        self.assertFalse(storage.refresh())
+        storage.delete(storage.get(State, state.id))
+        storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_lookup(self):
+        """Test that lookup follows new, delete and attribute changes"""
+        storage = FileStorage()
+        state = State(name="Zomba")
+        other = State(name="Blantyre")
+        city = City(name="Zomba", state_id=state.id)
+        storage.new(city)
+        self.assertEqual(storage.lookup(City, "state_id", state.id), [city])
+        self.assertEqual(state.cities, [city])
+        city.state_id = other.id
+        self.assertEqual(state.cities, [])
+        self.assertEqual(other.cities, [city])
+        storage.delete(city)
+        self.assertEqual(other.cities, [])
+        self.assertEqual(storage.lookup(City, "name", "Zomba"), [])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_relationships(self):
+        """Test the City.places and Place.reviews getters"""
+        storage = FileStorage()
+        city = City(name="Mangochi")
+        place = Place(name="Beach", city_id=city.id)
+        review = Review(text="Nice", place_id=place.id)
+        storage.new(place)
+        storage.new(review)
+        self.assertEqual(city.places, [place])
+        self.assertEqual(place.reviews, [review])
+        storage.delete(place)
+        storage.delete(review)
+        self.assertEqual(city.places, [])
+        self.assertEqual(place.reviews, [])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_counts(self):
+        """Test that counts returns the count of every class"""
+        storage = FileStorage()
+        counts = storage.counts()
+        for name in classes:
+            self.assertEqual(counts[name], storage.count(name))
+        self.assertEqual(sum(counts.values()), storage.count())
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_page(self):
+        """Test that following the cursors walks every object once"""
+        storage = FileStorage()
+        for i in range(5):
+            storage.new(State(name="Page{:d}".format(i)))
+        seen = []
+        objs, cursor = storage.page(State, 2)
+        seen += objs
+        while cursor is not None:
+            self.assertEqual(len(objs), 2)
+            objs, cursor = storage.page(State, 2, cursor)
+            seen += objs
+        self.assertEqual(seen, sorted(storage.all(State).values(),
+                                      key=lambda obj: (obj.created_at,
+                                                       obj.id)))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_page_filters(self):
+        """Test that page only walks the objects matching the filters"""
+        storage = FileStorage()
+        state = State(name="Paged")
+        cities = [City(name="City", state_id=state.id) for i in range(3)]
+        for city in cities:
+            storage.new(city)
+        storage.new(City(name="City", state_id="other"))
+        cities.sort(key=lambda obj: (obj.created_at, obj.id))
+        objs, cursor = storage.page(City, 2, state_id=state.id)
+        self.assertEqual(objs, cities[:2])
+        objs, cursor = storage.page(City, 2, cursor, state_id=state.id)
+        self.assertEqual((objs, cursor), (cities[2:], None))
+        with self.assertRaises(ValueError):
+            storage.page(City, 2, "zz")
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_lookup_list(self):
+        """Test that lookup finds places by each of their amenity ids"""
+        storage = FileStorage()
+        amenity = Amenity(name="Wifi")
+        storage.new(amenity)
+        place = Place(name="Lodge")
+        storage.new(place)
+        self.assertEqual(storage.lookup(Place, "amenity_ids", amenity.id), [])
+        place.amenity_ids = place.amenity_ids + [amenity.id]
+        self.assertEqual(storage.lookup(Place, "amenity_ids", amenity.id),
+                         [place])
+        self.assertEqual(place.amenities, [amenity])
+        place.amenity_ids = []
+        self.assertEqual(storage.lookup(Place, "amenity_ids", amenity.id), [])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_lookup_list_invalid(self):
+        """Test that a list attribute of any value is stored, only its
+        hashable elements being found"""
+        storage = FileStorage()
+        place = Place(name="Odd", amenity_ids=5)
+        storage.new(place)
+        self.assertIs(storage.get(Place, place.id), place)
+        place.amenity_ids = [["odd"], "odd"]
+        self.assertEqual(storage.lookup(Place, "amenity_ids", "odd"),
+                         [place])
+        storage.delete(place)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_near(self):
+        """Test that near follows the coordinates of the places"""
+        storage = FileStorage()
+        far = Place(name="Far", latitude=-15.79, longitude=35.01)
+        near = Place(name="Near", latitude=-15.38, longitude=35.32)
+        storage.new(far)
+        storage.new(near)
+        found = storage.near(Place, -15.4, 35.3, 100)
+        self.assertEqual([place for distance, place in found], [near, far])
+        self.assertIn(near, storage.within(Place, (-16, 35, -15, 36)))
+        near.latitude = 0
+        found = storage.near(Place, -15.4, 35.3, 100)
+        self.assertEqual([place for distance, place in found], [far])
+        self.assertNotIn(near, storage.within(Place, (-16, 35, -15, 36)))
+        storage.delete(far)
+        storage.delete(near)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_between(self):
+        """Test that between follows the numeric attributes of places"""
+        storage = FileStorage()
+        cheap = Place(name="Cheap", price_by_night=-20)
+        dear = Place(name="Dear", price_by_night=-10)
+        storage.new(cheap)
+        storage.new(dear)
+        self.assertEqual(storage.between(Place, "price_by_night", -30, -1),
+                         [cheap, dear])
+        self.assertEqual(storage.between(Place, "price_by_night", high=-1,
+                                         limit=1, reverse=True), [dear])
+        cheap.price_by_night = -5
+        self.assertEqual(storage.between(Place, "price_by_night", -30, -1),
+                         [dear, cheap])
+        storage.delete(cheap)
+        storage.delete(dear)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_search(self):
+        """Test that search follows the texts of places and reviews"""
+        storage = FileStorage()
+        place = Place(name="Qwertyuiop cottage")
+        other = Place(name="Loft")
+        review = Review(text="qwertyuiop was a lovely stay",
+                        place_id=other.id)
+        for obj in (place, other, review):
+            storage.new(obj)
+        found = storage.search("Qwertyuiop")
+        self.assertEqual([place for score, place in found], [place, other])
+        self.assertEqual(storage.search("qwertyuiop", 1)[0][1], place)
+        place.name = "Cottage"
+        storage.delete(review)
+        self.assertEqual(storage.search("qwertyuiop"), [])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_texts_index(self):
+        """Test that save leaves the full-text index to be written at exit,
+        which only rewrites it if the texts changed"""
+        storage = FileStorage()
+        path = self.path + ".fts"
+        shutdown = storage._FileStorage__shutdown
+        place = Place(name="Indexed")
+        storage.new(place)
+        storage.search("indexed")
+        shutdown()
+        inode = os.stat(path).st_ino
+        storage.delete(place)
+        storage.save()
+        self.assertEqual(os.stat(path).st_ino, inode)
+        shutdown()
+        self.assertNotEqual(os.stat(path).st_ino, inode)
+        inode = os.stat(path).st_ino
+        amenity = Amenity(name="Unindexed")
+        storage.new(amenity)
+        storage.save()
+        shutdown()
+        self.assertEqual(os.stat(path).st_ino, inode)
+        storage.delete(amenity)
+        storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_version(self):
+        """Test that new, attribute changes and delete bump the versions"""
+        storage = FileStorage()
+        amenity = Amenity(name="Wifi")
+        self.assertIsNone(storage.version(Amenity, amenity.id))
+        storage.new(amenity)
+        versions = [storage.version(Amenity),
+                    storage.version(Amenity, amenity.id)]
+        self.assertEqual(storage.version("Amenity"), versions[0])
+        amenity.name = "Pool"
+        self.assertNotEqual(storage.version(Amenity), versions[0])
+        self.assertNotEqual(storage.version(Amenity, amenity.id),
+                            versions[1])
+        versions = [storage.version(Amenity), storage.version(State)]
+        storage.delete(amenity)
+        self.assertNotEqual(storage.version(Amenity), versions[0])
+        self.assertEqual(storage.version(State), versions[1])
+        self.assertIsNone(storage.version(Amenity, amenity.id))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_stream(self):
+        """Test that stream yields the objects of a class"""
+        storage = FileStorage()
+        amenity = Amenity(name="Streamed")
+        storage.new(amenity)
+        streamed = storage.stream(Amenity)
+        first = next(streamed)
+        self.assertEqual(first.__class__, Amenity)
+        self.assertEqual(list(storage.stream(Amenity)),
+                         list(storage.all(Amenity).values()))
+        later = [Amenity(name="Streamed later") for i in range(100)]
+        for obj in later:
+            storage.new(obj)
+        storage.delete(amenity)
+        streamed = [first] + list(streamed)
+        self.assertIn(amenity, streamed)
+        self.assertFalse(set(later) & set(streamed))
+        for obj in later:
+            storage.delete(obj)
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageVersions(unittest.TestCase):
+    """Test the versions of the objects pinned by the readers"""
+    def setUp(self):
+        """Creates a place in a pinned version"""
+        self.storage = FileStorage()
+        self.place = Place(city_id="pinned", name="Pinned lodge",
+                           number_rooms=2)
+        self.storage.new(self.place)
+        self.version = self.storage.pin()
+
+    def tearDown(self):
+        """Releases the pin and removes the objects created"""
+        self.storage.unpin()
+        for obj in list(self.storage.all(Place).values()):
+            if obj.city_id == "pinned":
+                self.storage.delete(obj)
+
+    def write_elsewhere(self):
+        """Replaces the place with another one from another thread"""
+        other = Place(city_id="pinned", name="Pinned cabin", number_rooms=2)
+
+        def write():
+            """Writes in another thread"""
+            self.storage.delete(self.place)
+            self.storage.new(other)
+        thread = threading.Thread(target=write)
+        thread.start()
+        thread.join()
+        return other
+
+    def test_pinned_reads(self):
+        """Test that a pinned thread does not see the writes of others"""
+        other = self.write_elsewhere()
+        storage = self.storage
+        key = "Place." + self.place.id
+        self.assertIs(storage.get(Place, self.place.id), self.place)
+        self.assertIsNone(storage.get(Place, other.id))
+        self.assertIn(key, storage.all(Place))
+        self.assertIn(key, storage.all())
+        self.assertIn(key, storage.view(Place))
+        self.assertIn(self.place, storage.stream(Place))
+        self.assertEqual(storage.count(Place),
+                         self.version.count("Place"))
+        self.assertEqual(storage.lookup(Place, "city_id", "pinned"),
+                         [self.place])
+        self.assertEqual(storage.between(Place, "number_rooms", 2, 2),
+                         [self.place])
+        self.assertEqual([place for score, place in
+                          storage.search("pinned")], [self.place])
+        self.assertEqual(storage.page(Place, 1, city_id="pinned"),
+                         ([self.place], None))
+        self.assertIn(self.place, storage.page(Place, 100000)[0])
+        storage.unpin()
+        self.assertIsNone(storage.get(Place, self.place.id))
+        self.assertEqual(storage.lookup(Place, "city_id", "pinned"),
+                         [other])
+        storage.pin()
+
+    def test_unchanged_class(self):
+        """Test that the indexes of a class unchanged since the pin are
+        used by the pinned thread"""
+        index = self.storage._FileStorage__index
+        state = State(name="Elsewhere")
+        thread = threading.Thread(target=self.storage.new, args=(state,))
+        thread.start()
+        thread.join()
+        for field in ("city_id", "number_rooms", "created_at", "location",
+                      "text"):
+            self.assertIsNotNone(index(Place, field, self.version))
+        self.assertIsNone(index(State, "created_at", self.version))
+        review = Review(place_id=self.place.id, text="pinned")
+        thread = threading.Thread(target=self.storage.new, args=(review,))
+        thread.start()
+        thread.join()
+        self.assertIsNotNone(index(Place, "city_id", self.version))
+        self.assertIsNone(index(Place, "text", self.version))
+        self.assertEqual([place for score, place in
+                          self.storage.search("pinned")], [self.place])
+        self.storage.delete(review)
+        self.storage.delete(state)
+
+    def test_own_writes(self):
+        """Test that a pinned thread sees its own writes"""
+        other = Place(city_id="pinned", name="Pinned hut")
+        self.storage.new(other)
+        self.assertIs(self.storage.get(Place, other.id), other)
+        self.assertEqual(self.storage.count(Place),
+                         self.version.count("Place") + 1)
+
+    def test_reclaimed(self):
+        """Test that a version is reclaimed once no reader holds it"""
+        ref = weakref.ref(self.version)
+        del self.version
+        self.write_elsewhere()
+        gc.collect()
+        self.assertIsNotNone(ref())
+        self.storage.unpin()
+        gc.collect()
+        self.assertIsNone(ref())
+        self.storage.pin()
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageThreads(unittest.TestCase):
+    """Test the FileStorage class used by many threads at once"""
+    def setUp(self):
+        """Points the storage at a file in a temporary directory"""
+        self.tmp = tempfile.mkdtemp()
+        self.saved = FileStorage._FileStorage__file_path
+        FileStorage._FileStorage__file_path = os.path.join(self.tmp,
+                                                           "file.json")
+
+    def tearDown(self):
+        """Restores the storage configuration"""
+        FileStorage._FileStorage__file_path = self.saved
+        shutil.rmtree(self.tmp)
+
+    def run_threads(self, targets):
+        """Runs each target in its own thread, returns the errors raised"""
+        errors = []
+
+        def run(target):
+            """Runs target, recording what it raises"""
+            try:
+                target()
+            except Exception as e:
+                errors.append(e)
+        threads = [threading.Thread(target=run, args=(target,))
+                   for target in targets]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return errors
+
+    def test_concurrent_reads_writes(self):
+        """Test that reads, writes and saves from many threads leave the
+        storage and its indexes consistent"""
+        storage = FileStorage()
+        cities = ["stress-{:d}".format(i) for i in range(4)]
+        created = []
+        writers = [6]
+        reads = []
+        lock = threading.Lock()
+        done = threading.Event()
+
+        def write():
+            """Creates, updates and deletes places, the last writer to
+            finish stopping the readers"""
+            try:
+                for i in range(200):
+                    place = Place(city_id=cities[i % 4], name="Stress",
+                                  number_rooms=i % 7)
+                    storage.new(place)
+                    place.number_rooms = i % 5
+                    if i % 3:
+                        created.append(place)
+                    else:
+                        storage.delete(place)
+                    if i % 50 == 0:
+                        storage.save()
+            finally:
+                with lock:
+                    writers[0] -= 1
+                    if not writers[0]:
+                        done.set()
+
+        def read():
+            """Iterates over the objects and queries the indexes"""
+            while not done.is_set():
+                reads.append(None)
+                for key, obj in storage.all().items():
+                    self.assertEqual(key.split(".")[0],
+                                     obj.__class__.__name__)
+                for obj in storage.all(Place).values():
+                    self.assertIs(obj.__class__, Place)
+                storage.lookup(Place, "city_id", cities[0])
+                storage.between(Place, "number_rooms", 1, 3)
+                storage.search("stress")
+                storage.count(Place)
+
+        errors = self.run_threads([read] * 6 + [write] * 6)
+        self.assertEqual(errors, [])
+        self.assertTrue(reads)
+        places = storage.all(Place)
+        self.assertEqual(len(created), 6 * 133)
+        for place in created:
+            self.assertIs(places["Place." + place.id], place)
+        for city in cities:
+            self.assertEqual(
+                {obj.id for obj in storage.lookup(Place, "city_id", city)},
+                {obj.id for obj in places.values() if obj.city_id == city})
+        rooms = storage.between(Place, "number_rooms", 1, 3)
+        self.assertEqual({obj.id for obj in rooms},
+                         {obj.id for obj in places.values()
+                          if 1 <= obj.number_rooms <= 3})
+        storage.save()
+        with open(FileStorage._FileStorage__file_path) as f:
+            self.assertEqual(set(json.load(f)), set(storage.all()))
+        for place in created:
+            storage.delete(place)
+
+    def test_save_lets_writes_in(self):
+        """Test that objects are added while save encodes and writes the
+        snapshot, and that changes made meanwhile are saved next"""
+        storage = FileStorage()
+        state = State(name="Slow")
+        storage.new(state)
+        encoding = threading.Event()
+        release = threading.Event()
+        encode = serializer.encode
+
+        def slow(obj, *args, **kwargs):
+            """Waits for the test before encoding"""
+            encoding.set()
+            release.wait(10)
+            return encode(obj, *args, **kwargs)
+        with mock.patch.object(serializer, "encode", slow):
+            saver = threading.Thread(target=storage.save)
+            saver.start()
+            self.assertTrue(encoding.wait(10))
+            other = State(name="Meanwhile")
+            writer = threading.Thread(target=storage.new, args=(other,))
+            writer.start()
+            writer.join(5)
+            self.assertFalse(writer.is_alive())
+            state.name = "Changed"
+            release.set()
+            saver.join()
+        storage.save()
+        with open(FileStorage._FileStorage__file_path) as f:
+            saved = json.load(f)
+        self.assertEqual(saved["State." + state.id]["name"], "Changed")
+        self.assertIn("State." + other.id, saved)
+        storage.delete(state)
+        storage.delete(other)
+
+    def test_all_unchanged_by_writes(self):
+        """Test that the dictionary returned by all does not change"""
+        storage = FileStorage()
+        objs = storage.all()
+        keys = set(objs)
+        state = State(name="Blantyre")
+        storage.new(state)
+        self.assertEqual(set(objs), keys)
+        self.assertIn("State." + state.id, storage.all())
+        storage.delete(state)
+        self.assertNotIn("State." + state.id, storage.all())
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageJournal(unittest.TestCase):
+    """Test the journal mode of the FileStorage class"""
+    def setUp(self):
+        """Points the storage at a journaled file in a temporary directory"""
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "file.json")
+        self.saved = (FileStorage._FileStorage__file_path,
+                      FileStorage._FileStorage__journaling,
+                      FileStorage._FileStorage__compact_every)
+        FileStorage._FileStorage__file_path = self.path
+        FileStorage._FileStorage__journaling = True
+
+    def tearDown(self):
+        """Restores the storage configuration"""
+        compactor = FileStorage._FileStorage__compactor
+        if compactor is not None:
+            compactor.join()
+        (FileStorage._FileStorage__file_path,
+         FileStorage._FileStorage__journaling,
+         FileStorage._FileStorage__compact_every) = self.saved
+        shutil.rmtree(self.tmp)
+
+    def logged_keys(self):
+        """Returns the keys recorded in the journal"""
+        with open(self.path + ".log") as f:
+            return [json.loads(line)[1] for line in f]
+
+    def test_save_appends(self):
+        """Test that save appends the changes instead of the snapshot"""
+        storage = FileStorage()
+        state = State(name="Kasungu")
+        state.save()
+        self.assertFalse(os.path.exists(self.path))
+        self.assertIn("State." + state.id, self.logged_keys())
+        storage.delete(state)
+        storage.save()
+        self.assertEqual(self.logged_keys()[-1], "State." + state.id)
+
+    def test_reload_replays(self):
+        """Test that reload replays the journal on top of the snapshot"""
+        storage = FileStorage()
+        state = State(name="Dedza")
+        state.save()
+        storage.delete(state)
+        storage.reload()
+        self.assertEqual(storage.get(State, state.id).name, "Dedza")
+        storage.delete(storage.get(State, state.id))
+        storage.save()
+        storage.reload()
+        self.assertIsNone(storage.get(State, state.id))
+
+    def test_compaction(self):
+        """Test that the journal is folded into the snapshot"""
+        storage = FileStorage()
+        FileStorage._FileStorage__compact_every = 1
+        state = State(name="Salima")
+        state.save()
+        FileStorage._FileStorage__compactor.join()
+        with open(self.path) as f:
+            self.assertIn("State." + state.id, json.load(f))
+        self.assertFalse(os.path.exists(self.path + ".log"))
+        self.assertFalse(os.path.exists(self.path + ".log.1"))
+        storage.delete(state)
+        storage.save()
+
+    def test_close_follows_journal(self):
+        """Test that close only applies the records appended by others"""
+        storage = FileStorage()
+        state = State(name="Machinga")
+        state.save()
+        other = Journal(self.path + ".log")
+        other.append([("State." + state.id, None)])
+        with mock.patch.object(file_storage.snapshot, "iterread") as read:
+            storage.close()
+            self.assertIsNone(storage.get(State, state.id))
+            self.assertFalse(storage.refresh())
+            read.assert_not_called()
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageWriteBehind(unittest.TestCase):
+    """Test the write-behind mode of the FileStorage class"""
+    def setUp(self):
+        """Points the storage at a file in a temporary directory"""
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "file.json")
+        self.saved = (FileStorage._FileStorage__file_path,
+                      FileStorage._FileStorage__write_behind)
+        FileStorage._FileStorage__file_path = self.path
+        self.storage = FileStorage()
+        self.writes = []
+        save = FileStorage._FileStorage__save
+
+        def counting_save(storage):
+            """Counts the writes of the store"""
+            self.writes.append(time.monotonic())
+            return save(storage)
+        patcher = mock.patch.object(FileStorage, "_FileStorage__save",
+                                    counting_save)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        """Writes what is left and restores the storage configuration"""
+        self.storage.flush()
+        (FileStorage._FileStorage__file_path,
+         FileStorage._FileStorage__write_behind) = self.saved
+        shutil.rmtree(self.tmp)
+
+    def saved_keys(self):
+        """Returns the keys written to the file"""
+        with open(self.path) as f:
+            return set(json.load(f))
+
+    def test_group_commit(self):
+        """Test that the saves made within the window are written once"""
+        FileStorage._FileStorage__write_behind = 0.2
+        states = [State(name="Behind") for i in range(20)]
+        for state in states:
+            state.save()
+        self.assertEqual(self.writes, [])
+        deadline = time.monotonic() + 5
+        while not self.writes and time.monotonic() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.1)
+        self.assertEqual(len(self.writes), 1)
+        self.assertTrue({"State." + state.id for state in states} <=
+                        self.saved_keys())
+        for state in states:
+            state.save()
+        deadline = time.monotonic() + 5
+        while len(self.writes) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertGreaterEqual(self.writes[1] - self.writes[0], 0.2)
+        for state in states:
+            self.storage.delete(state)
+        self.storage.save()
+
+    def test_flush(self):
+        """Test that flush writes at once what was saved, and only that"""
+        FileStorage._FileStorage__write_behind = 60
+        state = State(name="Flushed")
+        state.save()
+        self.assertFalse(os.path.exists(self.path))
+        self.storage.flush()
+        self.assertIn("State." + state.id, self.saved_keys())
+        self.storage.flush()
+        self.assertEqual(len(self.writes), 1)
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+        self.storage.delete(state)
+        self.storage.save()
+
+    def test_flush_at_exit(self):
+        """Test that a process writes its saves when it exits"""
+        env = dict(os.environ, HBNB_FILE_PATH=self.path,
+                   HBNB_FILE_WRITE_BEHIND="60")
+        env.pop("HBNB_TYPE_STORAGE", None)
+        id = subprocess.run(
+            [sys.executable, "-c", "from models.state import State\n"
+             "state = State(name='Exiting')\nstate.save()\n"
+             "print(state.id)"], env=env, check=True,
+            stdout=subprocess.PIPE, universal_newlines=True).stdout.strip()
+        self.assertIn("State." + id, self.saved_keys())
+
+    def test_texts_index_at_exit(self):
+        """Test that a process writes the full-text index of its saves
+        when it exits"""
+        env = dict(os.environ, HBNB_FILE_PATH=self.path,
+                   HBNB_FILE_WRITE_BEHIND="60")
+        env.pop("HBNB_TYPE_STORAGE", None)
+        id = subprocess.run(
+            [sys.executable, "-c", "from models import storage\n"
+             "from models.place import Place\n"
+             "place = Place(name='Exiting')\nplace.save()\n"
+             "storage.search('exiting')\nprint(place.id)"], env=env,
+            check=True,
+            stdout=subprocess.PIPE, universal_newlines=True).stdout.strip()
+        text = file_storage.make_indexes()["Place"]["text"]
+        text.load(self.path + ".fts")
+        self.assertIn("Place." + id, text.docs)
+
+    def test_flush_on_signal(self):
+        """Test that a process writes its saves when SIGTERM or SIGINT
+        stops it"""
+        env = dict(os.environ, HBNB_FILE_PATH=self.path,
+                   HBNB_FILE_WRITE_BEHIND="60")
+        env.pop("HBNB_TYPE_STORAGE", None)
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            with self.subTest(signal=signum):
+                process = subprocess.run(
+                    [sys.executable, "-c", "import os, signal, time\n"
+                     "from models.state import State\n"
+                     "state = State(name='Stopped')\nstate.save()\n"
+                     "print(state.id, flush=True)\n"
+                     "os.kill(os.getpid(), {:d})\n"
+                     "time.sleep(60)".format(signum)], env=env,
+                    stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                    universal_newlines=True, timeout=30)
+                self.assertNotEqual(process.returncode, 0)
+                id = process.stdout.strip()
+                self.assertIn("State." + id, self.saved_keys())
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageRecovery(unittest.TestCase):
+    """Test the recovery of damaged snapshots by the FileStorage class"""
+    def setUp(self):
+        """Saves two generations of states in a temporary directory"""
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "file.json")
+        self.saved = FileStorage._FileStorage__file_path
+        FileStorage._FileStorage__file_path = self.path
+        self.storage = FileStorage()
+        self.first = State(name="Recovered first")
+        self.first.save()
+        self.second = State(name="Recovered second")
+        self.second.save()
+
+    def tearDown(self):
+        """Restores the storage configuration"""
+        self.storage.delete(self.first)
+        self.storage.delete(self.second)
+        FileStorage._FileStorage__file_path = self.saved
+        shutil.rmtree(self.tmp)
+
+    def loaded_ids(self):
+        """Returns which of the two states are read back from the snapshot"""
+        return {obj.id for obj in self.storage._FileStorage__load(self.path)
+                if obj.__class__ is State} & {self.first.id, self.second.id}
+
+    def test_atomic_write(self):
+        """Test that save replaces the snapshot, keeping the former one"""
+        self.assertEqual(sorted(os.listdir(self.tmp)),
+                         ["file.json", "file.json.bak", "file.json.bak.sum",
+                          "file.json.sum"])
+        self.assertIsNone(file_storage.snapshot.verify(self.path))
+        self.assertIsNone(file_storage.snapshot.verify(self.path + ".bak"))
+        self.assertEqual(self.loaded_ids(), {self.first.id, self.second.id})
+
+    def test_torn_snapshot(self):
+        """Test that a truncated snapshot is read from its backup"""
+        with open(self.path, "r+b") as f:
+            f.truncate(os.path.getsize(self.path) // 2)
+        with mock.patch("sys.stderr"):
+            self.assertEqual(self.loaded_ids(), {self.first.id})
+            self.storage.reload()
+        recovered = self.storage.recovered()
+        self.assertEqual(len(recovered), 1)
+        self.assertIn("recovered", recovered[0])
+        self.assertIn(self.path + ".bak", recovered[0])
+
+    def test_corrupt_snapshot(self):
+        """Test that a snapshot failing its checksum is read from its
+        backup"""
+        st = os.stat(self.path)
+        with open(self.path, "r+b") as f:
+            data = f.read()
+            f.seek(0)
+            f.write(data.replace(b"Recovered second", b"Recovered secomd"))
+        os.utime(self.path, ns=(st.st_atime_ns, st.st_mtime_ns))
+        self.assertEqual(file_storage.snapshot.verify(self.path),
+                         "checksum mismatch")
+        with mock.patch("sys.stderr"):
+            self.assertEqual(self.loaded_ids(), {self.first.id})
+
+    def test_no_intact_copy(self):
+        """Test that the objects read before the damage are kept when the
+        backup is damaged too"""
+        os.remove(self.path + ".bak")
+        with open(self.path, "r+b") as f:
+            f.truncate(os.path.getsize(self.path) - 2)
+        with mock.patch("sys.stderr"):
+            ids = self.loaded_ids()
+            self.storage.reload()
+        self.assertIn(self.first.id, ids)
+        self.assertIn("no intact copy", self.storage.recovered()[0])
+
+    def test_damaged_journal(self):
+        """Test that the journal records that do not make an object are
+        reported and the ones after them replayed"""
+        state = State(name="Replayed")
+        records = [["p", "Nowhere.1", {"__class__": "Nowhere", "id": "1"}],
+                   ["p", "State.2", {"__class__": "State", "id": "2",
+                                     "created_at": "yesterday"}],
+                   ["d"],
+                   ["p", "State." + state.id, state.to_dict()]]
+        with open(self.path + ".log", "w") as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+        with mock.patch("sys.stderr"):
+            self.storage.reload()
+        self.assertEqual(self.storage.get(State, state.id).name, "Replayed")
+        self.assertIsNone(self.storage.get(State, "2"))
+        recovered = self.storage.recovered()
+        self.assertEqual(len(recovered), 3)
+        self.assertIn("Nowhere.1", recovered[0])
+        self.assertIn("State.2", recovered[1])
+        self.assertIn("damaged record", recovered[2])
+        self.storage.delete(self.storage.get(State, state.id))
+        self.storage.save()
+
+    def test_backup_journal(self):
+        """Test that the backup snapshot is completed by the backup log"""
+        env = dict(os.environ, HBNB_FILE_PATH=self.path + ".j",
+                   HBNB_FILE_JOURNAL="1", HBNB_FILE_JOURNAL_COMPACT="1")
+        env.pop("HBNB_TYPE_STORAGE", None)
+
+        def run(code):
+            """Runs code in another process using the journaled files"""
+            return subprocess.run(
+                [sys.executable, "-c", "from models import storage\n"
+                 "from models.state import State\n" + code], env=env,
+                check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                universal_newlines=True)
+        for name in ("Journaled first", "Journaled second"):
+            run("State(name='{}').save()\n"
+                "storage._FileStorage__compactor.join()".format(name))
+        with open(self.path + ".j", "r+b") as f:
+            f.truncate(10)
+        result = run("print(sorted(state.name for state in "
+                     "storage.all(State).values()))")
+        self.assertEqual(result.stdout.strip(),
+                         "['Journaled first', 'Journaled second']")
+        self.assertIn("recovered", result.stderr)
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageShared(unittest.TestCase):
+    """Test the FileStorage class sharing its files with other processes"""
+    attrs = ("file_path", "journaling", "coordinated", "compact_every",
+             "coordinator", "generation")
+
+    def setUp(self):
+        """Points the storage at shared files in a temporary directory"""
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "file.json")
+        self.saved = {attr: getattr(FileStorage, "_FileStorage__" + attr)
+                      for attr in self.attrs}
+        FileStorage._FileStorage__file_path = self.path
+        FileStorage._FileStorage__journaling = True
+        FileStorage._FileStorage__coordinated = True
+        FileStorage._FileStorage__coordinator = None
+        FileStorage._FileStorage__generation = 0
+        self.storage = FileStorage()
+        self.storage.reload()
+
+    def tearDown(self):
+        """Restores the storage configuration"""
+        compactor = FileStorage._FileStorage__compactor
+        if compactor is not None:
+            compactor.join()
+        for obj in list(self.storage.all(State).values()):
+            if obj.name.startswith("Shared"):
+                self.storage.delete(obj)
+        FileStorage._FileStorage__pending.clear()
+        FileStorage._FileStorage__coordinator.close()
+        for attr, value in self.saved.items():
+            setattr(FileStorage, "_FileStorage__" + attr, value)
+        shutil.rmtree(self.tmp)
+        self.storage.reload()
+
+    def worker(self, code, compact_every=1000):
+        """Runs code in another process sharing the files, returns what it
+        prints"""
+        env = dict(os.environ, HBNB_FILE_PATH=self.path, HBNB_FILE_SHARED="1",
+                   HBNB_FILE_JOURNAL_COMPACT=str(compact_every))
+        env.pop("HBNB_TYPE_STORAGE", None)
+        script = ("import json\nfrom models import storage\n"
+                  "from models.state import State\n" + code)
+        return subprocess.run([sys.executable, "-c", script], env=env,
+                              check=True, stdout=subprocess.PIPE,
+                              universal_newlines=True).stdout.strip()
+
+    def names(self):
+        """Returns the names of the states seen by another process"""
+        return json.loads(self.worker(
+            "print(json.dumps(sorted(state.name for state in "
+            "storage.all(State).values())))"))
+
+    def test_follow_worker(self):
+        """Test that the changes of another process are applied from the
+        journal alone"""
+        self.assertFalse(self.storage.refresh())
+        id = self.worker("state = State(name='Shared child')\n"
+                         "state.save()\nprint(state.id)")
+        with mock.patch.object(file_storage.snapshot, "iterread",
+                               wraps=file_storage.snapshot.iterread) as read:
+            self.assertTrue(self.storage.refresh())
+            self.assertFalse(self.storage.refresh())
+        self.assertFalse(read.called)
+        self.assertEqual(self.storage.get(State, id).name, "Shared child")
+        State(name="Shared parent").save()
+        self.assertEqual(self.names(), ["Shared child", "Shared parent"])
+
+    def test_follow_compacted(self):
+        """Test that the journal started by a compaction is followed"""
+        FileStorage._FileStorage__compact_every = 1
+        self.worker("State(name='Shared first').save()")
+        State(name="Shared parent").save()
+        FileStorage._FileStorage__compactor.join()
+        self.assertFalse(os.path.exists(self.path + ".log.1"))
+        id = self.worker("state = State(name='Shared second')\n"
+                         "state.save()\nprint(state.id)")
+        with mock.patch.object(file_storage.snapshot, "iterread",
+                               wraps=file_storage.snapshot.iterread) as read:
+            self.assertTrue(self.storage.refresh())
+        self.assertFalse(read.called)
+        self.assertEqual(self.storage.get(State, id).name, "Shared second")
+        self.assertEqual(self.names(), ["Shared first", "Shared parent",
+                                        "Shared second"])
+
+    def test_reload_resets(self):
+        """Test that reload leaves the store holding what the shared files
+        hold"""
+        self.assertEqual(self.storage.all(), {})
+        self.assertEqual(self.names(), [])
+
+    def test_reload_missed_compaction(self):
+        """Test that a process that missed a compaction reloads the
+        snapshot, dropping the objects deleted meanwhile"""
+        state = State(name="Shared deleted")
+        state.save()
+        id = self.worker("storage.delete(storage.get(State, '{}'))\n"
+                         "storage.save()\n"
+                         "storage._FileStorage__compactor.join()\n"
+                         "state = State(name='Shared kept')\n"
+                         "state.save()\n"
+                         "storage._FileStorage__compactor.join()\n"
+                         "print(state.id)".format(state.id),
+                         compact_every=1)
+        self.assertTrue(self.storage.refresh())
+        self.assertIsNone(self.storage.get(State, state.id))
+        self.assertEqual(self.storage.get(State, id).name, "Shared kept")
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageSharded(unittest.TestCase):
+    """Test the sharded layout of the FileStorage class"""
+    def setUp(self):
+        """Points the storage at a sharded store in a temporary directory"""
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "file.json")
+        self.saved = (FileStorage._FileStorage__file_path,
+                      FileStorage._FileStorage__sharded,
+                      FileStorage._FileStorage__journaling)
+        FileStorage._FileStorage__file_path = self.path
+        FileStorage._FileStorage__sharded = True
+        FileStorage._FileStorage__journaling = False
+
+    def tearDown(self):
+        """Restores the storage configuration"""
+        (FileStorage._FileStorage__file_path,
+         FileStorage._FileStorage__sharded,
+         FileStorage._FileStorage__journaling) = self.saved
+        shutil.rmtree(self.tmp)
+
+    def shard(self, name):
+        """Returns the content of the shard of class name"""
+        with open(os.path.join(self.path + ".d", name + ".json")) as f:
+            return json.load(f)
+
+    def test_save_writes_shards(self):
+        """Test that save writes one file per class"""
+        storage = FileStorage()
+        state = State(name="Nsanje")
+        state.save()
+        self.assertFalse(os.path.exists(self.path))
+        for name in classes:
+            self.assertEqual(set(self.shard(name)),
+                             set(storage.all(name)))
+        storage.delete(state)
+        storage.save()
+        self.assertNotIn("State." + state.id, self.shard("State"))
+
+    def test_save_touched_shards(self):
+        """Test that save only rewrites the shards of changed classes"""
+        storage = FileStorage()
+        storage.save()
+        amenities = os.path.join(self.path + ".d", "Amenity.json")
+        with open(amenities, "w") as f:
+            f.write("{}")
+        city = City(name="Chikwawa")
+        city.save()
+        self.assertIn("City." + city.id, self.shard("City"))
+        self.assertEqual(self.shard("Amenity"), {})
+        storage.delete(city)
+        storage.save()
+
+    def test_reload_shards(self):
+        """Test that reload loads the objects of every shard"""
+        storage = FileStorage()
+        state = State(name="Thyolo")
+        city = City(name="Mulanje", state_id=state.id)
+        state.save()
+        city.save()
+        storage.delete(state)
+        storage.delete(city)
+        storage.reload()
+        self.assertEqual(storage.get(State, state.id).name, "Thyolo")
+        self.assertEqual(storage.get(City, city.id).state_id, state.id)
+        storage.delete(storage.get(State, state.id))
+        storage.delete(storage.get(City, city.id))
+        storage.save()
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageBinary(unittest.TestCase):
+    """Test the binary snapshot format of the FileStorage class"""
+    def setUp(self):
+        """Points the storage at a binary snapshot in a temporary directory"""
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "file.bin")
+        self.saved = (FileStorage._FileStorage__file_path,
+                      FileStorage._FileStorage__journaling)
+        FileStorage._FileStorage__file_path = self.path
+        FileStorage._FileStorage__journaling = False
+
+    def tearDown(self):
+        """Restores the storage configuration"""
+        (FileStorage._FileStorage__file_path,
+         FileStorage._FileStorage__journaling) = self.saved
+        shutil.rmtree(self.tmp)
+
+    def test_save_reload(self):
+        """Test that objects are saved to and reloaded from the snapshot"""
+        storage = FileStorage()
+        state = State(name="Phalombe")
+        state.save()
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(4), b"HBNB")
+        storage.delete(state)
+        storage.reload()
+        reloaded = storage.get(State, state.id)
+        self.assertIsNot(reloaded, state)
+        self.assertEqual(reloaded.to_dict(), state.to_dict())
+        storage.delete(reloaded)
+        storage.save()
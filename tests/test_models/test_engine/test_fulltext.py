@@ -0,0 +1,129 @@
+#!/usr/bin/python3
+"""
+Contains the TestFullTextDocs and TestTextIndex classes
+"""
+
+import inspect
+from models.engine import fulltext
+from models.place import Place
+from models.review import Review
+import os
+import pep8
+import shutil
+import tempfile
+import unittest
+TextIndex = fulltext.TextIndex
+
+
+class TestFullTextDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the fulltext module"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.index_f = inspect.getmembers(TextIndex, inspect.isfunction)
+
+    def test_pep8_conformance_fulltext(self):
+        """Test that models/engine/fulltext.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/fulltext.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_fulltext(self):
+        """Test tests/test_models/test_engine/test_fulltext.py conforms"""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_fulltext.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_fulltext_module_docstring(self):
+        """Test for the fulltext.py module docstring"""
+        self.assertIsNot(fulltext.__doc__, None,
+                         "fulltext.py needs a docstring")
+        self.assertTrue(len(fulltext.__doc__) >= 1,
+                        "fulltext.py needs a docstring")
+
+    def test_text_index_docstrings(self):
+        """Test for the presence of docstrings in TextIndex methods"""
+        self.assertIsNot(TextIndex.__doc__, None,
+                         "TextIndex class needs a docstring")
+        for func in self.index_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+
+
+class TestTextIndex(unittest.TestCase):
+    """Test the TextIndex class"""
+    def setUp(self):
+        """Indexes two places and a review"""
+        self.index = TextIndex({"Place": ("name", "description"),
+                                "Review": ("text",)}, {"Review": "place_id"})
+        self.lake = Place(name="Lake cottage", description="By the lake")
+        self.loft = Place(name="City loft", description="Downtown")
+        self.review = Review(text="A view of the Lake!",
+                             place_id=self.loft.id)
+        for obj in (self.lake, self.loft, self.review):
+            self.index.add(obj.__class__.__name__ + "." + obj.id, obj)
+
+    def test_tokenize(self):
+        """Test that text is split in lowercase words"""
+        self.assertEqual(fulltext.tokenize("A view, of the Lake!"),
+                         ["a", "view", "of", "the", "lake"])
+        self.assertEqual(fulltext.tokenize(None), [])
+
+    def test_search(self):
+        """Test that places are ranked by the BM25 score of their texts"""
+        scores = self.index.search("lake")
+        self.assertEqual(set(scores), {self.lake.id, self.loft.id})
+        self.assertGreater(scores[self.lake.id], scores[self.loft.id])
+        self.assertEqual(set(self.index.search("downtown cottage")),
+                         {self.lake.id, self.loft.id})
+        self.assertEqual(self.index.search("mountain"), {})
+
+    def test_remove(self):
+        """Test that removed documents are no longer found"""
+        self.index.remove("Review." + self.review.id)
+        self.index.remove("Review." + self.review.id)
+        self.assertEqual(set(self.index.search("lake")), {self.lake.id})
+        self.assertNotIn("view", self.index.postings)
+
+    def test_dump_load(self):
+        """Test that a loaded index keeps unchanged documents and prunes
+        the documents not seen again"""
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        path = os.path.join(tmp, "file.json.fts")
+        self.index.dump(path)
+        index = TextIndex(self.index.texts, self.index.owners)
+        index.load(path)
+        self.assertEqual(index.search("lake"), self.index.search("lake"))
+        index.add("Place." + self.lake.id, self.lake)
+        self.assertFalse(index.changed)
+        self.loft.description = "Mountain hut"
+        index.add("Place." + self.loft.id, self.loft)
+        self.assertTrue(index.changed)
+        index.prune()
+        self.assertEqual(set(index.search("lake")), {self.lake.id})
+        self.assertEqual(set(index.search("mountain")), {self.loft.id})
+        self.assertEqual(index.stale, set())
+
+    def test_defer(self):
+        """Test that a deferred index reads its documents and indexes the
+        objects added once first searched"""
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        path = os.path.join(tmp, "file.json.fts")
+        self.index.dump(path)
+        index = TextIndex(self.index.texts, self.index.owners)
+        index.defer(path)
+        for obj in (self.lake, self.loft, self.review):
+            index.add(obj.__class__.__name__ + "." + obj.id, obj)
+        index.remove("Review." + self.review.id)
+        self.assertEqual(index.docs, {})
+        self.assertEqual(set(index.search("lake")), {self.lake.id})
+        self.assertIsNone(index.pending)
+        self.assertTrue(index.changed)
+        index.add("Review." + self.review.id, self.review)
+        self.assertEqual(set(index.search("lake")),
+                         {self.lake.id, self.loft.id})
@@ -0,0 +1,90 @@
+#!/usr/bin/python3
+"""
+Contains the TestGeoDocs and TestGeo classes
+"""
+
+import inspect
+from models.engine import geo
+from models.place import Place
+import pep8
+import unittest
+
+
+class TestGeoDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the geo module"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.funcs = inspect.getmembers(geo, inspect.isfunction)
+
+    def test_pep8_conformance_geo(self):
+        """Test that models/engine/geo.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/geo.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_geo(self):
+        """Test tests/test_models/test_engine/test_geo.py conforms"""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_geo.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_geo_module_docstring(self):
+        """Test for the geo.py module docstring"""
+        self.assertIsNot(geo.__doc__, None, "geo.py needs a docstring")
+        self.assertTrue(len(geo.__doc__) >= 1, "geo.py needs a docstring")
+
+    def test_geo_func_docstrings(self):
+        """Test for the presence of docstrings in geo functions"""
+        for func in self.funcs:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} function needs a docstring".format(func[0]))
+
+
+class TestGeo(unittest.TestCase):
+    """Test the geometry of the location searches"""
+    def test_location(self):
+        """Test that only objects given valid coordinates are located"""
+        self.assertEqual(geo.location(Place(latitude=1.5, longitude=-2)),
+                         (1.5, -2))
+        self.assertIsNone(geo.location(Place()))
+        self.assertIsNone(geo.location(Place(latitude="1", longitude=2)))
+        self.assertIsNone(geo.location(Place(latitude=91, longitude=2)))
+
+    def test_distance_km(self):
+        """Test the great-circle distance between two points"""
+        self.assertEqual(geo.distance_km(10, 20, 10, 20), 0)
+        self.assertAlmostEqual(geo.distance_km(0, 0, 0, 1), 111.195, 3)
+        self.assertAlmostEqual(geo.distance_km(0, 179.5, 0, -179.5),
+                               geo.distance_km(0, 0, 0, 1))
+
+    def test_around(self):
+        """Test that the box around a point holds the whole circle"""
+        south, west, north, east = geo.around(0, 0, 111.195)
+        self.assertAlmostEqual(north, 1, 3)
+        self.assertAlmostEqual(south, -1, 3)
+        self.assertAlmostEqual(east, 1, 3)
+        box = geo.around(0, 179.9, 100)
+        self.assertGreater(box[1], box[3])
+        self.assertTrue(geo.contains(box, 0, -179.5))
+        self.assertEqual(geo.around(89.9, 0, 100)[1::2], (-180, 180))
+
+    def test_contains(self):
+        """Test that contains handles boxes crossing the antimeridian"""
+        self.assertTrue(geo.contains((0, 0, 10, 10), 5, 5))
+        self.assertFalse(geo.contains((0, 0, 10, 10), 5, 11))
+        self.assertTrue(geo.contains((0, 170, 10, -170), 5, 175))
+        self.assertTrue(geo.contains((0, 170, 10, -170), 5, -175))
+        self.assertFalse(geo.contains((0, 170, 10, -170), 5, 0))
+
+    def test_nearest(self):
+        """Test that nearest sorts by distance and honours the limit"""
+        far = Place(latitude=0, longitude=2)
+        near = Place(latitude=0, longitude=1)
+        places = [far, near, Place(latitude=0, longitude=5), Place()]
+        found = geo.nearest(places, 0, 0, 300)
+        self.assertEqual([place for distance, place in found], [near, far])
+        self.assertEqual(geo.nearest(places, 0, 0, 300, 1)[0][1], near)
@@ -0,0 +1,203 @@
+#!/usr/bin/python3
+"""
+Contains the TestIndexesDocs class and the tests of each index class
+"""
+
+import inspect
+from models.engine import indexes
+from models.city import City
+from models.place import Place
+import pep8
+import unittest
+ReferenceIndex = indexes.ReferenceIndex
+SortedIndex = indexes.SortedIndex
+ListIndex = indexes.ListIndex
+GridIndex = indexes.GridIndex
+
+
+class TestIndexesDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the indexes module"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.index_classes = inspect.getmembers(indexes, inspect.isclass)
+
+    def test_pep8_conformance_indexes(self):
+        """Test that models/engine/indexes.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/indexes.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_indexes(self):
+        """Test tests/test_models/test_engine/test_indexes.py conforms"""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_indexes.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_indexes_module_docstring(self):
+        """Test for the indexes.py module docstring"""
+        self.assertIsNot(indexes.__doc__, None,
+                         "indexes.py needs a docstring")
+        self.assertTrue(len(indexes.__doc__) >= 1,
+                        "indexes.py needs a docstring")
+
+    def test_indexes_docstrings(self):
+        """Test for the presence of docstrings in the index classes"""
+        for name, cls in self.index_classes:
+            self.assertIsNot(cls.__doc__, None,
+                             "{:s} class needs a docstring".format(name))
+            for func in inspect.getmembers(cls, inspect.isfunction):
+                self.assertIsNot(func[1].__doc__, None,
+                                 "{:s} method needs a docstring".format(
+                                     func[0]))
+
+
+class TestReferenceIndex(unittest.TestCase):
+    """Test the ReferenceIndex class"""
+    def test_add_lookup(self):
+        """Test that objects are found by the value of the attribute"""
+        index = ReferenceIndex("state_id")
+        a = City(state_id="1")
+        b = City(state_id="1")
+        c = City(state_id="2")
+        for city in (a, b, c):
+            index.add("City." + city.id, city)
+        self.assertEqual(index.lookup("1"), [a, b])
+        self.assertEqual(index.lookup("2"), [c])
+        self.assertEqual(index.lookup("3"), [])
+
+    def test_unhashable(self):
+        """Test that an unhashable value is left out of the index"""
+        index = ReferenceIndex("state_id")
+        city = City(state_id=["1"])
+        index.add("City." + city.id, city)
+        self.assertEqual(index.entries, {})
+        city.state_id = "1"
+        index.add("City." + city.id, city)
+        self.assertEqual(index.lookup("1"), [city])
+
+    def test_remove(self):
+        """Test that removed objects are no longer found"""
+        index = ReferenceIndex("state_id")
+        city = City(state_id="1")
+        index.add("City." + city.id, city)
+        index.remove("City." + city.id)
+        index.remove("City." + city.id)
+        self.assertEqual(index.lookup("1"), [])
+        self.assertEqual(index.entries, {})
+
+
+class TestSortedIndex(unittest.TestCase):
+    """Test the SortedIndex class"""
+    def test_keys_after(self):
+        """Test that keys are walked in (value, key) order"""
+        index = SortedIndex("name")
+        for key, name in (("c", "b"), ("a", "b"), ("b", "a")):
+            index.add(key, City(name=name))
+        self.assertEqual(index.keys_after(), ["b", "a", "c"])
+        self.assertEqual(index.keys_after(("b", "a")), ["c"])
+        self.assertEqual(index.keys_after(("a", "b"), 1), ["a"])
+        self.assertEqual(index.keys_after(None, 2), ["b", "a"])
+
+    def test_remove(self):
+        """Test that removed keys are no longer walked"""
+        index = SortedIndex("name")
+        index.add("a", City(name="a"))
+        index.add("b", City(name="b"))
+        index.remove("a")
+        index.remove("a")
+        self.assertEqual(index.keys_after(), ["b"])
+        self.assertEqual(index.values, {"b": "b"})
+
+    def test_suspend(self):
+        """Test that entries added while suspended are sorted on resume"""
+        index = SortedIndex("name")
+        index.add("a", City(name="c"))
+        index.suspend()
+        index.suspend()
+        for key, name in (("b", "b"), ("c", "a"), ("a", "d"), ("d", "e")):
+            index.add(key, City(name=name))
+        index.remove("d")
+        index.resume()
+        self.assertEqual(index.suspended, 1)
+        index.resume()
+        self.assertEqual(index.keys_after(), ["c", "b", "a"])
+        index.add("e", City(name="c"))
+        self.assertEqual(index.keys_after(), ["c", "b", "e", "a"])
+
+    def test_keys_between(self):
+        """Test that keys are walked between bounds in either order"""
+        index = SortedIndex("price_by_night", (int, float))
+        for key, price in (("a", 5), ("b", 1), ("c", 3), ("d", 3), ("e", "x"),
+                           ("f", True)):
+            index.add(key, Place(price_by_night=price))
+        self.assertEqual(index.keys_between(), ["b", "c", "d", "a"])
+        self.assertEqual(index.keys_between(3, 5), ["c", "d", "a"])
+        self.assertEqual(index.keys_between(2, None, 1), ["c"])
+        self.assertEqual(index.keys_between(None, 4, 2, True), ["d", "c"])
+        self.assertEqual(index.keys_between(6), [])
+
+
+class TestListIndex(unittest.TestCase):
+    """Test the ListIndex class"""
+    def test_add_lookup(self):
+        """Test that objects are found by each element of the attribute"""
+        index = ListIndex("amenity_ids")
+        a = Place(amenity_ids=["1", "2", "2"])
+        b = Place(amenity_ids=["2"])
+        index.add("Place." + a.id, a)
+        index.add("Place." + b.id, b)
+        self.assertEqual(index.lookup("1"), [a])
+        self.assertEqual(index.lookup("2"), [a, b])
+        self.assertEqual(index.lookup("3"), [])
+
+    def test_not_list(self):
+        """Test that only the hashable elements of lists are indexed"""
+        index = ListIndex("amenity_ids")
+        place = Place()
+        for value in (5, "12", {"1": 2}, None):
+            place.amenity_ids = value
+            index.add("Place." + place.id, place)
+            self.assertEqual(index.entries, {})
+        place.amenity_ids = [["1"], {"2": 3}, "4"]
+        index.add("Place." + place.id, place)
+        self.assertEqual(index.lookup("4"), [place])
+        self.assertEqual(list(index.entries), ["4"])
+
+    def test_remove(self):
+        """Test that removed objects are no longer found"""
+        index = ListIndex("amenity_ids")
+        place = Place(amenity_ids=["1", "1"])
+        index.add("Place." + place.id, place)
+        index.remove("Place." + place.id)
+        index.remove("Place." + place.id)
+        self.assertEqual(index.lookup("1"), [])
+        self.assertEqual(index.entries, {})
+
+
+class TestGridIndex(unittest.TestCase):
+    """Test the GridIndex class"""
+    def test_within(self):
+        """Test that only the located objects in the box are found"""
+        index = GridIndex()
+        inside = Place(latitude=-15.4, longitude=35.3)
+        outside = Place(latitude=-13.9, longitude=33.8)
+        wrapped = Place(latitude=-17.7, longitude=178)
+        for place in (inside, outside, wrapped, Place()):
+            index.add("Place." + place.id, place)
+        self.assertEqual(index.within((-16, 35, -15, 36)), [inside])
+        self.assertEqual(index.within((-20, 170, -10, -170)), [wrapped])
+        self.assertEqual(len(index.within((-90, -180, 90, 180))), 3)
+
+    def test_remove(self):
+        """Test that removed objects are no longer found"""
+        index = GridIndex()
+        place = Place(latitude=1, longitude=1)
+        index.add("Place." + place.id, place)
+        index.remove("Place." + place.id)
+        index.remove("Place." + place.id)
+        self.assertEqual(index.within((0, 0, 2, 2)), [])
+        self.assertEqual(index.entries, {})
@@ -0,0 +1,120 @@
+#!/usr/bin/python3
+"""
+Contains the TestJournalDocs and TestJournal classes
+"""
+
+import inspect
+from models.engine import journal
+import os
+import pep8
+import shutil
+import tempfile
+import unittest
+Journal = journal.Journal
+
+
+class TestJournalDocs(unittest.TestCase):
+    """Tests to check the documentation and style of Journal class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.journal_f = inspect.getmembers(Journal, inspect.isfunction)
+
+    def test_pep8_conformance_journal(self):
+        """Test that models/engine/journal.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/journal.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_journal(self):
+        """Test tests/test_models/test_engine/test_journal.py conforms"""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_journal.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_journal_module_docstring(self):
+        """Test for the journal.py module docstring"""
+        self.assertIsNot(journal.__doc__, None,
+                         "journal.py needs a docstring")
+        self.assertTrue(len(journal.__doc__) >= 1,
+                        "journal.py needs a docstring")
+
+    def test_journal_class_docstring(self):
+        """Test for the Journal class docstring"""
+        self.assertIsNot(Journal.__doc__, None,
+                         "Journal class needs a docstring")
+        self.assertTrue(len(Journal.__doc__) >= 1,
+                        "Journal class needs a docstring")
+
+    def test_journal_func_docstrings(self):
+        """Test for the presence of docstrings in Journal methods"""
+        for func in self.journal_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestJournal(unittest.TestCase):
+    """Test the Journal class"""
+    def setUp(self):
+        """Creates a journal in a temporary directory"""
+        self.tmp = tempfile.mkdtemp()
+        self.journal = Journal(os.path.join(self.tmp, "file.json.log"))
+
+    def tearDown(self):
+        """Removes the temporary directory"""
+        shutil.rmtree(self.tmp)
+
+    def test_append_replay(self):
+        """Test that appended changes are replayed in order"""
+        self.journal.append([("State.1", {"id": "1"}), ("State.2", None)])
+        self.journal.append([("State.1", None)])
+        self.assertEqual(self.journal.records, 3)
+        self.assertEqual(list(self.journal.replay()),
+                         [("State.1", {"id": "1"}), ("State.2", None),
+                          ("State.1", None)])
+        self.assertEqual(self.journal.records, 3)
+
+    def test_torn_record(self):
+        """Test that a torn trailing record is dropped and truncated"""
+        self.journal.append([("State.1", {"id": "1"})])
+        with open(self.journal.path, 'a') as f:
+            f.write('["p","State.2",{"id"')
+        self.assertEqual(list(self.journal.replay()),
+                         [("State.1", {"id": "1"})])
+        self.journal.append([("State.3", None)])
+        self.assertEqual(list(self.journal.replay()),
+                         [("State.1", {"id": "1"}), ("State.3", None)])
+
+    def test_damaged_record(self):
+        """Test that a damaged record is skipped and the records after it
+        replayed"""
+        self.journal.append([("State.1", {"id": "1"})])
+        with open(self.journal.path, 'a') as f:
+            f.write('["p","State.2",{"id"\n["p",5]\n')
+        self.journal.append([("State.3", None)])
+        self.assertEqual(list(self.journal.replay()),
+                         [("State.1", {"id": "1"}), ("State.3", None)])
+        self.assertEqual(len(self.journal.damaged), 2)
+        self.assertTrue(self.journal.damaged[0].endswith("byte 27"))
+        self.assertEqual(self.journal.records, 2)
+
+    def test_rotate(self):
+        """Test that rotated changes are replayed before new ones"""
+        self.journal.append([("State.1", {"id": "1"})])
+        self.journal.rotate()
+        self.assertEqual(self.journal.records, 0)
+        self.journal.append([("State.2", {"id": "2"})])
+        self.journal.rotate()
+        self.journal.append([("State.1", None)])
+        self.assertEqual(list(self.journal.replay()),
+                         [("State.1", {"id": "1"}), ("State.2", {"id": "2"}),
+                          ("State.1", None)])
+        self.journal.discard_rotated()
+        self.assertEqual(list(self.journal.replay()), [("State.1", None)])
+        self.journal.clear()
+        self.assertEqual(list(self.journal.replay()), [])
@@ -0,0 +1,76 @@
+#!/usr/bin/python3
+"""
+Contains the TestPaginationDocs and TestPagination classes
+"""
+
+from datetime import datetime
+import inspect
+from models.engine import pagination
+from models.state import State
+import pep8
+import unittest
+
+
+class TestPaginationDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the pagination module"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.funcs = inspect.getmembers(pagination, inspect.isfunction)
+
+    def test_pep8_conformance_pagination(self):
+        """Test that models/engine/pagination.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/pagination.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_pagination(self):
+        """Test tests/test_models/test_engine/test_pagination.py conforms"""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_pagination.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pagination_module_docstring(self):
+        """Test for the pagination.py module docstring"""
+        self.assertIsNot(pagination.__doc__, None,
+                         "pagination.py needs a docstring")
+        self.assertTrue(len(pagination.__doc__) >= 1,
+                        "pagination.py needs a docstring")
+
+    def test_pagination_func_docstrings(self):
+        """Test for the presence of docstrings in pagination functions"""
+        for func in self.funcs:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} function needs a docstring".format(func[0]))
+
+
+class TestPagination(unittest.TestCase):
+    """Test the keyset pagination helpers"""
+    def test_encode_decode(self):
+        """Test that a cursor names the created_at and id of an object"""
+        state = State(created_at="2017-09-28T21:03:54.052302")
+        created_at, id = pagination.decode(pagination.encode(state))
+        self.assertEqual(created_at, datetime(2017, 9, 28, 21, 3, 54, 52302))
+        self.assertEqual(id, state.id)
+
+    def test_decode_invalid(self):
+        """Test that decode rejects strings that are not cursors"""
+        for cursor in ("", "zz", "bm90IGEgY3Vyc29y", None):
+            with self.assertRaises(ValueError):
+                pagination.decode(cursor)
+
+    def test_page(self):
+        """Test that following the cursors walks every object once"""
+        states = [State(created_at="2017-09-28T21:03:5{:d}.000000".format(
+            i % 3)) for i in range(7)]
+        seen = []
+        objs, cursor = pagination.page(reversed(states), 3)
+        seen += objs
+        while cursor is not None:
+            self.assertEqual(len(objs), 3)
+            objs, cursor = pagination.page(states, 3, cursor)
+            seen += objs
+        self.assertEqual(seen, sorted(states, key=pagination.sort_key))
@@ -0,0 +1,143 @@
+#!/usr/bin/python3
+"""
+Contains the TestRWLockDocs and TestRWLock classes
+"""
+
+import inspect
+from models.engine import rwlock
+import pep8
+import threading
+import time
+import unittest
+RWLock = rwlock.RWLock
+
+
+class TestRWLockDocs(unittest.TestCase):
+    """Tests to check the documentation and style of RWLock class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.rwlock_f = inspect.getmembers(RWLock, inspect.isfunction)
+
+    def test_pep8_conformance_rwlock(self):
+        """Test that models/engine/rwlock.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/rwlock.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_rwlock(self):
+        """Test tests/test_models/test_engine/test_rwlock.py conforms"""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_rwlock.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_rwlock_module_docstring(self):
+        """Test for the rwlock.py module docstring"""
+        self.assertIsNot(rwlock.__doc__, None,
+                         "rwlock.py needs a docstring")
+        self.assertTrue(len(rwlock.__doc__) >= 1,
+                        "rwlock.py needs a docstring")
+
+    def test_rwlock_class_docstring(self):
+        """Test for the RWLock class docstring"""
+        self.assertIsNot(RWLock.__doc__, None,
+                         "RWLock class needs a docstring")
+        self.assertTrue(len(RWLock.__doc__) >= 1,
+                        "RWLock class needs a docstring")
+
+    def test_rwlock_func_docstrings(self):
+        """Test for the presence of docstrings in RWLock methods"""
+        for func in self.rwlock_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestRWLock(unittest.TestCase):
+    """Test the RWLock class"""
+    def setUp(self):
+        """Creates an unlocked lock"""
+        self.lock = RWLock()
+
+    def start(self, target):
+        """Starts target in a daemon thread"""
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+        return thread
+
+    def test_readers_share(self):
+        """Test that readers hold the lock at the same time"""
+        barrier = threading.Barrier(3, timeout=5)
+
+        def read():
+            """Waits for the other readers while holding the lock"""
+            with self.lock.read():
+                barrier.wait()
+        threads = [self.start(read) for i in range(2)]
+        barrier.wait()
+        for thread in threads:
+            thread.join()
+
+    def test_writer_excludes(self):
+        """Test that a writer waits for the readers and excludes them"""
+        events = []
+        self.lock.acquire_read()
+
+        def write():
+            """Records when the writer holds the lock"""
+            with self.lock.write():
+                events.append("write")
+        writer = self.start(write)
+        time.sleep(0.05)
+        self.assertEqual(events, [])
+        self.lock.release_read()
+        writer.join(5)
+        self.assertEqual(events, ["write"])
+
+    def test_waiting_writer_blocks_readers(self):
+        """Test that new readers wait behind a waiting writer"""
+        events = []
+        self.lock.acquire_read()
+
+        def write():
+            """Records when the writer holds the lock"""
+            with self.lock.write():
+                events.append("write")
+
+        def read():
+            """Records when the reader holds the lock"""
+            with self.lock.read():
+                events.append("read")
+        writer = self.start(write)
+        time.sleep(0.05)
+        reader = self.start(read)
+        time.sleep(0.05)
+        self.assertEqual(events, [])
+        self.lock.release_read()
+        writer.join(5)
+        reader.join(5)
+        self.assertEqual(events, ["write", "read"])
+
+    def test_reentrant(self):
+        """Test that a holder can acquire the lock again"""
+        with self.lock.write():
+            with self.lock.write():
+                with self.lock.read():
+                    pass
+        with self.lock.read():
+            with self.lock.read():
+                pass
+        with self.lock.write():
+            pass
+
+    def test_no_upgrade(self):
+        """Test that a reader cannot acquire the lock for writing"""
+        with self.lock.read():
+            with self.assertRaises(RuntimeError):
+                self.lock.acquire_write()
+        with self.lock.write():
+            pass
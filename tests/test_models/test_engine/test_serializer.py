@@ -0,0 +1,102 @@
+#!/usr/bin/python3
+"""
+Contains the TestSerializerDocs and TestSerializer classes
+"""
+
+import inspect
+import json
+from models.engine import serializer
+from models.place import Place
+from models.user import User
+import pep8
+import unittest
+from unittest import mock
+
+
+class TestSerializerDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the serializer module"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.funcs = inspect.getmembers(serializer, inspect.isfunction)
+
+    def test_pep8_conformance_serializer(self):
+        """Test that models/engine/serializer.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/serializer.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_serializer(self):
+        """Test tests/test_models/test_engine/test_serializer.py conforms"""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_serializer.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_serializer_module_docstring(self):
+        """Test for the serializer.py module docstring"""
+        self.assertIsNot(serializer.__doc__, None,
+                         "serializer.py needs a docstring")
+        self.assertTrue(len(serializer.__doc__) >= 1,
+                        "serializer.py needs a docstring")
+
+    def test_serializer_func_docstrings(self):
+        """Test for the presence of docstrings in serializer functions"""
+        for func in self.funcs:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} function needs a docstring".format(func[0]))
+
+
+class TestSerializer(unittest.TestCase):
+    """Test the encoding of the models"""
+    def setUp(self):
+        """Creates the encoded objects"""
+        self.place = Place(name="Café \"Lake\"", number_rooms=3,
+                           latitude=1.5, amenity_ids=["a"], description=None)
+        self.place.created_at = self.place.created_at.replace(microsecond=0)
+        self.user = User(email="a@hbnb.io", password="pwd")
+
+    def check_backends(self, check):
+        """Runs check with orjson, if installed, then with json"""
+        check()
+        with mock.patch.object(serializer, "orjson", None):
+            check()
+
+    def test_encode(self):
+        """Test that encode gives the JSON of to_dict"""
+        def check():
+            """Compares the encoded objects to to_dict"""
+            for obj in (self.place, self.user):
+                self.assertEqual(json.loads(serializer.encode(obj)),
+                                 obj.to_dict())
+            self.assertEqual(json.loads(serializer.encode(self.user, True)),
+                             self.user.to_dict(save_fs=True))
+        self.check_backends(check)
+
+    def test_encode_exclude(self):
+        """Test that the excluded attributes are left out"""
+        def check():
+            """Encodes the place without its name"""
+            encoded = json.loads(serializer.encode(self.place,
+                                                   exclude=("name",)))
+            self.assertNotIn("name", encoded)
+            self.assertIn("number_rooms", encoded)
+        self.check_backends(check)
+
+    def test_encode_list(self):
+        """Test that encode_list gives the JSON list of the objects"""
+        def check():
+            """Compares the encoded list to the to_dict of the objects"""
+            self.assertEqual(json.loads(serializer.encode_list(
+                [self.place, self.user])),
+                [self.place.to_dict(), self.user.to_dict()])
+            self.assertEqual(serializer.encode_list([]), b"[]")
+        self.check_backends(check)
+
+    def test_benchmark(self):
+        """Test that the benchmark measures both encodings"""
+        rates = serializer.benchmark(10)
+        self.assertEqual(len(rates), 2)
+        self.assertTrue(all(rate > 0 for rate in rates.values()))
@@ -0,0 +1,178 @@
+#!/usr/bin/python3
+"""
+Contains the TestSnapshotDocs and TestSnapshot classes
+"""
+
+from datetime import datetime
+import inspect
+import io
+import json
+import marshal
+from models.engine import snapshot
+from models.place import Place
+from models.state import State
+from models.user import User
+import os
+import pep8
+import shutil
+import tempfile
+import unittest
+
+
+class TestSnapshotDocs(unittest.TestCase):
+    """Tests to check the documentation and style of snapshot module"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.snapshot_f = inspect.getmembers(snapshot, inspect.isfunction)
+
+    def test_pep8_conformance_snapshot(self):
+        """Test that models/engine/snapshot.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/snapshot.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_snapshot(self):
+        """Test tests/test_models/test_engine/test_snapshot.py conforms"""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_snapshot.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_snapshot_module_docstring(self):
+        """Test for the snapshot.py module docstring"""
+        self.assertIsNot(snapshot.__doc__, None,
+                         "snapshot.py needs a docstring")
+        self.assertTrue(len(snapshot.__doc__) >= 1,
+                        "snapshot.py needs a docstring")
+
+    def test_snapshot_func_docstrings(self):
+        """Test for the presence of docstrings in snapshot functions"""
+        for func in self.snapshot_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} function needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} function needs a docstring".format(func[0]))
+
+
+class TestSnapshot(unittest.TestCase):
+    """Test the binary snapshot format"""
+    def setUp(self):
+        """Creates a temporary directory"""
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Removes the temporary directory"""
+        shutil.rmtree(self.tmp)
+
+    def test_dump_load(self):
+        """Test that objects survive a binary round trip"""
+        state = State(name="Karonga")
+        place = Place(name="Lake view", number_rooms=3, latitude=1.5,
+                      amenity_ids=["a", "b"])
+        place.created_at = datetime(2017, 9, 28, 21, 3, 54, 52298)
+        f = io.BytesIO()
+        snapshot.dump([("State." + state.id, state),
+                       ("Place." + place.id, place)], f)
+        f.seek(0)
+        objs = list(snapshot.load(f))
+        self.assertEqual([type(obj) for obj in objs], [State, Place])
+        self.assertEqual(objs[0].to_dict(), state.to_dict())
+        self.assertEqual(objs[1].to_dict(), place.to_dict())
+        self.assertEqual(objs[1].created_at, place.created_at)
+
+    def test_load_skips_password(self):
+        """Test that passwords are not written, as in the JSON format"""
+        user = User(email="a@b.c", password="pwd")
+        f = io.BytesIO()
+        snapshot.dump([("User." + user.id, user)], f)
+        f.seek(0)
+        self.assertNotIn("password", next(snapshot.load(f)).__dict__)
+
+    def test_records_chunks(self):
+        """Test that records are read across chunk boundaries"""
+        states = [State(name="Chunked " * i) for i in range(5)]
+        f = io.BytesIO()
+        snapshot.dump([("State." + state.id, state) for state in states], f)
+        for size in (1, 7, 64, 1 << 20):
+            with self.subTest(size=size):
+                f.seek(len(snapshot.MAGIC))
+                self.assertEqual([record[1] for record in
+                                  snapshot.records(f, size)],
+                                 [state.id for state in states])
+
+    def test_load_truncated(self):
+        """Test that a record cut short raises ValueError"""
+        state = State(name="Cut")
+        f = io.BytesIO()
+        snapshot.dump([("State." + state.id, state)], f)
+        for size in (len(snapshot.MAGIC) + 2, len(f.getvalue()) - 1):
+            with self.subTest(size=size):
+                with self.assertRaises(ValueError):
+                    list(snapshot.load(io.BytesIO(f.getvalue()[:size])))
+
+    def test_load_old_format(self):
+        """Test that snapshots whose records have no length are read"""
+        state = State(name="Nkhata Bay")
+        f = io.BytesIO()
+        f.write(snapshot.OLD_MAGIC)
+        marshal.dump((snapshot.tags.index(State), state.id,
+                      (state.created_at - snapshot.EPOCH) //
+                      snapshot.MICROSECOND,
+                      (state.updated_at - snapshot.EPOCH) //
+                      snapshot.MICROSECOND, {"name": state.name}), f)
+        f.seek(0)
+        self.assertEqual([obj.to_dict() for obj in snapshot.load(f)],
+                         [state.to_dict()])
+
+    def test_load_bad_magic(self):
+        """Test that load refuses files that are not binary snapshots"""
+        with self.assertRaises(ValueError):
+            list(snapshot.load(io.BytesIO(b"{}")))
+
+    def test_convert(self):
+        """Test the conversion from JSON to binary and back"""
+        state = State(name="Rumphi")
+        src = os.path.join(self.tmp, "file.json")
+        with open(src, "w") as f:
+            json.dump({"State." + state.id: state.to_dict()}, f)
+        binary = os.path.join(self.tmp, "file.bin")
+        back = os.path.join(self.tmp, "back.json")
+        self.assertEqual(snapshot.convert(src, binary), 1)
+        self.assertEqual(snapshot.convert(binary, back), 1)
+        with open(src) as f, open(back) as g:
+            self.assertEqual(json.load(f), json.load(g))
+
+    def test_iterload_json(self):
+        """Test that members are parsed across chunk boundaries"""
+        text = ' {"a" : {"x": [1, 2.5, "caf\\u00e9"]},\n"b":{"y":"été"}}'
+        for size in (1, 2, 3, 7, 64):
+            with self.subTest(size=size):
+                f = io.BytesIO(text.encode("utf-8"))
+                self.assertEqual(list(snapshot.iterload_json(f, size)),
+                                 list(json.loads(text).items()))
+        f = io.BytesIO(b" { } ")
+        self.assertEqual(list(snapshot.iterload_json(f)), [])
+
+    def test_iterload_json_malformed(self):
+        """Test that malformed and truncated files raise ValueError"""
+        for text in (b'[]', b'{"a": {}', b'{"a" {}}', b'{"a": {} "b": {}}'):
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    list(snapshot.iterload_json(io.BytesIO(text), 2))
+
+    def test_iterread(self):
+        """Test that objects are read one by one with the file position"""
+        states = [State(name=str(i)) for i in range(3)]
+        for ext in ("json", "bin"):
+            with self.subTest(ext=ext):
+                path = os.path.join(self.tmp, "file." + ext)
+                snapshot.write(states, path)
+                read = list(snapshot.iterread(path))
+                self.assertEqual([obj.id for obj, position in read],
+                                 [state.id for state in states])
+                positions = [position for obj, position in read]
+                self.assertEqual(positions, sorted(positions))
+                self.assertLessEqual(positions[-1], os.path.getsize(path))
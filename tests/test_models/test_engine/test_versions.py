@@ -0,0 +1,124 @@
+#!/usr/bin/python3
+"""
+Contains the TestVersionsDocs and TestVersion classes
+"""
+
+import inspect
+from models.engine import versions
+import pep8
+import unittest
+Version = versions.Version
+View = versions.View
+
+
+class TestVersionsDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the versions module"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.funcs = (inspect.getmembers(versions, inspect.isfunction) +
+                     inspect.getmembers(Version, inspect.isfunction) +
+                     inspect.getmembers(View, inspect.isfunction))
+
+    def test_pep8_conformance_versions(self):
+        """Test that models/engine/versions.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/versions.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_versions(self):
+        """Test tests/test_models/test_engine/test_versions.py conforms"""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_versions.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_versions_module_docstring(self):
+        """Test for the versions.py module docstring"""
+        self.assertIsNot(versions.__doc__, None,
+                         "versions.py needs a docstring")
+        self.assertTrue(len(versions.__doc__) >= 1,
+                        "versions.py needs a docstring")
+
+    def test_versions_class_docstrings(self):
+        """Test for the Version and View class docstrings"""
+        for cls in (Version, View):
+            self.assertIsNot(cls.__doc__, None,
+                             "{:s} class needs a docstring".format(
+                                 cls.__name__))
+
+    def test_versions_func_docstrings(self):
+        """Test for the presence of docstrings in the functions"""
+        for func in self.funcs:
+            if func[0].startswith("_") and func[0] != "__init__":
+                continue
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} needs a docstring".format(func[0]))
+
+
+class TestVersion(unittest.TestCase):
+    """Test the Version class"""
+    def setUp(self):
+        """Creates a version of a few objects"""
+        self.changes = {"State.{:d}".format(i): i for i in range(100)}
+        self.changes["City.1"] = "city"
+        self.version = Version().change(self.changes)
+
+    def test_change(self):
+        """Test that a change makes a new version of the objects"""
+        self.assertEqual(self.version.number, 1)
+        self.assertEqual(self.version.get("State", "State.7"), 7)
+        self.assertIsNone(self.version.get("State", "State.100"))
+        self.assertIsNone(self.version.get("Place", "Place.1"))
+        self.assertEqual(self.version.count("State"), 100)
+        self.assertEqual(self.version.count("City"), 1)
+        self.assertEqual(self.version.objects("City"), {"City.1": "city"})
+        self.assertEqual(dict(self.version.items("State")),
+                         {key: value for key, value in self.changes.items()
+                          if key.startswith("State")})
+        self.assertEqual(sorted(self.version.values("State")),
+                         list(range(100)))
+
+    def test_immutable(self):
+        """Test that a change leaves the former version unchanged"""
+        new = self.version.change({"State.7": None, "State.8": "eight",
+                                   "State.100": 100, "State.missing": None})
+        self.assertEqual(new.number, 2)
+        self.assertIsNone(new.get("State", "State.7"))
+        self.assertEqual(new.get("State", "State.8"), "eight")
+        self.assertEqual(new.count("State"), 100)
+        self.assertEqual(self.version.get("State", "State.7"), 7)
+        self.assertEqual(self.version.get("State", "State.8"), 8)
+        self.assertEqual(self.version.count("State"), 100)
+        self.assertEqual(self.version.objects("State"),
+                         {key: value for key, value in self.changes.items()
+                          if key.startswith("State")})
+
+    def test_sharing(self):
+        """Test that a change only copies the buckets it touches"""
+        new = self.version.change({"State.7": None})
+        old_buckets = self.version.classes["State"]
+        new_buckets = new.classes["State"]
+        changed = versions.bucket("State.7")
+        for index in range(versions.BUCKETS):
+            if index == changed:
+                self.assertIsNot(new_buckets[index], old_buckets[index])
+            else:
+                self.assertIs(new_buckets[index], old_buckets[index])
+        self.assertIs(new.classes["City"], self.version.classes["City"])
+
+    def test_view(self):
+        """Test that a view reads the version returned by its source"""
+        current = [self.version]
+        view = View("City", lambda: current[0])
+        self.assertEqual(dict(view), {"City.1": "city"})
+        self.assertEqual(len(view), 1)
+        current[0] = self.version.change({"City.2": "other"})
+        self.assertEqual(view["City.2"], "other")
+        self.assertEqual(len(view), 2)
+        with self.assertRaises(KeyError):
+            view["City.3"]
+        with self.assertRaises(TypeError):
+            view["City.3"] = "new"
@@ -12,10 +12,22 @@ app = Flask(__name__)
 @app.route('/cities_by_states', strict_slashes=False)
 def cities_by_states():
     """display the states and cities listed in alphabetical order"""
-    states = storage.all("State").values()
+    states = storage.all("State", load=["cities"]).values()
     return render_template('8-cities_by_states.html', states=states)
 
 
+@app.before_request
+def pin_storage():
+    """pins the version of the storage read by the request"""
+    storage.pin()
+
+
+@app.teardown_request
+def unpin_storage(exception):
+    """releases the version of the storage read by the request"""
+    storage.unpin()
+
+
 @app.teardown_appcontext
 def teardown_db(exception):
     """closes the storage on teardown"""